@@ -0,0 +1,244 @@
+import argparse
+import csv
+import os
+import pickle
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+CHECKPOINT_NAME = ".aggregate_checkpoint.pickle"
+
+
+def read_ranking_csv(path):
+    """Lê um ranking salvo por Ranker.save_results como [(rank, jogo), ...].
+
+    Linhas com a mesma pontuação dividem a mesma colocação; linhas sem posição
+    (cauda não resolvida do modo top-k) ficam empatadas logo após as demais.
+    """
+    rows = []
+    with open(path, newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        next(reader, None)
+        rank = 0
+        previous_score = None
+        for index, row in enumerate(reader, start=1):
+            if len(row) < 3:
+                continue
+            position, game, score = row[0], sys.intern(row[1]), row[2]
+            if not position:
+                rows.append((None, game))
+                continue
+            if score != previous_score:
+                rank = index
+                previous_score = score
+            rows.append((rank, game))
+    tail_rank = sum(1 for rank, _ in rows if rank is not None) + 1
+    return [(rank if rank is not None else tail_rank, game) for rank, game in rows]
+
+
+class Tally:
+    """Contagens parciais do consenso; tallies de fragmentos diferentes se somam."""
+
+    def __init__(self):
+        self.files = 0
+        self.sessions = Counter()
+        self.firsts = Counter()
+        self.borda = Counter()
+        self.rank_sum = Counter()
+        # Saldo de confrontos (a, b) com a < b: vezes em que a ficou acima de b
+        # menos vezes em que b ficou acima de a
+        self.pairwise = Counter()
+
+    def add_session(self, ranking):
+        size = len(ranking)
+        if size == 0:
+            return
+        self.files += 1
+        sessions, firsts, borda, rank_sum = self.sessions, self.firsts, self.borda, self.rank_sum
+        for rank, game in ranking:
+            sessions[game] += 1
+            borda[game] += size - rank
+            rank_sum[game] += rank
+            if rank == 1:
+                firsts[game] += 1
+
+        pairwise = self.pairwise
+        for x in range(size):
+            rank_x, game_x = ranking[x]
+            for y in range(x + 1, size):
+                rank_y, game_y = ranking[y]
+                if rank_x == rank_y:
+                    continue
+                winner, loser = (game_x, game_y) if rank_x < rank_y else (game_y, game_x)
+                if winner < loser:
+                    pairwise[winner, loser] += 1
+                else:
+                    pairwise[loser, winner] -= 1
+
+    def merge(self, other):
+        intern = sys.intern
+        self.files += other.files
+        for mine, theirs in ((self.sessions, other.sessions), (self.firsts, other.firsts),
+                             (self.borda, other.borda), (self.rank_sum, other.rank_sum)):
+            for game, value in theirs.items():
+                mine[intern(game)] += value
+        for (a, b), value in other.pairwise.items():
+            self.pairwise[intern(a), intern(b)] += value
+
+    def copeland(self):
+        scores = Counter({game: 0 for game in self.sessions})
+        for (a, b), net in self.pairwise.items():
+            if net > 0:
+                scores[a] += 1
+                scores[b] -= 1
+            elif net < 0:
+                scores[a] -= 1
+                scores[b] += 1
+        return scores
+
+    # Consenso: Borda total, com Copeland e posição média como desempate
+    def consensus(self):
+        copeland = self.copeland()
+        rows = []
+        for game, count in self.sessions.items():
+            rows.append((game, self.borda[game], self.rank_sum[game] / count,
+                         copeland[game], count, self.firsts[game]))
+        rows.sort(key=lambda r: (-r[1], -r[3], r[2], r[0]))
+        return rows
+
+
+def tally_files(paths):
+    tally = Tally()
+    for path in paths:
+        try:
+            tally.add_session(read_ranking_csv(path))
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            print(f"Ignorando {path}: {e}", file=sys.stderr)
+    return tally
+
+
+class Checkpoint:
+    """Estado acumulado e marca d'água de mtime dos arquivos já lidos."""
+
+    def __init__(self):
+        self.tally = Tally()
+        self.mtime_ns = -1
+        # Arquivos com mtime igual à marca d'água, para não relê-los
+        self.seen_at_mtime = set()
+
+    # Grava só tipos básicos, para o arquivo não depender do nome do módulo
+    @classmethod
+    def load(cls, path):
+        checkpoint = cls()
+        try:
+            with open(path, 'rb') as file:
+                state = pickle.load(file)
+        except FileNotFoundError:
+            return checkpoint
+        checkpoint.mtime_ns = state['mtime_ns']
+        checkpoint.seen_at_mtime = state['seen_at_mtime']
+        checkpoint.tally.__dict__.update(state['tally'])
+        return checkpoint
+
+    def save(self, path):
+        state = {
+            'mtime_ns': self.mtime_ns,
+            'seen_at_mtime': self.seen_at_mtime,
+            'tally': self.tally.__dict__,
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def is_new(self, name, mtime_ns):
+        return mtime_ns > self.mtime_ns or (
+            mtime_ns == self.mtime_ns and name not in self.seen_at_mtime)
+
+    def mark(self, entries):
+        for name, mtime_ns in entries:
+            if mtime_ns > self.mtime_ns:
+                self.mtime_ns = mtime_ns
+                self.seen_at_mtime = set()
+            if mtime_ns == self.mtime_ns:
+                self.seen_at_mtime.add(name)
+
+
+def pending_files(results_dir, checkpoint):
+    entries = []
+    with os.scandir(results_dir) as it:
+        for entry in it:
+            if entry.name.startswith("ranking_") and entry.name.endswith(".csv"):
+                mtime_ns = entry.stat().st_mtime_ns
+                if checkpoint.is_new(entry.name, mtime_ns):
+                    entries.append((entry.name, mtime_ns))
+    entries.sort(key=lambda e: (e[1], e[0]))
+    return entries
+
+
+def aggregate(results_dir, checkpoint_path=None, workers=None, chunk_size=500):
+    """Lê só os arquivos novos desde o último checkpoint e devolve o Tally total.
+
+    Os arquivos são divididos em fragmentos de chunk_size e distribuídos num
+    pool de processos; o checkpoint é gravado após cada lote de fragmentos,
+    então uma execução interrompida retoma de onde parou.
+    """
+    if checkpoint_path is None:
+        checkpoint_path = os.path.join(results_dir, CHECKPOINT_NAME)
+    checkpoint = Checkpoint.load(checkpoint_path)
+    entries = pending_files(results_dir, checkpoint)
+    chunks = [entries[i:i + chunk_size] for i in range(0, len(entries), chunk_size)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            checkpoint.tally.merge(tally_files([os.path.join(results_dir, n) for n, _ in chunk]))
+            checkpoint.mark(chunk)
+            checkpoint.save(checkpoint_path)
+        return checkpoint.tally
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Lotes em ordem de mtime mantêm a marca d'água monotônica
+        for start in range(0, len(chunks), workers):
+            batch = chunks[start:start + workers]
+            paths = [[os.path.join(results_dir, n) for n, _ in chunk] for chunk in batch]
+            for chunk, partial in zip(batch, pool.map(tally_files, paths)):
+                checkpoint.tally.merge(partial)
+                checkpoint.mark(chunk)
+            checkpoint.save(checkpoint_path)
+    return checkpoint.tally
+
+
+def write_consensus_csv(tally, file):
+    writer = csv.writer(file)
+    writer.writerow(["Posição", "Jogo", "Borda", "Posição Média", "Copeland", "Sessões", "Primeiros Lugares"])
+    for index, (game, borda, mean_rank, copeland, sessions, firsts) in enumerate(tally.consensus(), start=1):
+        writer.writerow([index, game, borda, f"{mean_rank:.3f}", copeland, sessions, firsts])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ranking de consenso a partir dos CSVs em results/")
+    parser.add_argument("results_dir", nargs="?", default=DEFAULT_RESULTS_DIR)
+    parser.add_argument("-o", "--output", help="arquivo CSV de saída (padrão: saída padrão)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="processos (padrão: núcleos)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="arquivos por fragmento")
+    parser.add_argument("--checkpoint", help="arquivo de checkpoint (padrão: dentro de results_dir)")
+    parser.add_argument("--reset", action="store_true", help="ignora o checkpoint e relê tudo")
+    args = parser.parse_args(argv)
+
+    checkpoint_path = args.checkpoint or os.path.join(args.results_dir, CHECKPOINT_NAME)
+    if args.reset and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    tally = aggregate(args.results_dir, checkpoint_path, args.workers, args.chunk_size)
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8') as file:
+            write_consensus_csv(tally, file)
+    else:
+        write_consensus_csv(tally, sys.stdout)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,288 @@
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+import types
+from datetime import datetime
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+# Queda de vazão tolerada em relação à linha de base antes de acusar regressão
+DEFAULT_TOLERANCE = 0.25
+# Decisões medidas por tamanho (a sessão completa de 10k itens teria 50M pares)
+MAX_STEPS = 2000
+# Casos de frações de milissegundo são repetidos até somar esse tempo medido
+# (no máximo MAX_ROUNDS rodadas), para a mediana não ser só ruído
+MIN_SECONDS = 0.1
+MAX_ROUNDS = 50
+
+
+class _Widget:
+    """Widget de mentira: aceita qualquer chamada e não desenha nada."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        return _noop
+
+    def winfo_exists(self):
+        return True
+
+    def winfo_children(self):
+        return []
+
+    def create_polygon(self, *args, **kwargs):
+        return 1
+
+    create_text = create_oval = create_polygon
+
+
+class _Var:
+    def __init__(self, master=None, value=None, **kwargs):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+    def trace_add(self, *args):
+        pass
+
+
+def _noop(*args, **kwargs):
+    return None
+
+
+def install_tk_stub():
+    """Troca tkinter por um módulo sem janela, para medir a visão sem display."""
+    tk = types.ModuleType("tkinter")
+    tk.TclError = type("TclError", (Exception,), {})
+    tk.Tk = tk.Frame = tk.Canvas = tk.Label = tk.Button = tk.Entry = _Widget
+    tk.Checkbutton = tk.Radiobutton = tk.Scrollbar = tk.Spinbox = _Widget
+    tk.StringVar = tk.IntVar = _Var
+    # Constantes (tk.LEFT, tk.BOTH, ...) viram o próprio nome em minúsculas
+    tk.__getattr__ = lambda name: name.lower() if name.isupper() else _Widget
+    messagebox = types.ModuleType("tkinter.messagebox")
+    messagebox.__getattr__ = lambda name: _noop
+    tk.messagebox = messagebox
+    sys.modules["tkinter"] = tk
+    sys.modules["tkinter.messagebox"] = messagebox
+
+
+def measure(run, repeat=3):
+    """Executa run() e devolve (operações, segundos, pico em bytes, blocos alocados).
+
+    O tempo é a mediana de ao menos repeat execuções sem rastreamento,
+    repetidas até somar MIN_SECONDS: o mínimo acompanha os picos de sorte
+    da máquina e deixava a comparação instável. Memória e alocações vêm de
+    uma execução extra sob tracemalloc.
+    """
+    times = []
+    total = 0.0
+    while len(times) < repeat or (total < MIN_SECONDS and len(times) < MAX_ROUNDS):
+        prepared = run()
+        gc.collect()
+        started = time.perf_counter()
+        ops = prepared()
+        elapsed = time.perf_counter() - started
+        total += elapsed
+        times.append(elapsed)
+
+    prepared = run()
+    gc.collect()
+    tracemalloc.start()
+    blocks = sys.getallocatedblocks()
+    prepared()
+    net_blocks = sys.getallocatedblocks() - blocks
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return ops, statistics.median(times), peak, net_blocks
+
+
+def cases(n, seed):
+    from ranker import Ranker
+    from results import write_ranking_csv
+
+    items = [f"Jogo {i}" for i in range(n)]
+    steps = min(MAX_STEPS, n * (n - 1) // 2)
+    # Operações de uma só chamada são repetidas para não medir só ruído
+    reps = max(1, MAX_STEPS // n)
+
+    def new_ranker():
+        random.seed(seed)
+        return Ranker(_Widget(), _Widget(), items)
+
+    def played():
+        ranker = new_ranker()
+        rng = random.Random(seed)
+        for _ in range(steps):
+            ranker.handle_choice(rng.choice((-1, 0, 1)))
+        return ranker
+
+    def init():
+        def go():
+            for _ in range(reps):
+                new_ranker()
+            return reps
+        return go
+
+    def next_pair():
+        ranker = new_ranker()
+        ranker.next_pair()
+
+        def go():
+            for _ in range(steps):
+                ranker.next_pair()
+            return steps
+        return go
+
+    def handle_choice():
+        ranker = new_ranker()
+        rng = random.Random(seed)
+        choices = [rng.choice((-1, 0, 1)) for _ in range(steps)]
+
+        def go():
+            for choice in choices:
+                ranker.handle_choice(choice)
+            return steps
+        return go
+
+    def handle_back():
+        ranker = played()
+
+        def go():
+            for _ in range(steps):
+                ranker.handle_back()
+            return steps
+        return go
+
+    def ranking():
+        ranker = played()
+
+        def go():
+            for _ in range(reps):
+                ranker.engine.ranking()
+            return reps
+        return go
+
+    def show_results():
+        ranker = played()
+        # Os intervalos por bootstrap rodam numa thread à parte; aqui só se
+        # mede a montagem da tela, sem deixar trabalho rodando nos casos seguintes
+        ranker.start_statistics = _noop
+
+        def go():
+            for _ in range(reps):
+                ranker.show_results()
+            return reps
+        return go
+
+    def csv_write():
+        ranker = played()
+        ranked, resolved = ranker.engine.ranking(), ranker.engine.resolved
+
+        def go():
+            for _ in range(reps):
+                write_ranking_csv(io.StringIO(newline=''), ranked, resolved)
+            return reps
+        return go
+
+    return {
+        "init": init, "next_pair": next_pair, "handle_choice": handle_choice,
+        "handle_back": handle_back, "ranking": ranking, "show_results": show_results,
+        "csv_write": csv_write,
+    }
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, seed=0, only=None, repeat=3):
+    results = {}
+    for n in sizes:
+        for name, case in cases(n, seed).items():
+            if only and name not in only:
+                continue
+            ops, seconds, peak, net_blocks = measure(case, repeat)
+            results[f"{name}/n={n}"] = {
+                "ops": ops,
+                "seconds": round(seconds, 6),
+                "ops_per_second": round(ops / seconds, 1) if seconds else None,
+                "peak_kib": round(peak / 1024, 1),
+                "net_blocks": net_blocks,
+            }
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "sizes": list(sizes),
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Lista [(caso, atual, base, razão)] dos casos mais lentos que a linha de base."""
+    regressions = []
+    for key, current in report["results"].items():
+        base = baseline.get("results", {}).get(key)
+        if not base or not base.get("ops_per_second") or not current["ops_per_second"]:
+            continue
+        ratio = current["ops_per_second"] / base["ops_per_second"]
+        if ratio < 1 - tolerance:
+            regressions.append((key, current["ops_per_second"], base["ops_per_second"], ratio))
+    return regressions
+
+
+def print_table(report, file=sys.stdout):
+    print(f"{'caso':<24} {'ops/s':>14} {'pico KiB':>10} {'blocos':>8}", file=file)
+    for key, r in report["results"].items():
+        print(f"{key:<24} {r['ops_per_second']:>14,.1f} {r['peak_kib']:>10,.1f} {r['net_blocks']:>8}", file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks dos caminhos críticos do ranqueamento")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--only", nargs="+", help="casos a executar (ex.: handle_choice ranking)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("-o", "--output", help="grava o relatório JSON neste arquivo")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="linha de base JSON para comparar")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--update-baseline", action="store_true", help="grava o resultado como nova linha de base")
+    parser.add_argument("--real-tk", action="store_true", help="usa o Tk de verdade (requer display)")
+    args = parser.parse_args(argv)
+
+    if not args.real_tk:
+        install_tk_stub()
+    report = run_benchmarks(args.sizes, only=args.only, repeat=args.repeat)
+    print_table(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+        return 0
+
+    try:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+    except FileNotFoundError:
+        print(f"Sem linha de base em {args.baseline}; use --update-baseline", file=sys.stderr)
+        return 0
+    regressions = compare(report, baseline, args.tolerance)
+    for key, current, base, ratio in regressions:
+        print(f"REGRESSÃO {key}: {current:,.1f} ops/s contra {base:,.1f} ({ratio:.0%})", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,197 @@
+import csv
+import json
+import marshal
+import os
+import sys
+import textwrap
+from array import array
+
+DEFAULT_CATALOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "games.csv")
+
+CACHE_VERSION = 2
+# Títulos mais longos que isso ganham quebra de linha no rótulo dos botões
+LABEL_WIDTH = 24
+# Separador dos títulos no cache (removido dos títulos na leitura)
+_SEP = "\x00"
+# Maior ano que cabe no vetor de anos (array 'h')
+YEAR_MAX = 2 ** 15 - 1
+
+
+def parse_year(year):
+    # Ano ausente, malformado ou fora do vetor compacto vira desconhecido (0)
+    try:
+        year = int(year)
+    except (TypeError, ValueError):
+        return 0
+    return year if 0 < year <= YEAR_MAX else 0
+
+
+def default_label(title):
+    # Quebra depois do subtítulo ("Zelda:\nOcarina of Time") ou por largura
+    head, sep, tail = title.partition(": ")
+    if sep:
+        return f"{head}:\n{tail}"
+    if len(title) > LABEL_WIDTH:
+        return textwrap.fill(title, LABEL_WIDTH)
+    return title
+
+
+class Catalog:
+    """Catálogo de jogos: chave (título), rótulo de exibição e metadados.
+
+    O título é a chave usada no ranking e nos CSVs; o rótulo só controla a
+    quebra de linha nos botões e, quando não informado, é derivado do título
+    sob demanda. Ano e plataforma são opcionais e ficam em vetores compactos
+    (0 = desconhecido). O dicionário título -> índice só é montado no primeiro
+    uso, para não pesar na abertura.
+    """
+
+    def __init__(self):
+        self.titles = []
+        self._labels = {}
+        self._years = array('h')
+        self._platforms = array('H')
+        self._platform_names = [None]
+        self._platform_codes = {}
+        self._index = None
+
+    def __len__(self):
+        return len(self.titles)
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = dict(zip(self.titles, range(len(self.titles))))
+        return self._index
+
+    def label(self, title):
+        i = self.index.get(title)
+        if i is None:
+            return title
+        return self._labels.get(i) or default_label(title)
+
+    def year(self, i):
+        return self._years[i] or None
+
+    def platform(self, i):
+        return self._platform_names[self._platforms[i]]
+
+    def add(self, title, label=None, year=None, platform=None):
+        title = sys.intern(" ".join(title.replace(_SEP, "").split()))
+        index = self.index
+        if not title or title in index:
+            return False
+        i = index[title] = len(self.titles)
+        self.titles.append(title)
+        if label:
+            label = label.replace("\\n", "\n")
+            if label != default_label(title):
+                self._labels[i] = label
+        self._years.append(parse_year(year))
+        self._platforms.append(self._platform_code(platform))
+        return True
+
+    def _platform_code(self, platform):
+        if platform in (None, ""):
+            return 0
+        platform = str(platform)
+        code = self._platform_codes.get(platform)
+        if code is None:
+            code = self._platform_codes[platform] = len(self._platform_names)
+            self._platform_names.append(sys.intern(platform))
+        return code
+
+    # Estado em poucos blocos grandes: carregar o cache é quase só copiar bytes
+    def _dump_state(self):
+        return (CACHE_VERSION, _SEP.join(self.titles), self._labels,
+                self._years.tobytes(), self._platforms.tobytes(), self._platform_names)
+
+    @classmethod
+    def _from_state(cls, state):
+        version, titles, labels, years, platforms, platform_names = state
+        if version != CACHE_VERSION:
+            return None
+        catalog = cls()
+        # Internados como os títulos lidos da origem
+        catalog.titles = list(map(sys.intern, titles.split(_SEP))) if titles else []
+        catalog._labels = labels
+        catalog._years.frombytes(years)
+        catalog._platforms.frombytes(platforms)
+        catalog._platform_names = platform_names
+        catalog._platform_codes = {name: code for code, name in enumerate(platform_names) if name}
+        return catalog
+
+
+def _read_csv(catalog, path):
+    with open(path, newline='', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            catalog.add(row.get("title") or "", row.get("label"), row.get("year"), row.get("platform"))
+
+
+def _read_jsonl(catalog, path):
+    with open(path, encoding='utf-8') as file:
+        for line_number, line in enumerate(file, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: JSON inválido ({e})") from None
+            if not isinstance(entry, dict):
+                raise ValueError(f"{path}:{line_number}: esperado um objeto com 'title'")
+            title, label = entry.get("title") or "", entry.get("label")
+            if not isinstance(title, str) or not isinstance(label, (str, type(None))):
+                raise ValueError(f"{path}:{line_number}: 'title' e 'label' devem ser textos")
+            catalog.add(title, label, entry.get("year"), entry.get("platform"))
+
+
+def cache_path(path):
+    return path + ".cache"
+
+
+def _load_cache(path, stat):
+    try:
+        with open(cache_path(path), 'rb') as file:
+            stamp, state = marshal.load(file)
+        if stamp != (stat.st_mtime_ns, stat.st_size):
+            return None
+        return Catalog._from_state(state)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def _save_cache(path, stat, catalog):
+    tmp_path = cache_path(path) + ".tmp"
+    try:
+        with open(tmp_path, 'wb') as file:
+            marshal.dump(((stat.st_mtime_ns, stat.st_size), catalog._dump_state()), file)
+        os.replace(tmp_path, cache_path(path))
+    except OSError:
+        # Sem permissão de escrita: segue sem cache
+        pass
+
+
+def load_catalog(path=DEFAULT_CATALOG, use_cache=True):
+    """Carrega o catálogo de um CSV (title,label,year,platform) ou JSON Lines.
+
+    Os arquivos são lidos em fluxo, linha a linha, com os títulos internados;
+    títulos repetidos ficam só na primeira ocorrência. Com use_cache, o
+    resultado é gravado ao lado do arquivo num cache binário invalidado pelo
+    mtime e tamanho da origem, e as aberturas seguintes leem só o cache.
+    """
+    stat = os.stat(path)
+    if use_cache:
+        cached = _load_cache(path, stat)
+        if cached is not None:
+            return cached
+
+    catalog = Catalog()
+    if path.endswith((".jsonl", ".ndjson")):
+        _read_jsonl(catalog, path)
+    else:
+        _read_csv(catalog, path)
+
+    if use_cache:
+        _save_cache(path, stat, catalog)
+    return catalog
@@ -0,0 +1,83 @@
+class DominanceClosure:
+    """Fecho transitivo das vitórias de uma sessão, em bitsets inteiros.
+
+    below[i] tem o bit j ligado se i vence j direta ou indiretamente (A > B e
+    B > C dão A > C); above[j] é a relação inversa, e edges guarda só as
+    vitórias diretas, para reconstruir ciclos. Uma vitória nova liga, em cada
+    linha de quem está acima do vencedor, os bits de quem está abaixo do
+    perdedor: um OR de n/64 palavras por linha afetada. Cada alteração
+    guarda os valores antigos das linhas, e undo() os restaura na ordem
+    inversa. Empates não criam relação.
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.below = [0] * n
+        self.above = [0] * n
+        self.edges = [0] * n
+        self._log = []
+
+    def implied(self, a, b):
+        """Resultado já deduzido para o par: -1 se a vence b, 1 se b vence a, senão None."""
+        if self.below[a] >> b & 1:
+            return -1
+        if self.below[b] >> a & 1:
+            return 1
+        return None
+
+    def add(self, winner, loser):
+        """Registra winner > loser.
+
+        Se a vitória contradiz o fecho (loser já vence winner), ela não entra
+        e o ciclo é devolvido: [winner, loser, ..., winner]. Caso contrário,
+        devolve None.
+        """
+        if self.below[loser] >> winner & 1:
+            self._log.append(())
+            return [winner] + self.path(loser, winner)
+
+        changes = [(self.edges, winner, self.edges[winner])]
+        self.edges[winner] |= 1 << loser
+        gained = (1 << loser) | self.below[loser]
+        winners = (1 << winner) | self.above[winner]
+        for rows, mask, bits in ((self.below, winners, gained), (self.above, gained, winners)):
+            while mask:
+                low = mask & -mask
+                i = low.bit_length() - 1
+                mask ^= low
+                if rows[i] | bits != rows[i]:
+                    changes.append((rows, i, rows[i]))
+                    rows[i] |= bits
+        self._log.append(changes)
+        return None
+
+    def tie(self):
+        # Empate: nada muda, mas ocupa um passo para undo() seguir o histórico
+        self._log.append(())
+
+    def undo(self):
+        for rows, i, old in reversed(self._log.pop()):
+            rows[i] = old
+
+    def path(self, start, end):
+        """Caminho de vitórias diretas de start até end (busca em largura)."""
+        parent = {start: None}
+        frontier = [start]
+        while frontier and end not in parent:
+            following = []
+            for node in frontier:
+                mask = self.edges[node]
+                while mask:
+                    low = mask & -mask
+                    nxt = low.bit_length() - 1
+                    mask ^= low
+                    if nxt not in parent:
+                        parent[nxt] = node
+                        following.append(nxt)
+            frontier = following
+        path = []
+        node = end
+        while node is not None:
+            path.append(node)
+            node = parent[node]
+        return path[::-1]
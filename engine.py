@@ -0,0 +1,385 @@
+import random
+from array import array
+
+from pairs import PairStream
+from sorting import InsertionSorter, max_insertion_comparisons
+from tournament import TopKTournament, max_tournament_comparisons
+from ratings import BradleyTerry, EloRating
+from leaderboard import Leaderboard
+from closure import DominanceClosure
+
+# Modos de comparação: todos os pares, ordenação por inserção binária ou
+# torneio que resolve apenas os k primeiros
+MODE_ROUND_ROBIN = 'round_robin'
+MODE_SORT = 'sort'
+MODE_TOP_K = 'top_k'
+DEFAULT_TOP_K = 5
+
+# Pontuação usada no modo de todos os pares: vitórias, Bradley–Terry ou Elo
+RATING_WINS = 'wins'
+RATING_BRADLEY_TERRY = 'bradley_terry'
+RATING_ELO = 'elo'
+RATINGS = (RATING_WINS, RATING_BRADLEY_TERRY, RATING_ELO)
+
+# Inferência transitiva no modo de todos os pares: com 'check' o fecho das
+# vitórias só aponta ciclos; com 'prune' os pares já deduzidos (A > B e
+# B > C dão A > C) são resolvidos sem perguntar
+TRANSITIVE_CHECK = 'check'
+TRANSITIVE_PRUNE = 'prune'
+TRANSITIVE_OPTIONS = (None, TRANSITIVE_CHECK, TRANSITIVE_PRUNE)
+
+# Requisito R1: limites de seleção usados pela interface e pelo motor
+MIN_GAMES = 2
+MAX_GAMES = 10
+MAX_GAMES_BY_MODE = {
+    MODE_ROUND_ROBIN: MAX_GAMES,
+    MODE_SORT: 300,
+    MODE_TOP_K: 1000,
+}
+
+
+def selection_is_valid(count, min_games=MIN_GAMES, max_games=MAX_GAMES):
+    return min_games <= count <= max_games
+
+
+def max_comparisons(count, mode=MODE_ROUND_ROBIN, k=DEFAULT_TOP_K):
+    if mode == MODE_SORT:
+        return max_insertion_comparisons(count)
+    if mode == MODE_TOP_K:
+        return max_tournament_comparisons(count, k)
+    return count * (count - 1) // 2
+
+
+class RankingEngine:
+    """Motor de rankeamento sem interface: pares, pontuação e histórico."""
+
+    def __init__(self, items, rng=None, mode=MODE_ROUND_ROBIN, k=DEFAULT_TOP_K,
+                 rating=RATING_WINS, transitive=None):
+        if mode not in MAX_GAMES_BY_MODE:
+            raise ValueError(f"Modo desconhecido: {mode!r}")
+        if k < 1:
+            raise ValueError("k deve ser ao menos 1")
+        if rating not in RATINGS:
+            raise ValueError(f"Pontuação desconhecida: {rating!r}")
+        if transitive not in TRANSITIVE_OPTIONS:
+            raise ValueError(f"Inferência transitiva desconhecida: {transitive!r}")
+        self.rng = rng if rng is not None else random.Random()
+        self.mode = mode
+        self.k = k
+        self.rating = rating
+        self.transitive = transitive
+        self.load(items)
+
+    def load(self, items):
+        self.items = list(items)
+        self.index = {item: i for i, item in enumerate(self.items)}
+        if len(self.index) != len(self.items):
+            raise ValueError("A lista de jogos contém itens repetidos")
+
+        n = len(self.items)
+        self.scores = array('l', [0]) * n
+        # Classificação parcial por vitórias, atualizada a cada decisão
+        self.leaderboard = Leaderboard(self.scores)
+
+        # Requisito R2: todas as combinações C(n,2), embaralhadas e geradas sob
+        # demanda a partir dos ids inteiros; nos outros modos os pares vêm da
+        # inserção binária ou do torneio
+        if self.mode == MODE_SORT:
+            self._pairs = InsertionSorter(n, self.rng)
+        elif self.mode == MODE_TOP_K:
+            self._pairs = TopKTournament(n, self.k, self.rng)
+        else:
+            self._pairs = PairStream(n, self.rng)
+
+        # Requisito R4: histórico (item1, item2, decisão) em vetores compactos
+        self._hist_first = array('l')
+        self._hist_second = array('l')
+        self._hist_choice = array('b')
+        # 1 = resposta reaproveitada de sessões anteriores, 0 = dada pelo usuário
+        self._hist_known = array('b')
+        self._answered = 0
+        # Muda a cada alteração do par atual (escolha, volta ou promoção):
+        # identifica o par em que uma entrada do usuário foi feita
+        self.version = 0
+
+        # Fecho transitivo das vitórias (só no modo de todos os pares, em que
+        # os outros modos já não perguntam pares deduzidos); last_cycle é o
+        # ciclo criado pela última escolha, em nomes, ou None
+        self._closure = None
+        if self.transitive is not None and self.mode == MODE_ROUND_ROBIN:
+            self._closure = DominanceClosure(n)
+        self.last_cycle = None
+
+        # Modelo de notas opcional, atualizado a cada decisão
+        self._rater = None
+        self._rater_dirty = False
+        if self.rating == RATING_BRADLEY_TERRY:
+            self._rater = BradleyTerry(n)
+        elif self.rating == RATING_ELO:
+            self._rater = EloRating(n)
+
+    # Estado
+
+    @property
+    def total_pairs(self):
+        return len(self._pairs)
+
+    @property
+    def remaining(self):
+        return self._pairs.remaining
+
+    @property
+    def finished(self):
+        return self._pairs.finished
+
+    # Quantas posições do topo do ranking já são definitivas
+    @property
+    def resolved(self):
+        if self.mode == MODE_TOP_K:
+            return self._pairs.resolved
+        return len(self.items)
+
+    @property
+    def can_undo(self):
+        return self._answered > 0
+
+    @property
+    def current_ids(self):
+        return self._pairs.current()
+
+    @property
+    def current_pair(self):
+        ids = self.current_ids
+        if ids is None:
+            return None
+        return self.items[ids[0]], self.items[ids[1]]
+
+    # Cópia das decisões (ids e escolhas), para cálculos fora da thread da interface
+    def decision_arrays(self):
+        return array('l', self._hist_first), array('l', self._hist_second), array('b', self._hist_choice)
+
+    @property
+    def history(self):
+        items = self.items
+        return [
+            (items[a], items[b], c)
+            for a, b, c in zip(self._hist_first, self._hist_second, self._hist_choice)
+        ]
+
+    # Decisões dadas pelo usuário nesta sessão, sem as reaproveitadas
+    def user_history(self):
+        items = self.items
+        return [
+            (items[a], items[b], c)
+            for a, b, c, known in zip(self._hist_first, self._hist_second, self._hist_choice, self._hist_known)
+            if not known
+        ]
+
+    # Requisitos R3, R4 e R5: escolha (-1 = item1, 1 = item2, 0 = empate);
+    # known marca uma resposta reaproveitada, que não conta como passo do usuário
+    def choose(self, choice, known=False):
+        # Só int: 1.0 ou True passariam pelo 'in', mas não cabem no vetor do histórico
+        if type(choice) is not int or choice not in (-1, 0, 1):
+            raise ValueError(f"Escolha inválida: {choice!r}")
+        if self.finished:
+            raise RuntimeError("Não há par em exibição")
+
+        a, b = self.current_ids
+        self.last_cycle = None
+        self._score(a, b, choice, known)
+        self._pairs.record(choice)
+        self._skip_implied()
+        self.version += 1
+
+    # Resolve sem perguntar os pares seguintes cujo resultado o fecho já
+    # deduz; entram como respostas reaproveitadas, desfeitas junto com a
+    # escolha que as originou
+    def _skip_implied(self):
+        if self.transitive != TRANSITIVE_PRUNE or self._closure is None:
+            return
+        while not self._pairs.finished:
+            a, b = self._pairs.current()
+            choice = self._closure.implied(a, b)
+            if choice is None:
+                return
+            self._score(a, b, choice, True)
+            self._pairs.record(choice)
+
+    # Aplica respostas já conhecidas enquanto o par atual tiver uma;
+    # lookup(item1, item2) devolve a escolha ou None. on_apply(id1, id2,
+    # escolha) roda logo após cada uma, com o motor já naquele ponto (é onde
+    # o diário registra e tira snapshots). Devolve as decisões aplicadas
+    def apply_known(self, lookup, on_apply=None):
+        applied = []
+        while not self.finished:
+            a, b = self.current_ids
+            choice = lookup(self.items[a], self.items[b])
+            if choice is None:
+                break
+            self.choose(choice, known=True)
+            applied.append((a, b, choice))
+            if on_apply is not None:
+                on_apply(a, b, choice)
+        return applied
+
+    # Aplica uma decisão registrada fora da sessão (reprocessamento em lote):
+    # pontua como choose, mas sem seguir a ordem de pares do modo
+    def record(self, item1, item2, choice):
+        if type(choice) is not int or choice not in (-1, 0, 1):
+            raise ValueError(f"Escolha inválida: {choice!r}")
+        try:
+            a, b = self.index[item1], self.index[item2]
+        except KeyError as e:
+            raise ValueError(f"Jogo desconhecido: {e.args[0]!r}") from None
+        if a == b:
+            raise ValueError(f"Par com o mesmo jogo: {item1!r}")
+        self.last_cycle = None
+        self._score(a, b, choice)
+        self.version += 1
+
+    def _score(self, a, b, choice, known=False):
+        if choice == -1:
+            self.scores[a] += 1
+            self.leaderboard.add(a, 1)
+        elif choice == 1:
+            self.scores[b] += 1
+            self.leaderboard.add(b, 1)
+
+        self._hist_first.append(a)
+        self._hist_second.append(b)
+        self._hist_choice.append(choice)
+        self._hist_known.append(known)
+        if not known:
+            self._answered += 1
+        self._rate(a, b, choice)
+        if self._closure is not None:
+            if choice == 0:
+                self._closure.tie()
+            else:
+                cycle = self._closure.add(a, b) if choice == -1 else self._closure.add(b, a)
+                if cycle is not None:
+                    self.last_cycle = [self.items[i] for i in cycle]
+
+    # Requisito R6: desfaz a última decisão do usuário e volta ao par dela;
+    # respostas reaproveitadas depois dela são desfeitas junto
+    def undo(self):
+        if not self._answered:
+            return False
+
+        first, second, choices, flags = self._hist_first, self._hist_second, self._hist_choice, self._hist_known
+        scores, leaderboard, closure = self.scores, self.leaderboard, self._closure
+        known = True
+        while known:
+            a = first.pop()
+            b = second.pop()
+            choice = choices.pop()
+            known = flags.pop()
+            if choice == -1:
+                scores[a] -= 1
+                leaderboard.add(a, -1)
+            elif choice == 1:
+                scores[b] -= 1
+                leaderboard.add(b, -1)
+
+            self._pairs.back()
+            self._unrate()
+            if closure is not None:
+                closure.undo()
+        self._answered -= 1
+        self.last_cycle = None
+        self.version += 1
+        return True
+
+    def _rate(self, a, b, choice):
+        if self.rating == RATING_ELO:
+            self._rater.update(a, b, choice)
+        elif self.rating == RATING_BRADLEY_TERRY:
+            self._rater_dirty = True
+
+    def _unrate(self):
+        if self.rating == RATING_ELO:
+            self._rater.undo()
+        elif self.rating == RATING_BRADLEY_TERRY:
+            self._rater_dirty = True
+
+    # Notas por item na escala do Elo; reajusta o Bradley–Terry só quando
+    # houve decisões novas, partindo do ajuste anterior
+    def ratings(self):
+        if self._rater is None:
+            return [float(s) for s in self.scores]
+        if self._rater_dirty:
+            self._rater.fit(self._hist_first, self._hist_second, self._hist_choice)
+            self._rater_dirty = False
+        return [float(r) for r in self._rater.ratings()]
+
+    # Traz para a posição atual o próximo par pendente que contém o item
+    def _promote(self, item_id):
+        if not self._pairs.promote(item_id):
+            raise ValueError(f"{self.items[item_id]!r} não está no par atual nem em comparações pendentes")
+        self.version += 1
+
+    # Requisito R7: ordenação decrescente por pontuação (estável na ordem dos itens)
+    def ranking(self):
+        if self.mode != MODE_ROUND_ROBIN:
+            return [(self.items[i], score) for i, score in self._pairs.ranking(self.scores)]
+        if self._rater is None:
+            return [(self.items[i], score) for i, score in self.leaderboard]
+        scores = [int(round(r)) for r in self.ratings()]
+        order = sorted(range(len(self.items)), key=lambda i: scores[i], reverse=True)
+        return [(self.items[i], scores[i]) for i in order]
+
+    # Parcial da sessão: k itens a partir da posição start (0 = primeiro)
+    def standings(self, start=0, k=5):
+        if self.mode == MODE_ROUND_ROBIN and self._rater is None:
+            return [(self.items[i], score) for i, score in self.leaderboard.page(start, k)]
+        return self.ranking()[start:start + k]
+
+    def rank_of(self, item):
+        item_id = self.index[item]
+        if self.mode == MODE_ROUND_ROBIN and self._rater is None:
+            return self.leaderboard.rank(item_id)
+        return [name for name, _ in self.ranking()].index(item)
+
+    def results(self):
+        if self.mode != MODE_ROUND_ROBIN or self._rater is not None:
+            return dict(self.ranking())
+        return dict(zip(self.items, self.scores))
+
+    # API usada pelos testes do sistema (nomes em português)
+
+    def selecionar_jogos(self, jogos):
+        if not jogos:
+            raise ValueError("Nenhum jogo selecionado")
+        self.load(jogos)
+
+    def botao_iniciar_habilitado(self):
+        return selection_is_valid(len(self.items), max_games=MAX_GAMES_BY_MODE[self.mode])
+
+    def votar(self, jogo):
+        if jogo not in self.index:
+            raise ValueError(f"Jogo desconhecido: {jogo!r}")
+        if self.finished:
+            raise RuntimeError("Não há par em exibição")
+
+        item_id = self.index[jogo]
+        if item_id not in self.current_ids:
+            self._promote(item_id)
+        self.choose(-1 if self.current_ids[0] == item_id else 1)
+
+    def empatar(self):
+        self.choose(0)
+
+    def voltar(self):
+        return self.undo()
+
+    def fim(self):
+        return self.finished
+
+    def obter_par_atual(self):
+        return self.current_pair
+
+    def obter_resultado(self):
+        return self.results()
+
+    def exibir_ranking(self):
+        return self.ranking()
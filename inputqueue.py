@@ -0,0 +1,51 @@
+from collections import deque
+
+CHOICE_LEFT = -1
+CHOICE_TIE = 0
+CHOICE_RIGHT = 1
+BACK = 'back'
+
+# Atalhos de teclado (keysyms do Tk) para cada ação da tela de comparação
+KEY_BINDINGS = {
+    'Left': CHOICE_LEFT, 'a': CHOICE_LEFT, '1': CHOICE_LEFT,
+    'Down': CHOICE_TIE, 'space': CHOICE_TIE, 's': CHOICE_TIE, '2': CHOICE_TIE,
+    'Right': CHOICE_RIGHT, 'd': CHOICE_RIGHT, '3': CHOICE_RIGHT,
+    'BackSpace': BACK, 'z': BACK,
+}
+
+
+class InputQueue:
+    """Fila das ações do usuário na tela de comparação.
+
+    Cada clique ou tecla entra na fila marcado com a versão do par que estava
+    na tela (RankingEngine.version). A fila é esvaziada em ordem: uma ação
+    cuja marca não bate mais com o par atual foi feita sobre um par que já
+    saiu da tela (clique duplo, tecla repetida) e é descartada, em vez de
+    virar voto para o par seguinte.
+    """
+
+    def __init__(self, engine, apply):
+        self.engine = engine
+        self._apply = apply
+        self._pending = deque()
+        self.applied = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self._pending)
+
+    def push(self, version, action):
+        self._pending.append((version, action))
+
+    def drain(self):
+        applied = 0
+        engine = self.engine
+        while self._pending:
+            version, action = self._pending.popleft()
+            if version != engine.version or (action != BACK and engine.finished):
+                self.dropped += 1
+                continue
+            self._apply(action)
+            applied += 1
+        self.applied += applied
+        return applied
@@ -0,0 +1,202 @@
+import cProfile
+import json
+import math
+import os
+import time
+from collections import Counter
+from datetime import datetime
+
+# Baldes logarítmicos: 16 por oitava dão erro relativo de ~4% nos percentis
+_BUCKETS_PER_OCTAVE = 16
+
+
+class Histogram:
+    """Histograma de latências em fluxo, com memória fixa por oitava de valores."""
+
+    __slots__ = ('buckets', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.buckets = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, seconds):
+        micros = seconds * 1e6
+        bucket = int(math.log2(micros) * _BUCKETS_PER_OCTAVE) if micros > 1 else 0
+        self.buckets[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                # Centro geométrico do balde, limitado aos extremos observados
+                value = 2 ** ((bucket + 0.5) / _BUCKETS_PER_OCTAVE) / 1e6
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self):
+        ms = 1000
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count * ms, 4) if self.count else 0.0,
+            'p50_ms': round(self.percentile(0.50) * ms, 4),
+            'p95_ms': round(self.percentile(0.95) * ms, 4),
+            'p99_ms': round(self.percentile(0.99) * ms, 4),
+            'max_ms': round(self.max * ms, 4),
+        }
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('recorder', 'name', 'start', 'children')
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+        self.children = 0.0
+
+    def __enter__(self):
+        self.recorder._stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        recorder = self.recorder
+        stack = recorder._stack
+        path = ';'.join(span.name for span in stack)
+        stack.pop()
+        if stack:
+            stack[-1].children += elapsed
+        recorder.observe(self.name, elapsed)
+        # Tempo próprio (sem os filhos), como nas pilhas dobradas do flamegraph
+        recorder.folded[path] += elapsed - self.children
+        return False
+
+
+class Recorder:
+    """Instrumentação opcional do laço da interface.
+
+    Desligada (o padrão), span() devolve sempre o mesmo contexto vazio e
+    count()/observe() retornam na primeira linha, então o custo por evento é
+    de uma chamada de método. Ligada, cada span alimenta um histograma por
+    nome e um mapa de pilhas dobradas ("a;b;c" -> tempo próprio), que pode
+    ser lido pelo flamegraph.pl ou pelo speedscope; com profile=True, um
+    cProfile acompanha a sessão inteira.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.output_dir = None
+        self._profile = False
+        self.reset()
+
+    def reset(self):
+        self.histograms = {}
+        self.counters = Counter()
+        self.folded = Counter()
+        self._stack = []
+        if getattr(self, '_profiler', None) is not None:
+            self._profiler.disable()
+        self._profiler = None
+        if self.enabled and self._profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def enable(self, output_dir=None, profile=False):
+        self.enabled = True
+        self.output_dir = output_dir
+        self._profile = profile
+        self.reset()
+
+    def disable(self):
+        if self._profiler is not None:
+            self._profiler.disable()
+        self.enabled = False
+        self._profiler = None
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def observe(self, name, seconds):
+        if not self.enabled:
+            return
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.add(seconds)
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] += n
+
+    def report(self):
+        return {
+            'histograms': {name: h.summary() for name, h in sorted(self.histograms.items())},
+            'counters': dict(self.counters),
+        }
+
+    def export(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.report(), file, indent=2)
+
+    def write_folded(self, path):
+        # Uma linha por pilha, com o tempo próprio em microssegundos
+        with open(path, 'w', encoding='utf-8') as file:
+            for stack, seconds in sorted(self.folded.items()):
+                file.write(f"{stack} {max(1, round(seconds * 1e6))}\n")
+
+    def flush(self, tag=None):
+        """Grava métricas, pilhas e perfil acumulados em output_dir.
+
+        Chamadas seguintes com a mesma tag regravam os mesmos arquivos com os
+        dados atualizados. Devolve o caminho base, ou None se nada foi gravado.
+        """
+        if not self.enabled or not self.output_dir:
+            return None
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"session_{tag or datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        self.export(base + ".json")
+        self.write_folded(base + ".folded")
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler.dump_stats(base + ".prof")
+            self._profiler.enable()
+        return base
+
+
+# Instância única usada pela interface; ligada por RANKER_METRICS
+recorder = Recorder()
+
+
+def enable_from_environment(environ=os.environ):
+    output_dir = environ.get("RANKER_METRICS")
+    if output_dir:
+        recorder.enable(output_dir, profile=environ.get("RANKER_PROFILE") == "1")
+    return recorder.enabled
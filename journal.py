@@ -0,0 +1,268 @@
+import json
+import os
+import pickle
+import random
+import struct
+import threading
+
+from engine import RankingEngine
+
+MAGIC = b"RKJ1"
+SNAPSHOT_MAGIC = b"RKS1"
+
+EVENT_CHOICE = 1
+EVENT_BACK = 2
+# Resposta reaproveitada de sessões anteriores (RankingEngine.apply_known)
+EVENT_KNOWN = 3
+
+# Registro de tamanho fixo: sequência, tipo, escolha, item1, item2
+_RECORD = struct.Struct('<IBbII')
+_LENGTH = struct.Struct('<I')
+
+
+class JournalError(Exception):
+    pass
+
+
+def snapshot_path(path):
+    return path + ".snap"
+
+
+class SessionJournal:
+    """Diário binário só de acréscimo dos eventos de uma sessão do Ranker.
+
+    O cabeçalho guarda os jogos, as opções do motor e a semente do RNG, que
+    determina a ordem dos pares; cada escolha ou volta vira um registro de
+    tamanho fixo com o par exibido. Cada registro é entregue ao sistema
+    operacional na hora (sobrevive à queda do processo) e o fsync roda numa
+    thread em segundo plano, para não atrasar o clique. A cada snapshot_every
+    eventos o motor inteiro é serializado e gravado num snapshot pela mesma
+    thread, e a retomada só reaplica os eventos posteriores a ele.
+    """
+
+    def __init__(self, path, file, events, snapshot_every=1000, sync_interval=1.0, header=None):
+        self.path = path
+        self.header = header or {}
+        self.events = events
+        self.snapshot_every = snapshot_every
+        self._file = file
+        # Snapshot serializado à espera da thread de gravação (só o mais recente)
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._closed = threading.Event()
+        self._sync_interval = sync_interval
+        self._syncer = threading.Thread(target=self._sync_loop, daemon=True)
+        self._syncer.start()
+
+    @classmethod
+    def create(cls, path, items, options, seed, answers=None, **kwargs):
+        # answers: configuração do cache de respostas da sessão (None = sem cache)
+        fields = {'items': list(items), 'options': options, 'seed': seed}
+        if answers is not None:
+            fields['answers'] = answers
+        header = json.dumps(fields).encode('utf-8')
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            os.remove(snapshot_path(path))
+        except FileNotFoundError:
+            pass
+        file = open(path, 'wb', buffering=0)
+        file.write(MAGIC + _LENGTH.pack(len(header)) + header)
+        os.fsync(file.fileno())
+        return cls(path, file, 0, header=fields, **kwargs)
+
+    def _sync_loop(self):
+        while not self._closed.is_set():
+            self._dirty.wait()
+            with self._lock:
+                if self._file.closed:
+                    return
+                self._dirty.clear()
+                # O snapshot só é gravado depois do fsync dos eventos que ele cobre
+                snapshot, self._snapshot = self._snapshot, None
+                os.fsync(self._file.fileno())
+            if snapshot is not None:
+                _write_snapshot(self.path, snapshot)
+            self._closed.wait(self._sync_interval)
+
+    def _append(self, kind, choice=0, a=0, b=0):
+        with self._lock:
+            self._file.write(_RECORD.pack(self.events, kind, choice, a, b))
+            self.events += 1
+        self._dirty.set()
+
+    def record_choice(self, a, b, choice):
+        self._append(EVENT_CHOICE, choice, a, b)
+
+    def record_known(self, a, b, choice):
+        self._append(EVENT_KNOWN, choice, a, b)
+
+    def record_back(self):
+        self._append(EVENT_BACK)
+
+    def maybe_snapshot(self, engine):
+        if self.snapshot_every and self.events % self.snapshot_every == 0:
+            self.snapshot(engine)
+
+    # O pickle roda aqui, com o motor num estado consistente; escrita,
+    # fsync e rename ficam para a thread de segundo plano
+    def snapshot(self, engine):
+        data = SNAPSHOT_MAGIC + _LENGTH.pack(self.events) + pickle.dumps(engine, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._snapshot = data
+        self._dirty.set()
+
+    def close(self, remove=False):
+        self._closed.set()
+        self._dirty.set()
+        # Espera uma gravação de snapshot em andamento, para ela não
+        # recriar o arquivo depois da remoção
+        self._syncer.join()
+        with self._lock:
+            snapshot, self._snapshot = self._snapshot, None
+            if not self._file.closed:
+                os.fsync(self._file.fileno())
+                self._file.close()
+        if snapshot is not None and not remove:
+            _write_snapshot(self.path, snapshot)
+        if remove:
+            for p in (self.path, snapshot_path(self.path)):
+                try:
+                    os.remove(p)
+                except FileNotFoundError:
+                    pass
+
+
+def _write_snapshot(path, data):
+    final = snapshot_path(path)
+    tmp_path = final + ".tmp"
+    try:
+        with open(tmp_path, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, final)
+    except OSError:
+        # O snapshot é só um atalho: sem ele, a retomada reaplica o diário inteiro
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def read_header(data):
+    if data[:4] != MAGIC:
+        raise JournalError("Arquivo não é um diário de sessão")
+    (length,) = _LENGTH.unpack_from(data, 4)
+    start = 8 + length
+    if len(data) < start:
+        raise JournalError("Cabeçalho do diário incompleto")
+    try:
+        return json.loads(data[8:start].decode('utf-8')), start
+    except ValueError as e:
+        raise JournalError(f"Cabeçalho do diário inválido ({e})") from None
+
+
+def load_snapshot(path):
+    try:
+        with open(snapshot_path(path), 'rb') as file:
+            data = file.read()
+    except FileNotFoundError:
+        return None, 0
+    if data[:4] != SNAPSHOT_MAGIC or len(data) < 8:
+        return None, 0
+    (events,) = _LENGTH.unpack_from(data, 4)
+    # Snapshot truncado ou corrompido: é só um atalho, a retomada reaplica
+    # o diário desde o início
+    try:
+        engine = pickle.loads(data[8:])
+    except Exception:
+        return None, 0
+    if not isinstance(engine, RankingEngine):
+        return None, 0
+    return engine, events
+
+
+def replay(engine, records):
+    for seq, kind, choice, a, b in records:
+        if kind in (EVENT_CHOICE, EVENT_KNOWN):
+            if engine.current_ids != (a, b):
+                raise JournalError(f"Evento {seq}: par registrado ({a}, {b}) difere do par atual")
+            try:
+                engine.choose(choice, known=kind == EVENT_KNOWN)
+            except (ValueError, RuntimeError) as e:
+                raise JournalError(f"Evento {seq}: {e}") from None
+        elif kind == EVENT_BACK:
+            engine.undo()
+        else:
+            raise JournalError(f"Evento {seq}: tipo desconhecido {kind}")
+
+
+def _read_journal(path):
+    with open(path, 'rb') as file:
+        data = file.read()
+    header, start = read_header(data)
+    return data, header, start, (len(data) - start) // _RECORD.size
+
+
+def _new_engine(header):
+    try:
+        return RankingEngine(header['items'], rng=random.Random(header['seed']), **header['options'])
+    except (KeyError, TypeError, ValueError) as e:
+        raise JournalError(f"Cabeçalho do diário inválido ({e!r})") from None
+
+
+def load_journal(path):
+    """Reconstrói o motor de um diário só para leitura, reaplicando tudo do início."""
+    data, header, start, complete = _read_journal(path)
+    engine = _new_engine(header)
+    replay(engine, _RECORD.iter_unpack(data[start:start + complete * _RECORD.size]))
+    return engine
+
+
+def resume(path, **kwargs):
+    """Reconstrói o motor a partir do diário e o reabre para novos eventos.
+
+    Carrega o snapshot mais recente (se houver) e reaplica só os registros
+    seguintes; um registro final incompleto, de uma escrita interrompida, é
+    descartado.
+    """
+    data, header, start, complete = _read_journal(path)
+    end = start + complete * _RECORD.size
+    engine, events = load_snapshot(path)
+    if engine is not None and events <= complete:
+        try:
+            replay(engine, _RECORD.iter_unpack(data[start + events * _RECORD.size:end]))
+        except JournalError:
+            # Snapshot que não bate com o diário: vale a reaplicação completa
+            engine = None
+    else:
+        engine = None
+    if engine is None:
+        engine = _new_engine(header)
+        replay(engine, _RECORD.iter_unpack(data[start:end]))
+
+    file = open(path, 'r+b', buffering=0)
+    file.truncate(end)
+    file.seek(end)
+    return engine, SessionJournal(path, file, complete, header=header, **kwargs)
+
+
+def discard(path):
+    # Remove o diário e o snapshot de uma sessão que não pode ser retomada
+    for p in (path, snapshot_path(path)):
+        try:
+            os.remove(p)
+        except FileNotFoundError:
+            pass
+
+
+def has_open_session(path):
+    try:
+        with open(path, 'rb') as file:
+            return file.read(4) == MAGIC
+    except OSError:
+        return False
@@ -0,0 +1,131 @@
+from bisect import bisect_left, insort
+
+_LOAD = 64
+
+
+class Leaderboard:
+    """Classificação mantida incrementalmente, ordenada por pontuação decrescente.
+
+    Guarda as chaves (-pontuação, id) numa lista de blocos ordenados com uma
+    árvore de Fenwick sobre os tamanhos dos blocos. Atualizar a pontuação de um
+    item, consultar a posição de um item e localizar o início de uma página
+    custam O(log n); ler k itens a partir daí custa O(k). Empates ficam na
+    ordem dos ids, igual a sorted(..., reverse=True) sobre a lista de itens.
+    """
+
+    def __init__(self, scores):
+        self._scores = list(scores)
+        keys = sorted((-score, item) for item, score in enumerate(self._scores))
+        self._blocks = [keys[i:i + _LOAD] for i in range(0, len(keys), _LOAD)]
+        self._rebuild()
+
+    def __len__(self):
+        return len(self._scores)
+
+    def _rebuild(self):
+        self._maxes = [block[-1] for block in self._blocks]
+        size = len(self._blocks)
+        tree = [0] * (size + 1)
+        for i, block in enumerate(self._blocks, start=1):
+            tree[i] += len(block)
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _add(self, block, delta):
+        tree = self._tree
+        i = block + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, block):
+        # Quantidade de chaves nos blocos anteriores a block
+        total, i, tree = 0, block, self._tree
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, pos):
+        # Bloco e deslocamento da posição pos (busca descendente no Fenwick)
+        tree = self._tree
+        block, step = 0, 1 << (len(tree) - 1).bit_length()
+        while step:
+            nxt = block + step
+            if nxt < len(tree) and tree[nxt] <= pos:
+                block = nxt
+                pos -= tree[nxt]
+            step >>= 1
+        return block, pos
+
+    def _insert(self, key):
+        if not self._blocks:
+            self._blocks.append([key])
+            self._rebuild()
+            return
+        b = min(bisect_left(self._maxes, key), len(self._blocks) - 1)
+        block = self._blocks[b]
+        insort(block, key)
+        self._maxes[b] = block[-1]
+        if len(block) > 2 * _LOAD:
+            self._blocks[b:b + 1] = [block[:_LOAD], block[_LOAD:]]
+            self._rebuild()
+        else:
+            self._add(b, 1)
+
+    def _remove(self, key):
+        b = bisect_left(self._maxes, key)
+        block = self._blocks[b]
+        del block[bisect_left(block, key)]
+        if block:
+            self._maxes[b] = block[-1]
+            self._add(b, -1)
+        else:
+            del self._blocks[b]
+            self._rebuild()
+
+    def score(self, item):
+        return self._scores[item]
+
+    def update(self, item, score):
+        old = self._scores[item]
+        if score == old:
+            return
+        self._remove((-old, item))
+        self._scores[item] = score
+        self._insert((-score, item))
+
+    def add(self, item, delta):
+        self.update(item, self._scores[item] + delta)
+
+    # Posição (0 = primeiro) do item
+    def rank(self, item):
+        key = (-self._scores[item], item)
+        b = bisect_left(self._maxes, key)
+        return self._prefix(b) + bisect_left(self._blocks[b], key)
+
+    # Até k pares (item, pontuação) a partir da posição start
+    def page(self, start, k):
+        start = max(0, start)
+        if k <= 0 or start >= len(self):
+            return []
+        b, offset = self._locate(start)
+        result = []
+        while b < len(self._blocks) and len(result) < k:
+            for neg_score, item in self._blocks[b][offset:offset + k - len(result)]:
+                result.append((item, -neg_score))
+            b, offset = b + 1, 0
+        return result
+
+    def top(self, k):
+        return self.page(0, k)
+
+    def bottom(self, k):
+        return self.page(len(self) - k, min(k, len(self)))
+
+    def __iter__(self):
+        for block in self._blocks:
+            for neg_score, item in block:
+                yield item, -neg_score
@@ -0,0 +1,131 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from service import RankingService, SessionStore, DEFAULT_HOST
+
+
+class Client:
+    """Conexão HTTP/1.1 persistente com o serviço, medindo cada requisição."""
+
+    def __init__(self, reader, writer, latencies):
+        self.reader = reader
+        self.writer = writer
+        self.latencies = latencies
+
+    @classmethod
+    async def connect(cls, host, port, latencies):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, latencies)
+
+    async def request(self, method, path, body=None):
+        data = b'' if body is None else json.dumps(body).encode('utf-8')
+        started = time.perf_counter()
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: carga\r\nContent-Length: {len(data)}\r\n\r\n".encode('latin-1') + data
+        )
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.partition(b':')
+            if name.lower() == b'content-length':
+                length = int(value)
+        payload = json.loads(await self.reader.readexactly(length)) if length else None
+        self.latencies.append(time.perf_counter() - started)
+        return status, payload
+
+    def close(self):
+        self.writer.close()
+
+
+async def run_client(host, port, sessions, games, rng, latencies):
+    # Cada cliente mantém várias sessões abertas ao mesmo tempo e alterna
+    # entre elas, um voto por vez
+    client = await Client.connect(host, port, latencies)
+    try:
+        active = []
+        for _ in range(sessions):
+            _, state = await client.request("POST", "/sessions", {'games': rng.sample(games, 5)})
+            active.append(state)
+        completed = 0
+        while active:
+            state = active.pop(0)
+            path = f"/sessions/{state['id']}"
+            if state['finished']:
+                await client.request("GET", path + "/results")
+                await client.request("DELETE", path)
+                completed += 1
+                continue
+            if state['can_undo'] and rng.random() < 0.05:
+                _, update = await client.request("POST", path + "/undo")
+            elif rng.random() < 0.2:
+                _, update = await client.request("POST", path + "/tie", {'version': state['version']})
+            else:
+                _, update = await client.request("POST", path + "/vote",
+                                                 {'choice': rng.choice((-1, 1)), 'version': state['version']})
+            state.update(update)
+            active.append(state)
+        return completed
+    finally:
+        client.close()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def run(sessions, clients, seed):
+    # Servidor e clientes no mesmo laço de eventos: tudo num único núcleo
+    store = SessionStore(max_sessions=sessions)
+    service = RankingService(store)
+    server = await service.start(DEFAULT_HOST, 0)
+    port = server.sockets[0].getsockname()[1]
+    games = [f"Jogo {i}" for i in range(50)]
+    latencies = []
+    rng = random.Random(seed)
+
+    started = time.perf_counter()
+    per_client = [sessions // clients + (1 if i < sessions % clients else 0) for i in range(clients)]
+    tasks = [
+        run_client(DEFAULT_HOST, port, count, games, random.Random(rng.getrandbits(32)), latencies)
+        for count in per_client if count
+    ]
+    completed = sum(await asyncio.gather(*tasks))
+    elapsed = time.perf_counter() - started
+    server.close()
+    await server.wait_closed()
+
+    latencies.sort()
+    return {
+        'sessions': completed,
+        'requests': len(latencies),
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'max_ms': round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        'evicted': store.evicted,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gerador de carga local para o serviço de votação")
+    parser.add_argument("--sessions", type=int, default=5000, help="sessões simultâneas")
+    parser.add_argument("--clients", type=int, default=500, help="conexões simultâneas")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    report = asyncio.run(run(args.sessions, max(1, min(args.clients, args.sessions)), args.seed))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+import getpass
+import marshal
+import os
+import re
+import time
+from collections import OrderedDict
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sessions")
+DEFAULT_MAX_ENTRIES = 100_000
+DAY = 24 * 60 * 60
+# Respostas mais antigas que isso são descartadas
+DEFAULT_MAX_AGE = 365 * DAY
+# Com a reconfirmação ligada, respostas mais antigas que isso voltam a ser perguntadas
+DEFAULT_CONFIRM_AFTER = 90 * DAY
+
+
+def default_cache_path(user=None):
+    # Um arquivo por usuário do sistema, ao lado do diário de sessão
+    if user is None:
+        try:
+            user = getpass.getuser()
+        except Exception:
+            user = "default"
+    user = re.sub(r'[^\w.-]', '_', user)
+    return os.path.join(DEFAULT_CACHE_DIR, f"pair_cache_{user}.bin")
+
+
+class PairCache:
+    """Respostas de sessões anteriores, (jogo1, jogo2) -> escolha.
+
+    Cada par é guardado uma vez, com os jogos em ordem alfabética (a escolha
+    é invertida ao consultar na ordem contrária), junto do instante da
+    resposta. A ordem do OrderedDict é a de uso: ao passar de max_entries
+    sai o par usado há mais tempo, e respostas mais antigas que max_age são
+    descartadas. Com confirm_after, respostas mais antigas que isso não são
+    devolvidas, e o par volta a ser perguntado.
+    """
+
+    def __init__(self, path=None, max_entries=DEFAULT_MAX_ENTRIES, max_age=DEFAULT_MAX_AGE,
+                 confirm_after=None, clock=time.time):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.confirm_after = confirm_after
+        self.clock = clock
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _key(item1, item2):
+        if item1 < item2:
+            return (item1, item2), 1
+        return (item2, item1), -1
+
+    def lookup(self, item1, item2):
+        """Escolha já dada para o par (-1 = item1, 1 = item2, 0 = empate) ou None."""
+        key, sign = self._key(item1, item2)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        choice, answered_at = entry
+        age = self.clock() - answered_at
+        if age > self.max_age:
+            del self._entries[key]
+            return None
+        if self.confirm_after is not None and age > self.confirm_after:
+            return None
+        self._entries.move_to_end(key)
+        return choice * sign
+
+    def put(self, item1, item2, choice, answered_at=None):
+        if choice not in (-1, 0, 1):
+            raise ValueError(f"Escolha inválida: {choice!r}")
+        if item1 == item2:
+            raise ValueError(f"Par com o mesmo jogo: {item1!r}")
+        key, sign = self._key(item1, item2)
+        self._entries[key] = (choice * sign, self.clock() if answered_at is None else answered_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def update(self, history, answered_at=None):
+        # Decisões [(jogo1, jogo2, escolha), ...], como RankingEngine.user_history()
+        answered_at = self.clock() if answered_at is None else answered_at
+        for item1, item2, choice in history:
+            self.put(item1, item2, choice, answered_at)
+
+    # Arquivo
+
+    def dumps(self):
+        # Colunas em listas paralelas, na ordem de uso: listas de str e int
+        # são o caso rápido do marshal
+        firsts, seconds, choices, times = [], [], [], []
+        for (first, second), (choice, answered_at) in self._entries.items():
+            firsts.append(first)
+            seconds.append(second)
+            choices.append(choice)
+            times.append(answered_at)
+        return marshal.dumps((CACHE_VERSION, firsts, seconds, bytes(c + 1 for c in choices), times))
+
+    def loads(self, data):
+        version, firsts, seconds, choices, times = marshal.loads(data)
+        if version != CACHE_VERSION:
+            raise ValueError(f"Versão de cache desconhecida: {version!r}")
+        oldest = self.clock() - self.max_age
+        entries = OrderedDict(
+            ((first, second), (choice - 1, answered_at))
+            for first, second, choice, answered_at in zip(firsts, seconds, choices, times)
+            if answered_at >= oldest
+        )
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        self._entries = entries
+
+    @classmethod
+    def load(cls, path=None, **kwargs):
+        """Abre o cache do arquivo; ausente ou ilegível, começa vazio (é só um cache)."""
+        cache = cls(path or default_cache_path(), **kwargs)
+        try:
+            with open(cache.path, 'rb') as file:
+                cache.loads(file.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            cache._entries = OrderedDict()
+        return cache
+
+    def save(self, path=None):
+        path = path or self.path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as file:
+            file.write(self.dumps())
+        os.replace(tmp_path, path)
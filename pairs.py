@@ -0,0 +1,118 @@
+import math
+import random
+
+_MASK64 = (1 << 64) - 1
+_ROUNDS = 4
+
+
+def pair_count(n):
+    return n * (n - 1) // 2
+
+
+# Requisito R2: decodifica o índice k de uma combinação no par (i, j), i < j
+def decode_pair(k):
+    j = (1 + math.isqrt(1 + 8 * k)) // 2
+    return k - j * (j - 1) // 2, j
+
+
+def encode_pair(i, j):
+    if i > j:
+        i, j = j, i
+    return j * (j - 1) // 2 + i
+
+
+class PairStream:
+    """Sequência embaralhada e preguiçosa de todos os pares de n itens.
+
+    A ordem é uma permutação pseudoaleatória dos índices de combinação
+    (rede de Feistel com "cycle walking"), então nenhum par é materializado:
+    a memória é O(1) além das trocas feitas por promote() e cada passo é O(1).
+    """
+
+    def __init__(self, n, rng=None):
+        rng = rng if rng is not None else random.Random()
+        self.n = n
+        self.total = pair_count(n)
+        self._half_bits = max(1, ((self.total - 1).bit_length() + 1) // 2)
+        self._half_mask = (1 << self._half_bits) - 1
+        self._keys = [rng.getrandbits(64) for _ in range(_ROUNDS)]
+        self._cursor = 0
+        # Posições trocadas por promote(): posição -> índice de combinação
+        self._swaps = {}
+
+    def __len__(self):
+        return self.total
+
+    @property
+    def position(self):
+        return self._cursor
+
+    @property
+    def remaining(self):
+        return self.total - self._cursor
+
+    @property
+    def finished(self):
+        return self._cursor >= self.total
+
+    def _feistel(self, x):
+        bits, mask = self._half_bits, self._half_mask
+        left, right = x >> bits, x & mask
+        for key in self._keys:
+            f = ((right ^ key) * 0x9E3779B97F4A7C15) & _MASK64
+            f ^= f >> 29
+            left, right = right, left ^ (f & mask)
+        return (left << bits) | right
+
+    def _permute(self, pos):
+        x = self._feistel(pos)
+        while x >= self.total:
+            x = self._feistel(x)
+        return x
+
+    def index_at(self, pos):
+        swapped = self._swaps.get(pos)
+        return swapped if swapped is not None else self._permute(pos)
+
+    def pair_at(self, pos):
+        return decode_pair(self.index_at(pos))
+
+    def current(self):
+        if self.finished:
+            return None
+        return self.pair_at(self._cursor)
+
+    def peek(self, offset=1):
+        pos = self._cursor + offset
+        if pos >= self.total:
+            return None
+        return self.pair_at(pos)
+
+    def advance(self):
+        if self.finished:
+            raise IndexError("Não há mais pares")
+        self._cursor += 1
+
+    # Interface comum dos agendamentos: a resposta não altera a ordem dos pares
+    def record(self, choice):
+        self.advance()
+
+    def back(self):
+        if self._cursor == 0:
+            raise IndexError("Nenhum par anterior")
+        self._cursor -= 1
+
+    # Troca o par atual pelo próximo par pendente que contém o item (O(restantes))
+    def promote(self, item):
+        cur = self._cursor
+        for pos in range(cur, self.total):
+            i, j = self.pair_at(pos)
+            if i == item or j == item:
+                if pos != cur:
+                    self._swaps[pos], self._swaps[cur] = self.index_at(cur), self.index_at(pos)
+                return True
+        return False
+
+    def __iter__(self):
+        for pos in range(self._cursor, self.total):
+            yield self.pair_at(pos)
@@ -1,77 +1,366 @@
 import tkinter as tk
 from tkinter import messagebox
-import random
-import itertools
+import atexit
 import math
-import csv
+import io
 import os
+import queue
+import random
+import time
 from datetime import datetime
-
-# Requisito R1: Seleção de jogos (entre 2 e 10 antes de iniciar o rankeamento)
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from engine import (
+    RankingEngine, selection_is_valid, max_comparisons,
+    MIN_GAMES, MAX_GAMES_BY_MODE, MODE_ROUND_ROBIN, MODE_SORT, MODE_TOP_K,
+    DEFAULT_TOP_K, RATING_WINS, RATING_BRADLEY_TERRY, RATING_ELO,
+    TRANSITIVE_CHECK, TRANSITIVE_PRUNE,
+)
+from search import TitleIndex
+from ratings import np
+from catalog import load_catalog, DEFAULT_CATALOG
+from journal import (
+    SessionJournal, JournalError, resume as resume_journal, has_open_session, discard as discard_journal,
+)
+from results import ranking_filename
+from resultstore import ResultStore, DEFAULT_DB, DEFAULT_RESULTS_DIR as RESULTS_DIR
+from writer import BackgroundWriter
+from paircache import PairCache, DEFAULT_CONFIRM_AFTER
+import stats
+from instrument import recorder, enable_from_environment
+from inputqueue import InputQueue, KEY_BINDINGS, CHOICE_LEFT, CHOICE_TIE, CHOICE_RIGHT, BACK
+
+# Diário da sessão em andamento, usado para retomar após uma queda
+JOURNAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sessions", "current.journal")
+
+MODE_LABELS = {
+    MODE_ROUND_ROBIN: "Todos os pares",
+    MODE_SORT: "Ordenação (menos comparações)",
+    MODE_TOP_K: "Apenas os k primeiros",
+}
+
+# Intervalo de consulta da gravação em segundo plano e prazo para
+# concluí-la ao fechar a janela
+WRITER_POLL_MS = 100
+WRITER_CLOSE_TIMEOUT = 10
+
+STATS_POLL_MS = 50
+INDEX_POLL_MS = 50
+
+_writer = None
+_stats_worker = None
+_pair_cache = None
+
+
+# Outra sessão salva no mesmo segundo ganha um sufixo em vez de
+# sobrescrever o CSV (e de ser confundida com ela pelo nome)
+def unused_ranking_filename(store, timestamp):
+    filename = ranking_filename(timestamp)
+    suffix = 1
+    while store.session_for_source(filename) is not None or os.path.exists(os.path.join(RESULTS_DIR, filename)):
+        suffix += 1
+        filename = ranking_filename(f"{timestamp}_{suffix}")
+    return filename
+
+
+def background_writer():
+    global _writer
+    if _writer is None:
+        _writer = BackgroundWriter()
+        atexit.register(_writer.close, WRITER_CLOSE_TIMEOUT)
+    return _writer
+
+def statistics_worker():
+    global _stats_worker
+    if _stats_worker is None:
+        _stats_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stats")
+    return _stats_worker
+
+# Respostas de sessões anteriores, carregadas uma vez por execução: a
+# gravação de uma sessão pode ainda estar na fila quando a próxima começa
+def pair_cache():
+    global _pair_cache
+    if _pair_cache is None:
+        _pair_cache = PairCache.load()
+    return _pair_cache
+
+# Quantos itens a classificação parcial mostra durante as comparações
+LIVE_STANDINGS = 5
+
+RATING_LABELS = {
+    RATING_WINS: "Vitórias",
+    RATING_BRADLEY_TERRY: "Bradley–Terry",
+    RATING_ELO: "Elo",
+}
+
+# Requisito R1: Seleção de jogos (entre 2 e 10 antes de iniciar o rankeamento;
+# o modo de ordenação aceita listas maiores)
 class GameSelector:
     def __init__(self, root, container, games, callback):
         self.root = root
         self.container = container
         self.games = games
         self.callback = callback
-        self.check_vars = {}
+        # Seleção como conjunto de índices do catálogo: contagem em O(1)
+        self.selected = set()
+        # Índice de busca montado numa thread à parte assim que a tela abre:
+        # não atrasa a abertura nem trava a primeira tecla
+        self.index = None
+        self.index_future = None
+        self.labels = [g.replace('\n', ' ') for g in games]
+        self.mode_var = None
+        self.k_var = None
+        self.rating_var = None
+        self.reuse_var = None
+        self.reconfirm_var = None
+        self.prune_var = None
 
     def show(self):
         # Limpa widgets anteriores
         for w in self.container.winfo_children():
             w.destroy()
 
-        tk.Label(self.container, text="Selecione de 2 a 10 jogos:", font=("Helvetica", 14, "bold")).pack(pady=10)
+        self.title_label = tk.Label(self.container, font=("Helvetica", 14, "bold"))
+        self.title_label.pack(pady=10)
+
+        # Modo de comparação
+        self.mode_var = tk.StringVar(value=MODE_ROUND_ROBIN)
+        mode_frame = tk.Frame(self.container)
+        mode_frame.pack()
+        for mode, label in MODE_LABELS.items():
+            tk.Radiobutton(
+                mode_frame, text=label, value=mode, variable=self.mode_var,
+                command=self.validate_selection
+            ).pack(side=tk.LEFT, padx=10)
+
+        self.k_var = tk.IntVar(value=DEFAULT_TOP_K)
+        tk.Label(mode_frame, text="k =").pack(side=tk.LEFT)
+        tk.Spinbox(
+            mode_frame, from_=1, to=10, width=3, textvariable=self.k_var,
+            command=self.validate_selection
+        ).pack(side=tk.LEFT)
+
+        # Pontuação do modo de todos os pares
+        self.rating_var = tk.StringVar(value=RATING_WINS)
+        rating_frame = tk.Frame(self.container)
+        rating_frame.pack()
+        tk.Label(rating_frame, text="Pontuação:").pack(side=tk.LEFT)
+        for rating, label in RATING_LABELS.items():
+            # Bradley–Terry depende do numpy; sem ele a opção fica desabilitada
+            available = rating != RATING_BRADLEY_TERRY or np is not None
+            tk.Radiobutton(
+                rating_frame, text=label if available else f"{label} (requer numpy)", value=rating,
+                variable=self.rating_var, state=tk.NORMAL if available else tk.DISABLED
+            ).pack(side=tk.LEFT, padx=5)
+
+        # Cache de respostas entre sessões (opcional): pares já respondidos
+        # em sessões anteriores não são perguntados de novo
+        answers_frame = tk.Frame(self.container)
+        answers_frame.pack()
+        self.reuse_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            answers_frame, text="Reaproveitar respostas anteriores", variable=self.reuse_var
+        ).pack(side=tk.LEFT, padx=5)
+        self.reconfirm_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            answers_frame, text=f"Reconfirmar as de mais de {DEFAULT_CONFIRM_AFTER // (24 * 60 * 60)} dias",
+            variable=self.reconfirm_var
+        ).pack(side=tk.LEFT, padx=5)
+
+        # Todos os pares: pula os deduzidos por transitividade; sem a opção,
+        # respostas que formam ciclos são apontadas na tela de comparação
+        self.prune_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            self.container, text="Pular pares deduzidos (A > B e B > C ⇒ A > C)",
+            variable=self.prune_var
+        ).pack()
+
+        # Busca sobre o índice pré-montado; filtra a cada tecla
+        search_frame = tk.Frame(self.container)
+        search_frame.pack(fill=tk.X, pady=(10, 0))
+        tk.Label(search_frame, text="Buscar:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *args: self.filter())
+        # A busca só é liberada com o índice pronto
+        self.search_entry = tk.Entry(search_frame, textvariable=self.search_var,
+                                     state=tk.NORMAL if self.index is not None else tk.DISABLED)
+        self.search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
 
-        # Cria área rolável
-        scroll_canvas = tk.Canvas(self.container)
-        scrollbar = tk.Scrollbar(self.container, orient=tk.VERTICAL, command=scroll_canvas.yview)
-        scroll_canvas.configure(yscrollcommand=scrollbar.set)
-        scroll_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.start_btn = tk.Button(self.container, text="Iniciar Rankeamento", state=tk.DISABLED, command=self.start)
+        self.start_btn.pack(side=tk.BOTTOM, pady=20)
+
+        # Lista virtual: só existem widgets para as linhas visíveis
+        self.selected.clear()
+        self.game_list = VirtualCheckList(self.container, self.labels, self.selected, self.validate_selection)
+        self.game_list.pack(fill=tk.BOTH, expand=True, pady=10)
+        self.validate_selection()
+        self.prepare_index()
+
+    def prepare_index(self):
+        if self.index is not None or self.index_future is not None:
+            return
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="title-index")
+        self.index_future = pool.submit(TitleIndex, self.games)
+        pool.shutdown(wait=False)
+        self.root.after(INDEX_POLL_MS, self.poll_index)
+
+    def poll_index(self):
+        if not self.index_future.done():
+            self.root.after(INDEX_POLL_MS, self.poll_index)
+            return
+        self.index = self.index_future.result()
+        if self.search_entry.winfo_exists():
+            self.search_entry.config(state=tk.NORMAL)
+
+    def filter(self):
+        if self.index is None:
+            return
+        self.game_list.set_rows(self.index.search(self.search_var.get()))
 
-        list_frame = tk.Frame(scroll_canvas)
-        scroll_canvas.create_window((0, 0), window=list_frame, anchor='nw')
+    def validate_selection(self):
+        mode = self.mode_var.get()
+        max_games = MAX_GAMES_BY_MODE[mode]
+        count = len(self.selected)
 
-        def on_frame_config(event):
-            scroll_canvas.configure(scrollregion=scroll_canvas.bbox("all"))
-        list_frame.bind("<Configure>", on_frame_config)
+        title = f"Selecione de {MIN_GAMES} a {max_games} jogos:"
+        if count >= MIN_GAMES:
+            title += f" (até {max_comparisons(count, mode, self.selected_k())} comparações)"
+        self.title_label.configure(text=title)
 
-        # Divide em duas colunas: primeiros 25 à esquerda, demais à direita
-        left_games = self.games[:25]
-        right_games = self.games[25:]
+        if selection_is_valid(count, max_games=max_games):
+            self.start_btn.configure(state=tk.NORMAL)
+        else:
+            self.start_btn.configure(state=tk.DISABLED)
 
-        left_frame = tk.Frame(list_frame)
-        left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0,10))
-        right_frame = tk.Frame(list_frame)
-        right_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(10,0))
+    def selected_k(self):
+        try:
+            return max(1, self.k_var.get())
+        except tk.TclError:
+            return DEFAULT_TOP_K
 
-        # Cria checkboxes
-        for game in left_games:
-            var = tk.IntVar(value=0)
-            cb = tk.Checkbutton(left_frame, text=game, variable=var, command=self.validate_selection)
-            cb.pack(anchor=tk.W)
-            self.check_vars[game] = var
+    def start(self):
+        selected = [self.games[i] for i in sorted(self.selected)]
+        self.callback(
+            selected,
+            mode=self.mode_var.get(),
+            k=self.selected_k(),
+            rating=self.rating_var.get(),
+            transitive=TRANSITIVE_PRUNE if self.prune_var.get() else TRANSITIVE_CHECK,
+            reuse_answers=self.reuse_var.get(),
+            reconfirm_answers=self.reconfirm_var.get()
+        )
 
-        for game in right_games:
-            var = tk.IntVar(value=0)
-            cb = tk.Checkbutton(right_frame, text=game, variable=var, command=self.validate_selection)
-            cb.pack(anchor=tk.W)
-            self.check_vars[game] = var
+class VirtualCheckList(tk.Frame):
+    """Lista de checkboxes virtualizada para catálogos grandes.
 
-        self.start_btn = tk.Button(self.container, text="Iniciar Rankeamento", state=tk.DISABLED, command=self.start)
-        self.start_btn.pack(pady=20)
+    Mantém um conjunto fixo de linhas, do tamanho da área visível, e apenas
+    troca o texto e o estado delas ao rolar ou filtrar. A seleção fica no
+    conjunto de índices compartilhado com o GameSelector.
+    """
 
-    def validate_selection(self):
-        count = sum(v.get() for v in self.check_vars.values())
-        if 2 <= count <= 10:
-            self.start_btn.configure(state=tk.NORMAL)
+    def __init__(self, parent, labels, selected, command, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.labels = labels
+        self.selected = selected
+        self.command = command
+        self.rows = range(len(labels))
+        self.first = 0
+        self.pool = []
+        self.row_height = None
+        self.visible = 1
+
+        # O tamanho da área vem do pack, não das linhas que ela contém
+        self.body = tk.Frame(self)
+        self.body.grid_propagate(False)
+        self.body.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.body.bind("<Configure>", self.on_resize)
+        for widget in (self.body, self.scrollbar):
+            self.bind_wheel(widget)
+
+    def bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        widget.bind("<Button-4>", lambda e: self.scroll(-1))
+        widget.bind("<Button-5>", lambda e: self.scroll(1))
+
+    def add_row(self):
+        var = tk.IntVar(value=0)
+        slot = len(self.pool)
+        cb = tk.Checkbutton(self.body, text=" ", variable=var, anchor=tk.W, command=lambda: self.toggle(slot))
+        self.bind_wheel(cb)
+        self.pool.append((cb, var))
+        if self.row_height is None:
+            self.row_height = max(1, cb.winfo_reqheight())
+
+    def on_resize(self, event):
+        if not self.pool:
+            self.add_row()
+        visible = max(1, event.height // self.row_height)
+        while len(self.pool) < visible:
+            self.add_row()
+        self.visible = visible
+        self.refresh()
+
+    def set_rows(self, rows):
+        self.rows = rows
+        self.first = 0
+        self.refresh()
+
+    def scroll(self, delta):
+        self.first += delta
+        self.refresh()
+
+    def yview(self, *args):
+        if args[0] == 'moveto':
+            self.first = int(float(args[1]) * len(self.rows))
+        elif args[0] == 'scroll':
+            step = self.visible if args[2] == 'pages' else 1
+            self.first += int(args[1]) * step
+        self.refresh()
+
+    def refresh(self):
+        total = len(self.rows)
+        visible = self.visible
+        self.first = max(0, min(self.first, total - visible))
+        for slot, (cb, var) in enumerate(self.pool):
+            index = self.first + slot
+            if slot < visible and index < total:
+                game = self.rows[index]
+                cb.configure(text=self.labels[game])
+                var.set(1 if game in self.selected else 0)
+                cb.grid(row=slot, column=0, sticky=tk.W)
+            else:
+                cb.grid_remove()
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + visible) / total))
         else:
-            self.start_btn.configure(state=tk.DISABLED)
+            self.scrollbar.set(0, 1)
 
-    def start(self):
-        selected = [g for g, v in self.check_vars.items() if v.get()]
-        self.callback(selected)
+    def toggle(self, slot):
+        game = self.rows[self.first + slot]
+        if self.pool[slot][1].get():
+            self.selected.add(game)
+        else:
+            self.selected.discard(game)
+        self.command()
+
+# Vértices do retângulo arredondado: só dependem das medidas, então são
+# calculados uma vez e reaproveitados por todos os botões
+@lru_cache(maxsize=32)
+def rounded_rect_points(x1, y1, x2, y2, radius):
+    return (
+        x1 + radius, y1, x2 - radius, y1,
+        x2 - radius, y1, x2, y1, x2, y1 + radius,
+        x2, y1 + radius, x2, y2 - radius,
+        x2, y2 - radius, x2, y2, x2 - radius, y2,
+        x2 - radius, y2, x1 + radius, y2,
+        x1 + radius, y2, x1, y2, x1, y2 - radius,
+        x1, y2 - radius, x1, y1 + radius,
+        x1, y1 + radius, x1, y1, x1 + radius, y1,
+    )
 
 class RoundedButton(tk.Canvas):
     def __init__(self, parent, text, command, radius=25, **kwargs):
@@ -97,33 +386,21 @@ class RoundedButton(tk.Canvas):
         self.configure(width=self.width, height=self.height)
 
     def create_rounded_rect(self, x1, y1, x2, y2, radius=25, **kwargs):
-        points = []
-        points += [x1 + radius, y1,
-                   x2 - radius, y1]
-        points += [x2 - radius, y1,
-                   x2, y1,
-                   x2, y1 + radius]
-        points += [x2, y1 + radius,
-                   x2, y2 - radius]
-        points += [x2, y2 - radius,
-                   x2, y2,
-                   x2 - radius, y2]
-        points += [x2 - radius, y2,
-                   x1 + radius, y2]
-        points += [x1 + radius, y2,
-                   x1, y2,
-                   x1, y2 - radius]
-        points += [x1, y2 - radius,
-                   x1, y1 + radius]
-        points += [x1, y1 + radius,
-                   x1, y1,
-                   x1 + radius, y1]
-        
-        return self.create_polygon(points, **kwargs, smooth=True)
+        return self.create_polygon(rounded_rect_points(x1, y1, x2, y2, radius), **kwargs, smooth=True)
+
+    def set_text(self, text):
+        self.itemconfig(self.text, text=text)
 
+    # O comando roda na hora; o destaque do clique só volta à cor de hover
+    # depois, sem atrasar a próxima entrada
     def on_click(self, event):
         self.itemconfig(self.rect, fill=self.fill_colors['active'])
-        self.after(100, self.command)
+        self.after(100, self.release)
+        self.command()
+
+    def release(self):
+        if self.winfo_exists():
+            self.itemconfig(self.rect, fill=self.fill_colors['hover'])
 
     def on_enter(self, event):
         self.itemconfig(self.rect, fill=self.fill_colors['hover'])
@@ -155,7 +432,12 @@ class CircularButton(tk.Canvas):
 
     def on_click(self, event):
         self.itemconfig(self.circle, fill=self.fill_colors['active'])
-        self.after(100, self.command)
+        self.after(100, self.release)
+        self.command()
+
+    def release(self):
+        if self.winfo_exists():
+            self.itemconfig(self.circle, fill=self.fill_colors['hover'])
 
     def on_enter(self, event):
         self.itemconfig(self.circle, fill=self.fill_colors['hover'])
@@ -164,28 +446,92 @@ class CircularButton(tk.Canvas):
         self.itemconfig(self.circle, fill=self.fill_colors['normal'])
 
 class Ranker:
-    def __init__(self, root, frame, items):
+    def __init__(self, root, frame, items, mode=MODE_ROUND_ROBIN, k=DEFAULT_TOP_K,
+                 rating=RATING_WINS, transitive=None, journal_path=None, label_of=None, answers=None):
         self.root = root
         self.frame = frame
-        self.items = items
-        self.scores = {item: 0 for item in items}
-        self.pairs = list(itertools.combinations(items, 2))
-        random.shuffle(self.pairs)
-        self.remaining_pairs = self.pairs.copy()
-        self.history = []
-        self.current_pair = None
+        self.journal = None
+        # PairCache com as respostas de sessões anteriores, ou None
+        self.answers = answers
+        # Sessão e CSV desta execução no histórico, preenchidos na primeira gravação
+        self.saved = {}
+        if journal_path is None:
+            self.engine = RankingEngine(items, mode=mode, k=k, rating=rating, transitive=transitive)
+        else:
+            # A semente vai para o diário para que a retomada reproduza os pares
+            seed = random.getrandbits(63)
+            self.engine = RankingEngine(items, rng=random.Random(seed), mode=mode, k=k, rating=rating,
+                                        transitive=transitive)
+            options = {'mode': mode, 'k': k, 'rating': rating, 'transitive': transitive}
+            # A retomada volta a usar o cache com a mesma reconfirmação
+            cache_options = None if answers is None else {'confirm_after': answers.confirm_after}
+            self.journal = SessionJournal.create(journal_path, items, options, seed, answers=cache_options)
+        self.apply_known_answers()
+        self.setup_view(label_of)
+
+    # Reconstrói uma sessão interrompida a partir do diário; answers é a
+    # função que devolve o PairCache, chamada só se a sessão usava o cache
+    @classmethod
+    def resume(cls, root, frame, journal_path, label_of=None, answers=None):
+        ranker = cls.__new__(cls)
+        ranker.root = root
+        ranker.frame = frame
+        ranker.answers = None
+        ranker.saved = {}
+        ranker.engine, ranker.journal = resume_journal(journal_path)
+        cache_options = ranker.journal.header.get('answers')
+        if cache_options is not None and answers is not None:
+            ranker.answers = answers()
+            ranker.answers.confirm_after = cache_options.get('confirm_after')
+            ranker.apply_known_answers()
+        ranker.setup_view(label_of)
+        return ranker
+
+    def setup_view(self, label_of):
+        # Rótulo de exibição (com quebras de linha) a partir da chave do jogo
+        self.label_of = label_of or (lambda item: item)
+        # Rótulos de todos os jogos da sessão calculados de antemão: nos
+        # modos adaptativos o próximo par depende da resposta, então todos
+        # ficam prontos e a troca de par só atualiza textos
+        self.labels = {item: self.label_of(item) for item in self.engine.items}
+        self.screen = None
+        # Cliques e teclas passam pela fila, marcados com o par exibido
+        self.inputs = InputQueue(self.engine, self.apply_action)
+        self.shown_version = None
+        self.drain_scheduled = False
+        # Instrumentação (desligada por padrão): uma coleta por sessão
+        self.input_started = None
+        self.metrics_tag = None
+        recorder.reset()
+
+    @property
+    def items(self):
+        return self.engine.items
+
+    @property
+    def scores(self):
+        return self.engine.results()
+
+    @property
+    def history(self):
+        return self.engine.history
+
+    @property
+    def current_pair(self):
+        return self.engine.current_pair
 
     def start_ranking(self):
         self.next_pair()
 
     def next_pair(self):
-        if self.remaining_pairs:
-            self.current_pair = self.remaining_pairs.pop(0)
-            self.show_pair(*self.current_pair)
-        else:
-            self.show_results()
-
-    def show_pair(self, item1, item2):
+        with recorder.span("next_pair"):
+            if not self.engine.finished:
+                self.show_pair(*self.engine.current_pair)
+            else:
+                self.show_results()
+
+    # Tela de comparação montada uma única vez; cada par só troca os textos
+    def build_comparison_screen(self):
         for widget in self.frame.winfo_children():
             widget.destroy()
 
@@ -199,23 +545,25 @@ class Ranker:
         buttons_frame = tk.Frame(main_container)
         buttons_frame.pack(expand=True, fill=tk.BOTH, pady=20)
 
-        RoundedButton(
+        self.left_button = RoundedButton(
             buttons_frame,
-            text=item1,
-            command=lambda: self.handle_choice(-1)
-        ).pack(side=tk.LEFT, expand=True, padx=10)
+            text="",
+            command=lambda: self.submit(CHOICE_LEFT)
+        )
+        self.left_button.pack(side=tk.LEFT, expand=True, padx=10)
 
         CircularButton(
             buttons_frame,
             text="Empate",
-            command=lambda: self.handle_choice(0)
+            command=lambda: self.submit(CHOICE_TIE)
         ).pack(side=tk.LEFT, padx=10)
 
-        RoundedButton(
+        self.right_button = RoundedButton(
             buttons_frame,
-            text=item2,
-            command=lambda: self.handle_choice(1)
-        ).pack(side=tk.LEFT, expand=True, padx=10)
+            text="",
+            command=lambda: self.submit(CHOICE_RIGHT)
+        )
+        self.right_button.pack(side=tk.LEFT, expand=True, padx=10)
 
         bottom_frame = tk.Frame(main_container)
         bottom_frame.pack(pady=20)
@@ -229,66 +577,265 @@ class Ranker:
             bg='#404040',
             fg='white',
             activebackground='#303030',
-            command=self.handle_back,
-            state=tk.NORMAL if self.history else tk.DISABLED
+            command=lambda: self.submit(BACK)
         )
         self.back_button.pack()
 
+        # Aviso de resposta que contradiz as anteriores (ciclo no fecho transitivo)
+        self.cycle_label = tk.Label(bottom_frame, text="", font=("Helvetica", 9), fg="#b00020")
+        self.cycle_label.pack(pady=(5, 0))
+
+        # Atalhos: ← / a / 1 esquerda, ↓ / espaço / s / 2 empate,
+        # → / d / 3 direita, Backspace / z voltar
+        for keysym, action in KEY_BINDINGS.items():
+            self.root.bind(f"<KeyPress-{keysym}>", lambda event, action=action: self.submit(action))
+
+        # Classificação parcial, lida direto do placar incremental do motor
+        standings_frame = tk.Frame(main_container)
+        standings_frame.pack(pady=(0, 10))
+        tk.Label(standings_frame, text="Parcial", font=("Helvetica", 10, "bold")).pack()
+        self.standings_labels = []
+        for _ in range(min(LIVE_STANDINGS, len(self.engine.items))):
+            label = tk.Label(standings_frame, font=("Helvetica", 9), fg="#666666")
+            label.pack(anchor=tk.W)
+            self.standings_labels.append(label)
+
+        self.screen = main_container
+
+    def show_pair(self, item1, item2):
+        if self.screen is None or not self.screen.winfo_exists():
+            with recorder.span("build_screen"):
+                self.build_comparison_screen()
+        with recorder.span("update_screen"):
+            self.update_comparison_screen(item1, item2)
+
+    def update_comparison_screen(self, item1, item2):
+        self.shown_version = self.engine.version
+
+        self.left_button.set_text(self.labels[item1])
+        self.right_button.set_text(self.labels[item2])
+        self.back_button.config(state=tk.NORMAL if self.engine.can_undo else tk.DISABLED)
+        cycle = self.engine.last_cycle
+        self.cycle_label.config(text="Ciclo: " + " > ".join(cycle) if cycle else "")
+
+        standings = self.engine.standings(0, len(self.standings_labels))
+        for index, (label, (item, score)) in enumerate(zip(self.standings_labels, standings), start=1):
+            label.config(text=f"{index}º  {item}  ★ {score}")
+
+    # Entrada do usuário: enfileira e processa quando o Tk estiver ocioso,
+    # para que cliques e teclas em sequência nunca esperem pela tela
+    def submit(self, action):
+        if recorder.enabled:
+            recorder.count("inputs")
+            if self.input_started is None:
+                self.input_started = time.perf_counter()
+        self.inputs.push(self.shown_version, action)
+        if not self.drain_scheduled:
+            self.drain_scheduled = True
+            self.root.after_idle(self.process_inputs)
+
+    def process_inputs(self):
+        self.drain_scheduled = False
+        with recorder.span("process_inputs"):
+            if self.inputs.drain():
+                self.next_pair()
+        # Do primeiro clique/tecla pendente até o próximo par na tela
+        if self.input_started is not None:
+            recorder.observe("input_to_pair", time.perf_counter() - self.input_started)
+            self.input_started = None
+
+    def apply_action(self, action):
+        if action == BACK:
+            self.handle_back()
+        else:
+            self.handle_choice(action)
+
     def handle_choice(self, choice):
-        item1, item2 = self.current_pair
-        
-        if choice == -1:
-            self.scores[item1] += 1
-        elif choice == 1:
-            self.scores[item2] += 1
+        with recorder.span("handle_choice"):
+            a, b = self.engine.current_ids
+            self.engine.choose(choice)
+            if self.journal:
+                self.journal.record_choice(a, b, choice)
+                self.journal.maybe_snapshot(self.engine)
+            self.apply_known_answers()
+
+    # Pula os pares seguintes que já têm resposta no cache; no diário elas
+    # entram marcadas, para a retomada e a volta saberem separá-las. Cada
+    # uma é registrada assim que aplicada: um snapshot nunca fica à frente
+    # dos eventos gravados
+    def apply_known_answers(self):
+        if self.answers is None:
+            return
+        self.engine.apply_known(self.answers.lookup, self.journal_known if self.journal else None)
+
+    def journal_known(self, a, b, choice):
+        self.journal.record_known(a, b, choice)
+        self.journal.maybe_snapshot(self.engine)
+
+    # Guarda no cache as respostas dadas nesta sessão e grava o arquivo em
+    # segundo plano; os bytes são gerados aqui, fora da thread de gravação
+    def store_answers(self):
+        if self.answers is None:
+            return
+        self.answers.update(self.engine.user_history())
+        path, data = self.answers.path, self.answers.dumps()
+        try:
+            background_writer().submit(lambda files: files.write(path, data), self.on_answers_stored)
+        except (queue.Full, RuntimeError):
+            return
+        self.poll_writer()
 
-        self.history.append((item1, item2, choice))
-        self.next_pair()
+    def on_answers_stored(self, ok, value):
+        if not ok:
+            self.set_status(f"Não foi possível gravar as respostas para as próximas sessões: {value}", error=True)
 
     def handle_back(self):
-        if self.history:
-            item1, item2, choice = self.history.pop()
-            
-            if choice == -1:
-                self.scores[item1] -= 1
-            elif choice == 1:
-                self.scores[item2] -= 1
-            
-            self.remaining_pairs.insert(0, (item1, item2))
-            self.next_pair()
+        with recorder.span("handle_back"):
+            if self.engine.undo():
+                if self.journal:
+                    self.journal.record_back()
+                    self.journal.maybe_snapshot(self.engine)
+
+    # API do motor exposta na visão (usada pelos testes do sistema)
+    def selecionar_jogos(self, jogos):
+        self.engine.selecionar_jogos(jogos)
+
+    def botao_iniciar_habilitado(self):
+        return self.engine.botao_iniciar_habilitado()
+
+    def votar(self, jogo):
+        self.engine.votar(jogo)
 
+    def empatar(self):
+        self.engine.empatar()
+
+    def voltar(self):
+        return self.engine.voltar()
+
+    def fim(self):
+        return self.engine.fim()
+
+    def obter_par_atual(self):
+        return self.engine.obter_par_atual()
+
+    def obter_resultado(self):
+        return self.engine.obter_resultado()
+
+    def exibir_ranking(self):
+        return self.engine.exibir_ranking()
+
+    # A gravação roda na thread de segundo plano; aqui só se copia o estado
+    # da sessão e se acompanha o resultado pela linha de status
     def save_results(self):
+        engine = self.engine
+        ranked_items, resolved, history = engine.ranking(), engine.resolved, engine.history
+        options = (engine.mode, engine.rating, engine.k)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        saved = self.saved
+
+        def job(files):
+            started = time.perf_counter()
+            # Sessão completa (ranking e decisões) no histórico SQLite; o CSV
+            # de sempre é exportado a partir dele. O nome do CSV vai como
+            # origem da sessão, para import_csv_archive não a importar de
+            # novo. Salvar outra vez a mesma sessão reaproveita a sessão e o
+            # arquivo; só esta thread lê e preenche saved, na ordem dos cliques
+            with ResultStore(DEFAULT_DB) as store:
+                if not saved:
+                    filename = unused_ranking_filename(store, timestamp)
+                    saved['session_id'] = store.save_session(ranked_items, resolved, history, *options,
+                                                             source=filename)
+                    saved['filename'] = filename
+                buffer = io.StringIO(newline='')
+                store.export_csv(saved['session_id'], buffer)
+            full_path = os.path.join(RESULTS_DIR, saved['filename'])
+            files.write(full_path, buffer.getvalue().encode('utf-8'))
+            return full_path, saved['session_id'], time.perf_counter() - started
+
         try:
-            ranked_items = sorted(self.scores.items(), key=lambda x: x[1], reverse=True)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            save_dir = os.path.join(script_dir, "results")
-            os.makedirs(save_dir, exist_ok=True)
-            
-            filename = f"ranking_{timestamp}.csv"
-            full_path = os.path.join(save_dir, filename)
-            
-            with open(full_path, 'w', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file)
-                writer.writerow(["Posição", "Jogo", "Pontuação"])
-                for index, (item, score) in enumerate(ranked_items, start=1):
-                    writer.writerow([index, item, score])
-            
-            messagebox.showinfo(
-                "Resultados Salvos",
-                f"Arquivo salvo com sucesso!\nLocal: {full_path}"
-            )
-        except Exception as e:
-            messagebox.showerror(
-                "Erro ao Salvar",
-                f"Não foi possível salvar o arquivo:\n{str(e)}"
-            )
+            background_writer().submit(job, self.on_saved)
+        except (queue.Full, RuntimeError):
+            self.set_status("Gravações demais na fila; tente de novo em instantes", error=True)
+            return
+        self.set_status("Salvando…")
+        self.poll_writer()
+
+    def poll_writer(self):
+        writer = background_writer()
+        for callback, ok, value in writer.poll():
+            if callback is not None:
+                callback(ok, value)
+        if writer.pending:
+            self.root.after(WRITER_POLL_MS, self.poll_writer)
+
+    def on_saved(self, ok, value):
+        if ok:
+            full_path, session_id, elapsed = value
+            # Medido na thread de gravação, registrado aqui na thread do Tk
+            recorder.observe("save_results", elapsed)
+            self.flush_metrics()
+            self.set_status(f"Salvo em {full_path} (sessão nº {session_id} no histórico)")
+        else:
+            self.set_status(f"Não foi possível salvar o arquivo: {value}", error=True)
+
+    def set_status(self, text, error=False):
+        label = getattr(self, 'status_label', None)
+        if label is not None and label.winfo_exists():
+            label.config(text=text, fg="#b00020" if error else "#666666")
+
+    # Métricas da sessão (se ligadas), regravadas a cada salvamento
+    def flush_metrics(self):
+        if recorder.enabled:
+            recorder.counters["inputs_applied"] = self.inputs.applied
+            recorder.counters["inputs_dropped"] = self.inputs.dropped
+            if self.metrics_tag is None:
+                self.metrics_tag = datetime.now().strftime("%Y%m%d_%H%M%S")
+            recorder.flush(self.metrics_tag)
 
     def show_results(self):
-        for widget in self.frame.winfo_children():
-            widget.destroy()
-
+        # Sessão concluída: o diário não é mais necessário
+        if self.journal:
+            self.journal.close(remove=True)
+            self.journal = None
+        self.store_answers()
+
+        with recorder.span("teardown_screen"):
+            for widget in self.frame.winfo_children():
+                widget.destroy()
+            self.screen = None
+            for keysym in KEY_BINDINGS:
+                self.root.unbind(f"<KeyPress-{keysym}>")
+
+        with recorder.span("build_results"):
+            self.build_results_screen()
+        self.flush_metrics()
+
+    # Intervalos de posição por bootstrap, calculados fora da thread do Tk:
+    # a tela final aparece na hora e os intervalos chegam depois
+    def start_statistics(self, ranked_items):
+        if stats.np is None or not self.engine.history or not stats.applies_to(self.engine):
+            return
+        order = [self.engine.index[item] for item, _ in ranked_items]
+        first, second, choice = self.engine.decision_arrays()
+        future = statistics_worker().submit(stats.bootstrap_ranking, first, second, choice, order)
+        self.root.after(STATS_POLL_MS, self.poll_statistics, future)
+
+    def poll_statistics(self, future):
+        if not future.done():
+            self.root.after(STATS_POLL_MS, self.poll_statistics, future)
+            return
+        if future.exception() is not None:
+            return
+        intervals, ahead = future.result()
+        for position, (row, (lo, hi)) in enumerate(zip(self.stability_rows, intervals)):
+            if not row.winfo_exists():
+                return
+            text = f"{lo}º" if lo == hi else f"{lo}º–{hi}º"
+            if position < len(ahead):
+                text += f"  ·  {ahead[position]:.0%} à frente do próximo"
+            tk.Label(row, text=text, font=("Helvetica", 9), fg="#888888").pack(side=tk.RIGHT, padx=10)
+
+    def build_results_screen(self):
         result_frame = tk.Frame(self.frame)
         result_frame.pack(expand=True, fill=tk.BOTH)
 
@@ -298,18 +845,30 @@ class Ranker:
             font=("Helvetica", 16, "bold")
         ).pack(pady=20)
 
-        ranked_items = sorted(self.scores.items(), key=lambda x: x[1], reverse=True)
+        ranked_items = self.engine.ranking()
+        resolved = self.engine.resolved
         
         results_container = tk.Frame(result_frame)
         results_container.pack(expand=True, fill=tk.BOTH)
+        # Linhas que recebem os intervalos quando o bootstrap terminar; os
+        # rótulos só são criados então, sem pesar na montagem da tela
+        self.stability_rows = []
 
         for index, (item, score) in enumerate(ranked_items, start=1):
+            if index == resolved + 1:
+                tk.Label(
+                    results_container,
+                    text="Não resolvidos (ordem aproximada)",
+                    font=("Helvetica", 12, "italic"),
+                    fg="#666666"
+                ).pack(pady=(10, 0))
+
             item_frame = tk.Frame(results_container)
             item_frame.pack(fill=tk.X, padx=50, pady=5)
             
             tk.Label(
                 item_frame,
-                text=f"{index}º",
+                text=f"{index}º" if index <= resolved else "–",
                 font=("Helvetica", 14),
                 width=4,
                 anchor=tk.W
@@ -317,7 +876,7 @@ class Ranker:
             
             tk.Label(
                 item_frame,
-                text=item,
+                text=self.labels[item],
                 font=("Helvetica", 14)
             ).pack(side=tk.LEFT, padx=20)
             
@@ -327,6 +886,10 @@ class Ranker:
                 font=("Helvetica", 12),
                 fg="#666666"
             ).pack(side=tk.RIGHT)
+
+            self.stability_rows.append(item_frame)
+
+        self.start_statistics(ranked_items)
         
         # Botão para salvar
         save_btn = tk.Button(
@@ -340,7 +903,11 @@ class Ranker:
             activebackground='#303030',
             command=self.save_results
         )
-        save_btn.pack(pady=(20, 10))
+        save_btn.pack(pady=(20, 4))
+
+        # Status da gravação, sem janela modal
+        self.status_label = tk.Label(result_frame, text="", font=("Helvetica", 10), fg="#666666")
+        self.status_label.pack(pady=(0, 6))
 
         # Botão para voltar ao início
         restart_btn = tk.Button(
@@ -358,58 +925,8 @@ class Ranker:
 
 # Fluxo principal com Seleção de Jogos (Requisito R1)
 if __name__ == '__main__':
-    listed = [
-        "Super Mario World",
-        "Doom",
-        "Super Metroid",
-        "Final Fantasy VI",
-        "Chrono Trigger",
-        "Donkey Kong Country 2:\nDiddy's Kong Quest",
-        "Super Mario 64",
-        "Final Fantasy VII",
-        "Castlevania:\nSymphony of the Night",
-        "Resident Evil 2",
-        "Metal Gear Solid",
-        "The Legend of Zelda:\nOcarina of Time",
-        "Final Fantasy IX",
-        "Metroid Prime",
-        "Grand Theft Auto:\nSan Andreas",
-        "Halo 2",
-        "Metal Gear Solid 3:\nSnake Eater",
-        "Resident Evil 4",
-        "Shadow of the Colossus",
-        "Kingdom Hearts II",
-        "God of War II",
-        "Bioshock",
-        "Halo 3",
-        "Portal",
-        "Super Mario Galaxy",
-        "Uncharted 2:\nAmong Thieves",
-        "Assassins Creed II",
-        "God of War III",
-        "Red Dead Redemption",
-        "Dark Souls",
-        "Portal 2",
-        "Minecraft",
-        "The Elder Scrolls V:\nSkyrim",
-        "The Last of Us",
-        "Grand Theft Auto V",
-        "Bloodborne",
-        "The Witcher 3:\nWild Hunt",
-        "Undertale",
-        "Dark Souls III",
-        "Uncharted 4:\nA Thief's End",
-        "The Legend of Zelda:\nBreath of the Wild",
-        "Super Mario Odyssey",
-        "Hollow Knight",
-        "Persona 5",
-        "God of War",
-        "Red Dead Redemption 2",
-        "Celeste",
-        "Hades",
-        "It Takes Two",
-        "Elden Ring"
-    ]
+    # RANKER_METRICS=<pasta> liga a instrumentação; RANKER_PROFILE=1 junta o cProfile
+    enable_from_environment()
 
     root = tk.Tk()
     root.title("Game Ranker")
@@ -419,11 +936,51 @@ if __name__ == '__main__':
     main_frame = tk.Frame(root)
     main_frame.pack(expand=True, fill=tk.BOTH, padx=20, pady=20)
 
-    def init_ranker(selected_games):
-        ranker = Ranker(root, main_frame, selected_games)
+    # Catálogo externo (games.csv), com cache binário ao lado do arquivo
+    try:
+        catalog = load_catalog(DEFAULT_CATALOG)
+    except (OSError, ValueError) as e:
+        messagebox.showerror("Erro no Catálogo", f"Não foi possível carregar o catálogo:\n{str(e)}")
+        raise SystemExit(1)
+
+    def init_ranker(selected_games, reuse_answers=False, reconfirm_answers=False, **options):
+        answers = None
+        if reuse_answers:
+            answers = pair_cache()
+            answers.confirm_after = DEFAULT_CONFIRM_AFTER if reconfirm_answers else None
+        try:
+            ranker = Ranker(root, main_frame, selected_games, journal_path=JOURNAL_PATH,
+                            label_of=catalog.label, answers=answers, **options)
+        except ImportError as e:
+            messagebox.showerror("Erro ao Iniciar", str(e))
+            return
         ranker.start_ranking()
 
-    selector = GameSelector(root, main_frame, listed, init_ranker)
-    selector.show()
+    selector = GameSelector(root, main_frame, catalog.titles, init_ranker)
+
+    # Ao fechar, espera as gravações pendentes (com prazo) antes de sair
+    def on_close():
+        if _writer is not None and not _writer.close(WRITER_CLOSE_TIMEOUT):
+            messagebox.showwarning("Gravação pendente", "Alguns resultados podem não ter sido salvos.")
+        root.destroy()
+
+    root.protocol("WM_DELETE_WINDOW", on_close)
+
+    # Retoma uma sessão interrompida, se houver diário pendente
+    resumed = False
+    if has_open_session(JOURNAL_PATH) and messagebox.askyesno(
+        "Sessão interrompida",
+        "Há uma sessão de rankeamento não concluída.\nDeseja retomá-la?"
+    ):
+        try:
+            Ranker.resume(root, main_frame, JOURNAL_PATH, label_of=catalog.label,
+                          answers=pair_cache).start_ranking()
+            resumed = True
+        except (OSError, JournalError) as e:
+            # Sem remover o diário, a mesma pergunta (e o mesmo erro) voltaria a cada abertura
+            discard_journal(JOURNAL_PATH)
+            messagebox.showerror("Erro ao Retomar", f"Não foi possível retomar a sessão:\n{str(e)}")
+    if not resumed:
+        selector.show()
 
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,136 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import RankingEngine, MODE_ROUND_ROBIN
+from journal import MAGIC, JournalError, load_journal
+from results import save_ranking_csv, ranking_filename
+
+DECISION_EXTENSIONS = (".jsonl", ".journal")
+
+
+def read_decisions(path):
+    """Lê um registro de decisões em JSON Lines.
+
+    A primeira linha pode ser um cabeçalho no formato do diário de sessão,
+    {"items": [...], "options": {...}}; as demais são as triplas de
+    Ranker.history, [jogo1, jogo2, escolha]. Sem cabeçalho, os jogos entram
+    na ordem em que aparecem nas decisões.
+    """
+    header = None
+    decisions = []
+    with open(path, encoding='utf-8') as file:
+        for line_number, line in enumerate(file, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: JSON inválido ({e})") from None
+            if isinstance(entry, dict) and header is None and not decisions:
+                if not isinstance(entry.get('items', []), list) or not isinstance(entry.get('options', {}), dict):
+                    raise ValueError(f"{path}:{line_number}: cabeçalho deve ter items (lista) e options (objeto)")
+                header = entry
+            elif (isinstance(entry, list) and len(entry) == 3
+                  and isinstance(entry[0], str) and isinstance(entry[1], str)
+                  and type(entry[2]) is int):
+                decisions.append(tuple(entry))
+            else:
+                raise ValueError(f"{path}:{line_number}: esperado [jogo1, jogo2, escolha]")
+    return header or {}, decisions
+
+
+def score_decisions(header, decisions):
+    # Mesma pontuação de Ranker.handle_choice, sem a ordem de pares da sessão
+    options = dict(header.get('options', {}))
+    if options.get('mode', MODE_ROUND_ROBIN) != MODE_ROUND_ROBIN:
+        raise ValueError("Decisões avulsas só podem ser reprocessadas no modo todos os pares; use o diário da sessão")
+    items = header.get('items')
+    if items is None:
+        items = list(dict.fromkeys(item for a, b, _ in decisions for item in (a, b)))
+    try:
+        engine = RankingEngine(items, **options)
+    except TypeError as e:
+        raise ValueError(f"Cabeçalho inválido: {e}") from None
+    for item1, item2, choice in decisions:
+        engine.record(item1, item2, choice)
+    return engine
+
+
+def replay_file(path):
+    with open(path, 'rb') as file:
+        is_journal = file.read(len(MAGIC)) == MAGIC
+    if is_journal:
+        # Diário binário: reaplica a sessão inteira, em qualquer modo
+        return load_journal(path)
+    return score_decisions(*read_decisions(path))
+
+
+def output_path(path, output_dir):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(output_dir, ranking_filename(stem))
+
+
+def replay_files(paths, output_dir):
+    """Reprocessa um fragmento de arquivos; devolve [(arquivo, erro ou None), ...]."""
+    outcomes = []
+    for path in paths:
+        try:
+            engine = replay_file(path)
+            save_ranking_csv(output_path(path, output_dir), engine.ranking(), engine.resolved)
+            outcomes.append((path, None))
+        except (OSError, ValueError, TypeError, RuntimeError, JournalError) as e:
+            outcomes.append((path, str(e)))
+    return outcomes
+
+
+def replay_all(paths, output_dir, workers=None, chunk_size=100):
+    """Reprocessa todos os arquivos, em fragmentos distribuídos num pool de processos.
+
+    Cada arquivo gera um CSV próprio em output_dir, então a saída não depende
+    do número de processos nem do tamanho dos fragmentos.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) <= 1:
+        return [outcome for chunk in chunks for outcome in replay_files(chunk, output_dir)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(replay_files, chunks, [output_dir] * len(chunks))
+        return [outcome for chunk_outcomes in results for outcome in chunk_outcomes]
+
+
+def expand_paths(paths):
+    expanded = []
+    for path in paths:
+        if os.path.isdir(path):
+            expanded.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.endswith(DECISION_EXTENSIONS)
+            ))
+        else:
+            expanded.append(path)
+    return expanded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reprocessa registros de decisões e grava os rankings em CSV")
+    parser.add_argument("inputs", nargs="+", help="arquivos .jsonl/.journal ou diretórios com eles")
+    parser.add_argument("-o", "--output-dir", default="results", help="diretório dos CSVs (padrão: results)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="processos (padrão: núcleos)")
+    parser.add_argument("--chunk-size", type=int, default=100, help="arquivos por fragmento")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for path, error in replay_all(expand_paths(args.inputs), args.output_dir, args.workers, args.chunk_size):
+        if error is not None:
+            failed += 1
+            print(f"{path}: {error}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
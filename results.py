@@ -0,0 +1,26 @@
+import csv
+
+# Layout do CSV de resultado, lido de volta por aggregate.read_ranking_csv
+RANKING_HEADER = ["Posição", "Jogo", "Pontuação"]
+
+
+def ranking_filename(timestamp):
+    return f"ranking_{timestamp}.csv"
+
+
+def write_ranking_csv(file, ranked_items, resolved):
+    """Grava o ranking final no arquivo aberto (modo texto, newline='').
+
+    Usado tanto por Ranker.save_results quanto pelo reprocessamento em lote,
+    para que as duas saídas sejam idênticas byte a byte.
+    """
+    writer = csv.writer(file)
+    writer.writerow(RANKING_HEADER)
+    for index, (item, score) in enumerate(ranked_items, start=1):
+        # Posições não resolvidas (modo top-k) ficam sem número
+        writer.writerow([index if index <= resolved else "", item, score])
+
+
+def save_ranking_csv(path, ranked_items, resolved):
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        write_ranking_csv(file, ranked_items, resolved)
@@ -0,0 +1,288 @@
+import argparse
+import csv
+import os
+import re
+import sqlite3
+import sys
+from datetime import datetime
+
+from results import write_ranking_csv, save_ranking_csv
+
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+DEFAULT_DB = os.path.join(DEFAULT_RESULTS_DIR, "results.sqlite3")
+# Exportações ficam fora do arquivo de ranking_*.csv e com outro nome: nem o
+# aggregate nem import_csv_archive as contam de novo
+DEFAULT_EXPORT_DIR = os.path.join(DEFAULT_RESULTS_DIR, "exports")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    mode TEXT,
+    rating TEXT,
+    k INTEGER,
+    resolved INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    source TEXT UNIQUE
+);
+CREATE INDEX IF NOT EXISTS sessions_created_at ON sessions (created_at);
+
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS rankings (
+    session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    game_id INTEGER NOT NULL REFERENCES games (id),
+    score INTEGER NOT NULL,
+    PRIMARY KEY (session_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS rankings_game ON rankings (game_id, session_id);
+
+CREATE TABLE IF NOT EXISTS decisions (
+    session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    first_id INTEGER NOT NULL REFERENCES games (id),
+    second_id INTEGER NOT NULL REFERENCES games (id),
+    choice INTEGER NOT NULL,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID;
+"""
+
+_ARCHIVE_NAME = re.compile(r"ranking_(\d{8})_(\d{6})(?:_\d+)?\.csv$")
+
+
+def now():
+    return datetime.now().isoformat(timespec='microseconds')
+
+
+class ResultStore:
+    """Histórico de sessões num banco SQLite embutido.
+
+    Cada sessão guarda o ranking final e o histórico completo de decisões,
+    gravados numa única transação. Os nomes dos jogos ficam numa tabela
+    própria, e os índices por data e por (jogo, sessão) deixam consultas como
+    "posições de um jogo nas últimas N sessões" na casa dos milissegundos.
+    """
+
+    def __init__(self, path=DEFAULT_DB):
+        directory = os.path.dirname(path)
+        if directory and path != ":memory:":
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        # Em WAL, NORMAL só sincroniza no checkpoint e ainda não corrompe o banco
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self._game_ids = None
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Gravação
+
+    def _ids_of(self, names):
+        if self._game_ids is None:
+            self._game_ids = dict(self.conn.execute("SELECT name, id FROM games"))
+        ids = self._game_ids
+        missing = [name for name in dict.fromkeys(names) if name not in ids]
+        for name in missing:
+            ids[name] = self.conn.execute("INSERT INTO games (name) VALUES (?)", (name,)).lastrowid
+        return ids
+
+    def save_session(self, ranking, resolved, history=(), mode=None, rating=None, k=None,
+                     created_at=None, source=None):
+        """Grava ranking [(jogo, pontos), ...] e histórico [(jogo1, jogo2, escolha), ...].
+
+        Devolve o id da sessão. Tudo numa transação: ou a sessão entra
+        inteira, ou não entra.
+        """
+        try:
+            with self.conn:
+                names = [game for game, _ in ranking]
+                names += [game for a, b, _ in history for game in (a, b)]
+                ids = self._ids_of(names)
+                session_id = self.conn.execute(
+                    "INSERT INTO sessions (created_at, mode, rating, k, resolved, size, source) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (created_at or now(), mode, rating, k, resolved, len(ranking), source),
+                ).lastrowid
+                self.conn.executemany(
+                    "INSERT INTO rankings (session_id, position, game_id, score) VALUES (?, ?, ?, ?)",
+                    [(session_id, position, ids[game], score)
+                     for position, (game, score) in enumerate(ranking, start=1)],
+                )
+                self.conn.executemany(
+                    "INSERT INTO decisions (session_id, seq, first_id, second_id, choice) VALUES (?, ?, ?, ?, ?)",
+                    [(session_id, seq, ids[a], ids[b], choice) for seq, (a, b, choice) in enumerate(history)],
+                )
+        except sqlite3.Error:
+            # Ids de jogos criados na transação desfeita não valem mais
+            self._game_ids = None
+            raise
+        return session_id
+
+    def save_engine(self, engine, created_at=None):
+        return self.save_session(engine.ranking(), engine.resolved, engine.history,
+                                 engine.mode, engine.rating, engine.k, created_at)
+
+    # Consultas
+
+    def sessions(self, limit=50, offset=0):
+        """Sessões mais recentes primeiro: [(id, created_at, mode, size, resolved), ...]."""
+        return self.conn.execute(
+            "SELECT id, created_at, mode, size, resolved FROM sessions "
+            "ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+            (limit, offset),
+        ).fetchall()
+
+    def session_for_source(self, source):
+        # Sessão já gravada a partir deste arquivo (ranking_*.csv), ou None
+        row = self.conn.execute("SELECT id FROM sessions WHERE source = ?", (source,)).fetchone()
+        return row[0] if row else None
+
+    def ranking(self, session_id):
+        rows = self.conn.execute(
+            "SELECT g.name, r.score FROM rankings r JOIN games g ON g.id = r.game_id "
+            "WHERE r.session_id = ? ORDER BY r.position",
+            (session_id,),
+        ).fetchall()
+        (resolved,) = self.conn.execute("SELECT resolved FROM sessions WHERE id = ?", (session_id,)).fetchone() or (None,)
+        if resolved is None:
+            raise KeyError(session_id)
+        return rows, resolved
+
+    def decisions(self, session_id):
+        return self.conn.execute(
+            "SELECT a.name, b.name, d.choice FROM decisions d "
+            "JOIN games a ON a.id = d.first_id JOIN games b ON b.id = d.second_id "
+            "WHERE d.session_id = ? ORDER BY d.seq",
+            (session_id,),
+        ).fetchall()
+
+    def positions(self, game, last=10000):
+        """Posições do jogo nas últimas `last` sessões: [(created_at, posição, pontos, sessão), ...].
+
+        Posições da cauda não resolvida (modo top-k) voltam como None.
+        """
+        row = self.conn.execute(
+            "SELECT created_at FROM sessions ORDER BY created_at DESC LIMIT 1 OFFSET ?", (last - 1,)
+        ).fetchone()
+        since = row[0] if row else ""
+        return self.conn.execute(
+            "SELECT s.created_at, CASE WHEN r.position <= s.resolved THEN r.position END, r.score, s.id "
+            "FROM games g JOIN rankings r ON r.game_id = g.id JOIN sessions s ON s.id = r.session_id "
+            "WHERE g.name = ? AND s.created_at >= ? ORDER BY s.created_at DESC, s.id DESC",
+            (game, since),
+        ).fetchall()
+
+    # CSV
+
+    def export_csv(self, session_id, file):
+        # Mesmo layout e bytes de Ranker.save_results
+        rows, resolved = self.ranking(session_id)
+        write_ranking_csv(file, rows, resolved)
+
+    def import_csv_archive(self, results_dir=DEFAULT_RESULTS_DIR):
+        """Importa os ranking_*.csv antigos; arquivos já importados são ignorados.
+
+        A data vem do nome do arquivo (ranking_AAAAMMDD_HHMMSS.csv) ou, na
+        falta dela, do mtime. Devolve quantas sessões foram importadas.
+        """
+        entries = []
+        with os.scandir(results_dir) as it:
+            for entry in it:
+                if entry.name.startswith("ranking_") and entry.name.endswith(".csv"):
+                    match = _ARCHIVE_NAME.match(entry.name)
+                    if match:
+                        created_at = datetime.strptime("".join(match.groups()), "%Y%m%d%H%M%S").isoformat(timespec='microseconds')
+                    else:
+                        created_at = datetime.fromtimestamp(entry.stat().st_mtime).isoformat(timespec='microseconds')
+                    entries.append((created_at, entry.name))
+        entries.sort()
+        known = {row[0] for row in self.conn.execute("SELECT source FROM sessions WHERE source IS NOT NULL")}
+
+        imported = 0
+        for created_at, name in entries:
+            if name in known:
+                continue
+            ranking, resolved = read_ranking_rows(os.path.join(results_dir, name))
+            self.save_session(ranking, resolved, created_at=created_at, source=name)
+            imported += 1
+        return imported
+
+
+def read_ranking_rows(path):
+    # Linhas do CSV de Ranker.save_results: [(jogo, pontos), ...] e quantas têm posição
+    ranking = []
+    resolved = 0
+    with open(path, newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        next(reader, None)
+        for row in reader:
+            if len(row) < 3:
+                continue
+            try:
+                score = int(row[2])
+            except ValueError:
+                score = 0
+            ranking.append((row[1], score))
+            if row[0]:
+                resolved = len(ranking)
+    return ranking, resolved
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Histórico de sessões em SQLite")
+    parser.add_argument("--db", default=DEFAULT_DB)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import", help="importa os ranking_*.csv de um diretório")
+    importer.add_argument("results_dir", nargs="?", default=DEFAULT_RESULTS_DIR)
+
+    listing = commands.add_parser("list", help="lista as sessões mais recentes")
+    listing.add_argument("-n", "--limit", type=int, default=20)
+
+    positions = commands.add_parser("positions", help="posições de um jogo nas últimas sessões")
+    positions.add_argument("game")
+    positions.add_argument("--last", type=int, default=10000)
+
+    export = commands.add_parser("export", help="exporta uma sessão no CSV de save_results")
+    export.add_argument("session_id", type=int)
+    export.add_argument("-o", "--output", help="arquivo de saída (padrão: results/exports/sessao_<id>.csv)")
+    args = parser.parse_args(argv)
+
+    with ResultStore(args.db) as store:
+        if args.command == "import":
+            print(f"{store.import_csv_archive(args.results_dir)} sessões importadas")
+        elif args.command == "list":
+            for session_id, created_at, mode, size, resolved in store.sessions(args.limit):
+                print(f"{session_id}\t{created_at}\t{mode or '-'}\t{resolved}/{size}")
+        elif args.command == "positions":
+            for created_at, position, score, session_id in store.positions(args.game, args.last):
+                print(f"{created_at}\t{position if position is not None else '–'}\t{score}\t{session_id}")
+        elif args.command == "export":
+            try:
+                rows, resolved = store.ranking(args.session_id)
+            except KeyError:
+                print(f"Sessão {args.session_id} não encontrada", file=sys.stderr)
+                return 1
+            output = args.output or os.path.join(DEFAULT_EXPORT_DIR, f"sessao_{args.session_id}.csv")
+            os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+            save_ranking_csv(output, rows, resolved)
+            print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
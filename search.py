@@ -0,0 +1,92 @@
+import unicodedata
+from array import array
+from bisect import bisect_left
+
+
+def normalize(text):
+    # Sem acentos, minúsculas e com quebras de linha viradas espaço
+    text = text.replace('\n', ' ')
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TitleIndex:
+    """Índice de busca sobre os títulos do catálogo, montado uma única vez.
+
+    Os títulos são quebrados em palavras normalizadas; cada palavra distinta
+    aponta para os títulos que a contêm. Termos da busca com 3 ou mais
+    caracteres usam a menor lista de palavras entre os seus trigramas e
+    confirmam a substring na palavra; termos mais curtos buscam prefixos numa
+    lista ordenada de palavras com bisect. Termos separados por espaço
+    precisam aparecer todos. O resultado sai na ordem do catálogo.
+    """
+
+    def __init__(self, titles):
+        self.size = len(titles)
+
+        word_ids = {}
+        word_titles = []
+        for i, title in enumerate(titles):
+            for word in set(normalize(title).split()):
+                w = word_ids.get(word)
+                if w is None:
+                    w = word_ids[word] = len(word_titles)
+                    word_titles.append(array('I'))
+                word_titles[w].append(i)
+
+        # Palavras em ordem alfabética: prefixos viram um intervalo contíguo
+        words = sorted(word_ids)
+        self._words = words
+        self._word_titles = [word_titles[word_ids[w]] for w in words]
+
+        postings = {}
+        for w, word in enumerate(words):
+            for gram in trigrams(word):
+                ids = postings.get(gram)
+                if ids is None:
+                    ids = postings[gram] = array('I')
+                ids.append(w)
+        self._postings = postings
+
+    def _titles_of(self, words):
+        result = set()
+        for w in words:
+            result.update(self._word_titles[w])
+        return result
+
+    def _matching_words(self, term):
+        if len(term) < 3:
+            lo = bisect_left(self._words, term)
+            hi = bisect_left(self._words, term + '￿', lo)
+            return range(lo, hi)
+
+        smallest = None
+        for gram in trigrams(term):
+            ids = self._postings.get(gram)
+            if ids is None:
+                return ()
+            if smallest is None or len(ids) < len(smallest):
+                smallest = ids
+        words = self._words
+        return [w for w in smallest if term in words[w]]
+
+    def search(self, query):
+        terms = normalize(query).split()
+        if not terms:
+            return range(self.size)
+
+        # Termos longos primeiro: costumam ser os mais seletivos
+        terms.sort(key=len, reverse=True)
+        result = None
+        for term in terms:
+            titles = self._titles_of(self._matching_words(term))
+            result = titles if result is None else result & titles
+            if not result:
+                return []
+        return sorted(result)
@@ -0,0 +1,318 @@
+import argparse
+import asyncio
+import json
+import secrets
+import sys
+import time
+from collections import OrderedDict
+
+from engine import (
+    RankingEngine, selection_is_valid, MIN_GAMES, MAX_GAMES_BY_MODE,
+    MODE_ROUND_ROBIN, DEFAULT_TOP_K, RATING_WINS,
+)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+# Sessão sem requisições por esse tempo (segundos) é descartada
+IDLE_TIMEOUT = 900
+MAX_SESSIONS = 10000
+MAX_BODY = 64 * 1024
+
+_REASONS = {
+    200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large", 503: "Service Unavailable",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Session:
+    __slots__ = ('engine', 'lock', 'last_used')
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+    def state(self):
+        engine = self.engine
+        return {
+            'pair': None if engine.finished else list(engine.current_pair),
+            'version': engine.version,
+            'remaining': engine.remaining,
+            'finished': engine.finished,
+            'can_undo': engine.can_undo,
+        }
+
+
+class SessionStore:
+    """Sessões em memória, em ordem de uso (a menos recente primeiro).
+
+    Cada sessão tem o próprio motor e a própria trava, então requisições de
+    usuários diferentes nunca disputam estado. A memória é limitada pelo
+    número máximo de sessões e de jogos por sessão: ao atingir o limite, a
+    sessão usada há mais tempo é descartada, e sessões ociosas por mais de
+    idle_timeout segundos são removidas periodicamente.
+    """
+
+    def __init__(self, max_sessions=MAX_SESSIONS, idle_timeout=IDLE_TIMEOUT,
+                 min_games=MIN_GAMES, max_games=None):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.min_games = min_games
+        self.max_games = max_games
+        self._sessions = OrderedDict()
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def create(self, games, mode=MODE_ROUND_ROBIN, k=DEFAULT_TOP_K, rating=RATING_WINS):
+        # Valores vindos do JSON: listas e objetos não são hasheáveis
+        if not isinstance(mode, str) or mode not in MAX_GAMES_BY_MODE:
+            raise HTTPError(400, f"Modo desconhecido: {mode!r}")
+        if not isinstance(rating, str):
+            raise HTTPError(400, f"Pontuação desconhecida: {rating!r}")
+        if type(k) is not int:
+            raise HTTPError(400, "'k' deve ser um número inteiro")
+        if not isinstance(games, list) or not all(isinstance(g, str) for g in games):
+            raise HTTPError(400, "'games' deve ser uma lista de nomes")
+        # Mesma regra do GameSelector, com limites configuráveis no servidor
+        max_games = self.max_games or MAX_GAMES_BY_MODE[mode]
+        if not selection_is_valid(len(games), self.min_games, max_games):
+            raise HTTPError(400, f"Selecione entre {self.min_games} e {max_games} jogos")
+        try:
+            engine = RankingEngine(games, mode=mode, k=k, rating=rating)
+        except (ValueError, TypeError, ImportError) as e:
+            raise HTTPError(400, str(e)) from None
+
+        while len(self._sessions) >= self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evicted += 1
+        session_id = secrets.token_urlsafe(12)
+        self._sessions[session_id] = Session(engine)
+        return session_id, self._sessions[session_id]
+
+    def get(self, session_id):
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise HTTPError(404, "Sessão não encontrada")
+        session.last_used = time.monotonic()
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def delete(self, session_id):
+        if self._sessions.pop(session_id, None) is None:
+            raise HTTPError(404, "Sessão não encontrada")
+
+    def evict_idle(self, now=None):
+        deadline = (time.monotonic() if now is None else now) - self.idle_timeout
+        removed = 0
+        # Em ordem de uso: para na primeira sessão ainda ativa
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_used > deadline or session.lock.locked():
+                break
+            del self._sessions[session_id]
+            removed += 1
+        self.evicted += removed
+        return removed
+
+
+class RankingService:
+    """Serviço HTTP/JSON de votação com várias sessões simultâneas.
+
+    POST   /sessions                 {"games": [...], "mode", "k", "rating"}
+    GET    /sessions/<id>/pair
+    POST   /sessions/<id>/vote       {"choice": -1 | 1} ou {"game": nome}
+    POST   /sessions/<id>/tie
+    POST   /sessions/<id>/undo
+    GET    /sessions/<id>/results
+    DELETE /sessions/<id>
+
+    Votos e empates podem levar "version" (devolvida junto com o par): se o
+    par mudou desde então, a resposta é 409 e nada é contado.
+    """
+
+    def __init__(self, store=None):
+        self.store = store or SessionStore()
+
+    # Roteamento
+
+    async def handle(self, method, path, body):
+        parts = path.strip('/').split('/')
+        if parts[0] != 'sessions' or len(parts) > 3:
+            raise HTTPError(404, "Recurso não encontrado")
+        if len(parts) == 1:
+            if method != 'POST':
+                raise HTTPError(405, "Use POST")
+            return 201, self.create_session(body)
+
+        session_id = parts[1]
+        if len(parts) == 2:
+            if method != 'DELETE':
+                raise HTTPError(405, "Use DELETE")
+            self.store.delete(session_id)
+            return 204, None
+
+        action = parts[2]
+        expected = 'GET' if action in ('pair', 'results') else 'POST'
+        if action not in ('pair', 'results', 'vote', 'tie', 'undo'):
+            raise HTTPError(404, "Recurso não encontrado")
+        if method != expected:
+            raise HTTPError(405, f"Use {expected}")
+
+        session = self.store.get(session_id)
+        async with session.lock:
+            if action == 'pair':
+                return 200, session.state()
+            if action == 'results':
+                return 200, self.results(session)
+            if action == 'undo':
+                session.engine.undo()
+                return 200, session.state()
+            return 200, self.vote(session, action, body)
+
+    def create_session(self, body):
+        if 'games' not in body:
+            raise HTTPError(400, "Informe 'games'")
+        options = {key: body[key] for key in ('mode', 'k', 'rating') if key in body}
+        session_id, session = self.store.create(body['games'], **options)
+        return {'id': session_id, **session.state()}
+
+    def vote(self, session, action, body):
+        engine = session.engine
+        if engine.finished:
+            raise HTTPError(409, "Não há par em exibição")
+        version = body.get('version')
+        if version is not None and version != engine.version:
+            raise HTTPError(409, "O par mudou desde a última consulta")
+
+        if action == 'tie':
+            choice = 0
+        elif 'game' in body:
+            pair = engine.current_pair
+            if body['game'] not in pair:
+                raise HTTPError(400, f"{body['game']!r} não está no par atual")
+            choice = -1 if body['game'] == pair[0] else 1
+        else:
+            choice = body.get('choice')
+            if type(choice) is not int or choice not in (-1, 1):
+                raise HTTPError(400, "'choice' deve ser -1 ou 1")
+        # Mesma semântica de Ranker.handle_choice
+        engine.choose(choice)
+        return session.state()
+
+    def results(self, session):
+        engine = session.engine
+        resolved = engine.resolved
+        ranking = [
+            {'position': index if index <= resolved else None, 'game': item, 'score': score}
+            for index, (item, score) in enumerate(engine.ranking(), start=1)
+        ]
+        return {'finished': engine.finished, 'resolved': resolved, 'ranking': ranking}
+
+    # HTTP/1.1 mínimo, com keep-alive
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+                status, payload = await self.respond(method, target.split('?', 1)[0], headers, reader)
+                data = b'' if payload is None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                head = (
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                )
+                writer.write(head.encode('latin-1') + data)
+                await writer.drain()
+                if not keep_alive or status == 413:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, method, path, headers, reader):
+        try:
+            try:
+                length = int(headers.get('content-length', 0))
+            except ValueError:
+                raise HTTPError(400, "Content-Length inválido") from None
+            if length > MAX_BODY:
+                raise HTTPError(413, "Corpo da requisição muito grande")
+            body = {}
+            if length:
+                raw = await reader.readexactly(length)
+                try:
+                    body = json.loads(raw)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    raise HTTPError(400, "JSON inválido") from None
+                if not isinstance(body, dict):
+                    raise HTTPError(400, "O corpo deve ser um objeto JSON")
+            return await self.handle(method, path, body)
+        except HTTPError as e:
+            return e.status, {'error': str(e)}
+
+    async def evict_loop(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            self.store.evict_idle()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        server = await asyncio.start_server(self.serve_connection, host, port, backlog=4096)
+        interval = max(1.0, min(60.0, self.store.idle_timeout / 4))
+        self._evictor = asyncio.get_running_loop().create_task(self.evict_loop(interval))
+        return server
+
+
+async def serve(host, port, store):
+    service = RankingService(store)
+    server = await service.start(host, port)
+    print(f"Servidor em http://{host}:{server.sockets[0].getsockname()[1]}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço HTTP/JSON de votação com várias sessões")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-sessions", type=int, default=MAX_SESSIONS)
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT, help="segundos")
+    parser.add_argument("--min-games", type=int, default=MIN_GAMES)
+    parser.add_argument("--max-games", type=int, default=None, help="padrão: limite do modo")
+    args = parser.parse_args(argv)
+
+    store = SessionStore(args.max_sessions, args.idle_timeout, args.min_games, args.max_games)
+    try:
+        asyncio.run(serve(args.host, args.port, store))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
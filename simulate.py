@@ -0,0 +1,249 @@
+import argparse
+import json
+import math
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import (
+    RankingEngine, MODE_ROUND_ROBIN, MODE_SORT, MODE_TOP_K, DEFAULT_TOP_K,
+    RATING_WINS, RATING_BRADLEY_TERRY, RATING_ELO, RATINGS, MAX_GAMES_BY_MODE,
+    TRANSITIVE_PRUNE, TRANSITIVE_OPTIONS,
+)
+from ratings import np
+
+# Estratégias no formato modo[/pontuação][+inferência]; Bradley–Terry só entra com numpy
+STRATEGIES = [
+    MODE_ROUND_ROBIN,
+    f"{MODE_ROUND_ROBIN}+{TRANSITIVE_PRUNE}",
+    f"{MODE_ROUND_ROBIN}/{RATING_ELO}",
+    MODE_SORT,
+    MODE_TOP_K,
+]
+if np is not None:
+    STRATEGIES.insert(1, f"{MODE_ROUND_ROBIN}/{RATING_BRADLEY_TERRY}")
+
+DEFAULT_GAMES = 10
+DEFAULT_SESSIONS = 2000
+DEFAULT_NOISE = 1.0
+DEFAULT_TIE = 0.05
+DEFAULT_INTRANSITIVITY = 0.0
+# Sessões por tarefa enviada ao pool de processos
+CHUNK_SIZE = 250
+
+
+def parse_strategy(name):
+    name, _, transitive = name.partition("+")
+    mode, _, rating = name.partition("/")
+    return mode, rating or RATING_WINS, transitive or None
+
+
+class SyntheticVoter:
+    """Votante sintético com uma ordem verdadeira conhecida.
+
+    O item de posição verdadeira p vence o de posição q com probabilidade
+    logística em (q - p) / noise (noise 0 = sempre acerta). Com probabilidade
+    `tie` o voto é empate, e uma fração `intransitivity` dos pares tem a
+    preferência invertida de forma fixa na sessão, o que cria ciclos.
+    """
+
+    def __init__(self, n, rng, noise=DEFAULT_NOISE, tie=DEFAULT_TIE, intransitivity=DEFAULT_INTRANSITIVITY):
+        self.rng = rng
+        self.noise = noise
+        self.tie = tie
+        # true_order[p] = item na posição verdadeira p; position é a inversa
+        self.true_order = list(range(n))
+        rng.shuffle(self.true_order)
+        self.position = [0] * n
+        for p, item in enumerate(self.true_order):
+            self.position[item] = p
+        self.flipped = set()
+        if intransitivity > 0:
+            for a in range(n):
+                for b in range(a + 1, n):
+                    if rng.random() < intransitivity:
+                        self.flipped.add((a, b))
+
+    def __call__(self, a, b):
+        # Mesma convenção de RankingEngine.choose: -1 = a, 1 = b, 0 = empate
+        rng = self.rng
+        if rng.random() < self.tie:
+            return 0
+        diff = self.position[b] - self.position[a]
+        if (min(a, b), max(a, b)) in self.flipped:
+            diff = -diff
+        if self.noise <= 0:
+            return -1 if diff > 0 else 1
+        p = 1 / (1 + math.exp(-diff / self.noise))
+        return -1 if rng.random() < p else 1
+
+
+def kendall_tau(order, position):
+    """Tau de Kendall entre a ordem obtida e as posições verdadeiras (sem empates)."""
+    n = len(order)
+    if n < 2:
+        return 1.0
+    return 1 - 4 * _inversions([position[item] for item in order]) / (n * (n - 1))
+
+
+def _inversions(values):
+    # Contagem de inversões por merge sort, O(n log n)
+    if len(values) < 2:
+        return 0
+    mid = len(values) // 2
+    left, right = values[:mid], values[mid:]
+    count = _inversions(left) + _inversions(right)
+    i = j = 0
+    for k in range(len(values)):
+        if j == len(right) or (i < len(left) and left[i] <= right[j]):
+            values[k] = left[i]
+            i += 1
+        else:
+            values[k] = right[j]
+            j += 1
+            count += len(left) - i
+    return count
+
+
+def top_k_precision(order, true_order, k):
+    k = min(k, len(order))
+    return len(set(order[:k]) & set(true_order[:k])) / k
+
+
+def session_rng(seed, session, role):
+    # Semente por sessão (str é determinística entre processos): o resultado
+    # não depende do número de processos nem da divisão em tarefas
+    return random.Random(f"{seed}:{session}:{role}")
+
+
+def simulate_session(strategy, session, seed=0, n=DEFAULT_GAMES, k=DEFAULT_TOP_K, budget=1.0,
+                     noise=DEFAULT_NOISE, tie=DEFAULT_TIE, intransitivity=DEFAULT_INTRANSITIVITY):
+    """Uma sessão simulada: devolve (comparações, tau de Kendall, precisão no top-k).
+
+    O votante depende só de (seed, session), então todas as estratégias
+    respondem ao mesmo votante. `budget` interrompe a sessão após essa
+    fração do máximo de comparações do modo.
+    """
+    mode, rating, transitive = parse_strategy(strategy)
+    voter = SyntheticVoter(n, session_rng(seed, session, "voter"), noise, tie, intransitivity)
+    engine = RankingEngine(list(range(n)), rng=session_rng(seed, session, strategy), mode=mode, k=k, rating=rating,
+                           transitive=transitive)
+    limit = math.ceil(budget * engine.total_pairs)
+    # Conta só os pares perguntados; os deduzidos por transitividade não custam cliques
+    comparisons = 0
+    while not engine.finished and comparisons < limit:
+        engine.choose(voter(*engine.current_ids))
+        comparisons += 1
+    order = [item for item, _ in engine.ranking()]
+    return comparisons, kendall_tau(order, voter.position), top_k_precision(order, voter.true_order, k)
+
+
+def simulate_chunk(strategy, start, stop, options):
+    return [simulate_session(strategy, session, **options) for session in range(start, stop)]
+
+
+def summarize(strategy, budget, outcomes):
+    count = len(outcomes)
+    comparisons, taus, precisions = zip(*outcomes)
+    mean_tau = sum(taus) / count
+    return {
+        "strategy": strategy,
+        "budget": budget,
+        "sessions": count,
+        "comparisons": sum(comparisons) / count,
+        "kendall_tau": mean_tau,
+        "kendall_tau_sd": math.sqrt(sum((t - mean_tau) ** 2 for t in taus) / count),
+        "top_k_precision": sum(precisions) / count,
+    }
+
+
+def run(strategies=None, budgets=(1.0,), sessions=DEFAULT_SESSIONS, seed=0, workers=None,
+        chunk_size=CHUNK_SIZE, **options):
+    """Simula `sessions` sessões por estratégia e orçamento, num pool de processos.
+
+    Devolve uma linha de resumo por (estratégia, orçamento), na ordem pedida.
+    """
+    strategies = list(strategies or STRATEGIES)
+    # Valida antes de espalhar as tarefas pelos processos
+    for strategy in strategies:
+        mode, rating, transitive = parse_strategy(strategy)
+        if mode not in MAX_GAMES_BY_MODE:
+            raise ValueError(f"Modo desconhecido: {mode!r}")
+        if rating not in RATINGS:
+            raise ValueError(f"Pontuação desconhecida: {rating!r}")
+        if transitive not in TRANSITIVE_OPTIONS:
+            raise ValueError(f"Inferência transitiva desconhecida: {transitive!r}")
+    tasks = []
+    for strategy in strategies:
+        for budget in budgets:
+            for start in range(0, sessions, chunk_size):
+                tasks.append((strategy, budget, start, min(start + chunk_size, sessions)))
+
+    def arguments(task):
+        strategy, budget, start, stop = task
+        return strategy, start, stop, dict(options, seed=seed, budget=budget)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        chunks = [simulate_chunk(*arguments(task)) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(simulate_chunk, *zip(*map(arguments, tasks))))
+
+    outcomes = {}
+    for (strategy, budget, _, _), chunk in zip(tasks, chunks):
+        outcomes.setdefault((strategy, budget), []).extend(chunk)
+    return [summarize(strategy, budget, outcomes[strategy, budget])
+            for strategy in strategies for budget in budgets]
+
+
+def format_report(rows, k):
+    lines = [f"{'estratégia':<28} {'orçamento':>9} {'comparações':>12} {'tau':>7} {'± dp':>6} {f'top-{k}':>7}"]
+    for row in rows:
+        lines.append(
+            f"{row['strategy']:<28} {row['budget']:>9.0%} {row['comparisons']:>12.1f} "
+            f"{row['kendall_tau']:>7.3f} {row['kendall_tau_sd']:>6.3f} {row['top_k_precision']:>7.3f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simula votantes sintéticos e compara as estratégias de pares")
+    parser.add_argument("--strategies", nargs="+", default=STRATEGIES,
+                        help="modo[/pontuação][+prune], ex.: round_robin round_robin+prune round_robin/elo sort top_k")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES, help="jogos por sessão")
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS, help="sessões por estratégia")
+    parser.add_argument("-k", type=int, default=DEFAULT_TOP_K, help="k do modo top-k e da precisão")
+    parser.add_argument("--budgets", type=float, nargs="+", default=[1.0],
+                        help="frações do máximo de comparações (ex.: 0.25 0.5 1)")
+    parser.add_argument("--noise", type=float, default=DEFAULT_NOISE, help="ruído do votante (0 = sem erros)")
+    parser.add_argument("--tie", type=float, default=DEFAULT_TIE, help="probabilidade de empate")
+    parser.add_argument("--intransitivity", type=float, default=DEFAULT_INTRANSITIVITY,
+                        help="fração de pares com preferência invertida")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-j", "--workers", type=int, default=None, help="processos (padrão: núcleos)")
+    parser.add_argument("-o", "--output", help="grava o resumo em JSON neste arquivo")
+    args = parser.parse_args(argv)
+
+    try:
+        rows = run(args.strategies, args.budgets, args.sessions, args.seed, args.workers,
+                   n=args.games, k=args.k, noise=args.noise, tie=args.tie,
+                   intransitivity=args.intransitivity)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    print(format_report(rows, args.k))
+    if args.output:
+        report = {
+            "seed": args.seed, "games": args.games, "sessions": args.sessions, "k": args.k,
+            "noise": args.noise, "tie": args.tie, "intransitivity": args.intransitivity,
+            "results": rows,
+        }
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+import math
+import random
+
+
+def max_insertion_comparisons(n):
+    # Inserção binária do k-ésimo item numa cadeia de k grupos: ceil(log2(k+1))
+    return sum(math.ceil(math.log2(k + 1)) for k in range(1, n))
+
+
+class InsertionSorter:
+    """Ordenação por inserção binária conduzida pelas escolhas do usuário.
+
+    Os itens são inseridos um a um numa cadeia de grupos (do melhor para o
+    pior); cada comparação divide ao meio o intervalo onde o item pode entrar.
+    Um empate coloca o item no mesmo grupo do item comparado. Cada resposta
+    empilha o estado anterior, então back() desfaz um passo em O(n) no pior caso.
+    """
+
+    def __init__(self, n, rng=None):
+        rng = rng if rng is not None else random.Random()
+        self.n = n
+        self.total = max_insertion_comparisons(n)
+        self._order = list(range(n))
+        rng.shuffle(self._order)
+        self._chain = []
+        self._undo = []
+        self._answered = 0
+        self._k = 0
+        self._lo = self._hi = 0
+        self._start_next()
+
+    def __len__(self):
+        return self.total
+
+    @property
+    def position(self):
+        return self._answered
+
+    @property
+    def remaining(self):
+        # Limite superior: comparações restantes do item atual e dos próximos
+        if self.finished:
+            return 0
+        current = math.ceil(math.log2(self._hi - self._lo + 1))
+        later = sum(math.ceil(math.log2(k + 1)) for k in range(len(self._chain) + 1, self.n))
+        return current + later
+
+    @property
+    def finished(self):
+        return self._k >= self.n
+
+    # Coloca itens na cadeia enquanto não houver comparação a fazer
+    def _start_next(self):
+        while self._k < self.n and not self._chain:
+            self._chain.append([self._order[self._k]])
+            self._k += 1
+        self._lo, self._hi = 0, len(self._chain)
+
+    def _pivot(self):
+        return self._chain[(self._lo + self._hi) // 2][0]
+
+    def current(self):
+        if self.finished:
+            return None
+        x, pivot = self._order[self._k], self._pivot()
+        return (x, pivot) if x < pivot else (pivot, x)
+
+    def record(self, choice):
+        if self.finished:
+            raise IndexError("Não há mais pares")
+
+        x = self._order[self._k]
+        mid = (self._lo + self._hi) // 2
+        state = (self._k, self._lo, self._hi, None)
+
+        # Converte a escolha (-1 = esquerda, 1 = direita) para "x é melhor?"
+        if choice == 0:
+            self._chain[mid].append(x)
+            state = state[:3] + (('join', mid),)
+            self._finish_item()
+        else:
+            left_won = choice == -1
+            x_won = left_won == (x < self._chain[mid][0])
+            if x_won:
+                self._hi = mid
+            else:
+                self._lo = mid + 1
+            if self._lo == self._hi:
+                self._chain.insert(self._lo, [x])
+                state = state[:3] + (('new', self._lo),)
+                self._finish_item()
+
+        self._undo.append(state)
+        self._answered += 1
+
+    def _finish_item(self):
+        self._k += 1
+        self._lo, self._hi = 0, len(self._chain)
+
+    def back(self):
+        if not self._undo:
+            raise IndexError("Nenhum par anterior")
+        self._k, self._lo, self._hi, action = self._undo.pop()
+        if action is not None:
+            kind, pos = action
+            if kind == 'join':
+                self._chain[pos].pop()
+            else:
+                del self._chain[pos]
+        self._answered -= 1
+
+    def promote(self, item):
+        return False
+
+    # Pontuação = número de itens em grupos estritamente abaixo (como vitórias
+    # num round-robin transitivo); itens empatados dividem a mesma posição
+    def ranking(self, wins=None):
+        below = sum(len(group) for group in self._chain)
+        ranked = []
+        for group in self._chain:
+            below -= len(group)
+            for item in sorted(group):
+                ranked.append((item, below))
+        # Itens ainda não inseridos (sessão interrompida) ficam no fim
+        ranked.extend((item, 0) for item in sorted(self._order[self._k:]))
+        return ranked
@@ -0,0 +1,82 @@
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional: sem ele a tela final só não mostra os intervalos
+    np = None
+
+from engine import MODE_ROUND_ROBIN, RATING_WINS
+
+DEFAULT_SAMPLES = 2000
+DEFAULT_CONFIDENCE = 0.95
+# Elementos por bloco da matriz de sorteios (amostras × decisões): 16 MiB em int64
+MAX_BLOCK_CELLS = 1 << 21
+# Amostras × itens guardadas para os quantis; acima disso o número de
+# amostras é reduzido
+MAX_RANK_CELLS = 1 << 22
+
+
+def applies_to(engine):
+    # Nos modos de ordenação e top-k, e com Bradley–Terry ou Elo, o ranking
+    # não é a contagem de vitórias: reamostrar vitórias daria intervalos que
+    # nem contêm a posição exibida
+    return engine.mode == MODE_ROUND_ROBIN and engine.rating == RATING_WINS
+
+
+def bootstrap_ranking(first, second, choice, order, samples=DEFAULT_SAMPLES,
+                      confidence=DEFAULT_CONFIDENCE, seed=None):
+    """Estabilidade do ranking por vitórias, por bootstrap das decisões da sessão.
+
+    Vale para o ranking por número de vitórias (modo de todos os pares com
+    a pontuação de vitórias): sorteia com reposição `samples` históricos do
+    mesmo tamanho e recalcula as vitórias de cada item. Os sorteios são
+    processados em blocos de até MAX_BLOCK_CELLS elementos, e cada bloco vira
+    uma contagem por (amostra, item) num único bincount. Posições seguem o
+    critério de empate da competição (1 + itens com mais vitórias).
+
+    `order` é a ordem final (ids). Devolve (intervalos, acima): intervalos[p]
+    é a faixa de posições (lo, hi) do item order[p] no nível `confidence`, e
+    acima[p] a probabilidade de order[p] ficar à frente de order[p + 1]
+    (empates contam meio).
+    """
+    if np is None:
+        raise ImportError("Os intervalos de confiança requerem o pacote numpy")
+    n = len(order)
+    first = np.asarray(first, dtype=np.int64)
+    second = np.asarray(second, dtype=np.int64)
+    choice = np.asarray(choice, dtype=np.int8)
+    m = len(choice)
+    order = np.asarray(order, dtype=np.int64)
+    if m == 0:
+        return [(1, n)] * n, [0.5] * (n - 1)
+
+    # Vencedor de cada decisão; empates vão para um item fictício (n)
+    winner = np.where(choice == -1, first, np.where(choice == 1, second, n))
+    rng = np.random.default_rng(seed)
+    samples = max(1, min(samples, MAX_RANK_CELLS // max(n, 1)))
+    block = max(1, MAX_BLOCK_CELLS // max(m, n + 1))
+    ranks = np.empty((samples, n), dtype=np.int32)
+    ahead = np.zeros(max(n - 1, 0))
+
+    for start in range(0, samples, block):
+        rows = min(block, samples - start)
+        picks = winner[rng.integers(0, m, size=(rows, m))]
+        picks += (np.arange(rows, dtype=np.int64) * (n + 1))[:, None]
+        wins = np.bincount(picks.ravel(), minlength=rows * (n + 1)).reshape(rows, n + 1)[:, :n]
+        del picks
+
+        # Posição = 1 + itens com mais vitórias na mesma amostra. As contagens
+        # são inteiros pequenos: um histograma por amostra e a soma acumulada
+        # dele dão, para cada número de vitórias, quantos itens ficaram acima
+        width = int(wins.max()) + 1
+        offsets = np.arange(rows, dtype=np.int64)[:, None] * width
+        histogram = np.bincount((wins + offsets).ravel(), minlength=rows * width).reshape(rows, width)
+        greater = n - np.cumsum(histogram, axis=1)
+        ranks[start:start + rows] = 1 + np.take_along_axis(greater, wins, axis=1)
+
+        ordered = wins[:, order]
+        ahead += (ordered[:, :-1] > ordered[:, 1:]).sum(axis=0) + 0.5 * (ordered[:, :-1] == ordered[:, 1:]).sum(axis=0)
+
+    tail = (1 - confidence) / 2
+    lo = np.quantile(ranks, tail, axis=0, method='lower')
+    hi = np.quantile(ranks, 1 - tail, axis=0, method='higher')
+    intervals = [(int(lo[i]), int(hi[i])) for i in order]
+    return intervals, [float(p) for p in ahead / samples]
@@ -0,0 +1,78 @@
+import csv
+import io
+import os
+import tempfile
+import unittest
+
+from aggregate import aggregate, read_ranking_csv, write_consensus_csv, main
+
+
+def salvar_ranking(pasta, nome, linhas, mtime):
+    caminho = os.path.join(pasta, nome)
+    with open(caminho, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(["Posição", "Jogo", "Pontuação"])
+        writer.writerows(linhas)
+    os.utime(caminho, (mtime, mtime))
+    return caminho
+
+
+class TestAgregacaoDeResultados(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.pasta = self.tmp.name
+        salvar_ranking(self.pasta, "ranking_1.csv",
+                       [[1, "Doom", 2], [2, "Portal", 1], [3, "Hades", 0]], 1000)
+        salvar_ranking(self.pasta, "ranking_2.csv",
+                       [[1, "Portal", 2], [2, "Doom", 1], [3, "Hades", 0]], 1001)
+        salvar_ranking(self.pasta, "ranking_3.csv",
+                       [[1, "Doom", 1], [2, "Hades", 1], [3, "Portal", 1]], 1002)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_AG01_leitura_com_empates_e_cauda(self):
+        """Pontuações iguais dividem a colocação e a cauda sem posição empata"""
+        caminho = salvar_ranking(self.pasta, "ranking_x.csv",
+                                 [[1, "A", 5], [2, "B", 3], [3, "C", 3], ["", "D", 1], ["", "E", 0]], 1)
+        self.assertEqual(read_ranking_csv(caminho), [(1, "A"), (2, "B"), (2, "C"), (4, "D"), (4, "E")])
+
+    def test_AG02_consenso(self):
+        """Borda, Copeland e posição média devem refletir as sessões"""
+        tally = aggregate(self.pasta, workers=1)
+        self.assertEqual(tally.files, 3)
+        consenso = {linha[0]: linha[1:] for linha in tally.consensus()}
+        # Doom: 2 + 1 + 2 = 5 pontos Borda; a sessão 3 é um empate triplo.
+        # Empata no saldo com Portal e vence Hades: Copeland = 1
+        self.assertEqual(consenso["Doom"][0], 2 + 1 + 2)
+        self.assertEqual(consenso["Doom"][2], 1)
+        self.assertEqual(tally.consensus()[0][0], "Doom")
+        self.assertEqual(consenso["Hades"][3], 3)
+        self.assertAlmostEqual(consenso["Hades"][1], 7 / 3)
+
+    def test_AG03_incremental(self):
+        """Uma segunda execução só lê os arquivos novos"""
+        aggregate(self.pasta, workers=1)
+        salvar_ranking(self.pasta, "ranking_4.csv", [[1, "Hades", 1], [2, "Doom", 0]], 2000)
+        tally = aggregate(self.pasta, workers=1)
+        self.assertEqual(tally.files, 4)
+        self.assertEqual(tally.sessions["Hades"], 4)
+        self.assertEqual(aggregate(self.pasta, workers=1).files, 4)
+
+    def test_AG04_pool_de_processos(self):
+        """O resultado com vários processos deve ser igual ao sequencial"""
+        for i in range(20):
+            salvar_ranking(self.pasta, f"ranking_p{i}.csv",
+                           [[1, "Celeste", 1], [2, f"Jogo {i % 3}", 0]], 3000 + i)
+        saida = os.path.join(self.pasta, "consenso.csv")
+        main([self.pasta, "-j", "2", "--chunk-size", "4", "-o", saida,
+              "--checkpoint", os.path.join(self.pasta, "ckpt")])
+        sequencial = io.StringIO()
+        write_consensus_csv(aggregate(self.pasta, os.path.join(self.pasta, "ckpt2"), workers=1), sequencial)
+        with open(saida, newline='', encoding='utf-8') as file:
+            self.assertEqual(file.read(), sequencial.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from bench import compare
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_BE01_comparacao_com_linha_de_base(self):
+        """Só casos mais lentos que a tolerância contam como regressão"""
+        base = {"results": {"a/n=10": {"ops_per_second": 100.0}, "b/n=10": {"ops_per_second": 100.0}}}
+        atual = {"results": {"a/n=10": {"ops_per_second": 80.0}, "b/n=10": {"ops_per_second": 60.0},
+                             "c/n=10": {"ops_per_second": 1.0}}}
+        self.assertEqual([caso for caso, *_ in compare(atual, base, 0.25)], ["b/n=10"])
+
+    def test_BE02_execucao_sem_display(self):
+        """A suíte roda com o Tk simulado e grava o relatório em JSON"""
+        pasta = os.path.dirname(os.path.abspath(__file__))
+        with tempfile.TemporaryDirectory() as tmp:
+            saida = os.path.join(tmp, "bench.json")
+            base = os.path.join(tmp, "base.json")
+            comando = [sys.executable, "bench.py", "--sizes", "10", "--repeat", "1", "-o", saida, "--baseline", base]
+            processo = subprocess.run(comando, cwd=pasta, capture_output=True, text=True, env={**os.environ, "DISPLAY": ""})
+            self.assertEqual(processo.returncode, 0, processo.stderr)
+            with open(saida, encoding='utf-8') as file:
+                relatorio = json.load(file)
+            self.assertEqual(len(relatorio["results"]), 7)
+            self.assertGreater(relatorio["results"]["handle_choice/n=10"]["ops_per_second"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from catalog import load_catalog, default_label, cache_path, DEFAULT_CATALOG
+
+
+class TestCatalogo(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def escrever(self, nome, conteudo):
+        caminho = os.path.join(self.tmp.name, nome)
+        with open(caminho, 'w', encoding='utf-8') as file:
+            file.write(conteudo)
+        return caminho
+
+    def test_CA01_csv_com_metadados(self):
+        """O CSV traz título, rótulo opcional, ano e plataforma"""
+        caminho = self.escrever("jogos.csv",
+                                "title,label,year,platform\n"
+                                "Doom,,1993,PC\n"
+                                "Chrono Trigger,Chrono\\nTrigger,1995,SNES\n"
+                                "  Super   Metroid ,,,SNES\n"
+                                "Doom,,1993,PC\n")
+        catalogo = load_catalog(caminho, use_cache=False)
+        self.assertEqual(catalogo.titles, ["Doom", "Chrono Trigger", "Super Metroid"])
+        self.assertEqual(catalogo.label("Chrono Trigger"), "Chrono\nTrigger")
+        self.assertEqual(catalogo.year(0), 1993)
+        self.assertIsNone(catalogo.year(2))
+        self.assertEqual(catalogo.platform(2), "SNES")
+
+    def test_CA02_jsonl(self):
+        """JSON Lines é aceito e uma linha inválida aponta o número da linha"""
+        caminho = self.escrever("jogos.jsonl",
+                                '{"title": "Doom", "year": 1993}\n\n'
+                                '{"title": "Quake"}\n')
+        catalogo = load_catalog(caminho, use_cache=False)
+        self.assertEqual(catalogo.titles, ["Doom", "Quake"])
+        self.assertIsNone(catalogo.platform(1))
+        ruim = self.escrever("ruim.jsonl", '{"title": "Doom"}\n{title\n')
+        with self.assertRaisesRegex(ValueError, ":2:"):
+            load_catalog(ruim, use_cache=False)
+
+    def test_CA07_jsonl_com_linha_que_nao_e_objeto(self):
+        """Linha que não é objeto ou título que não é texto aponta o número da linha"""
+        for conteudo in ('["B"]\n', '5\n', '{"title": 5}\n', '{"title": "Doom", "label": ["x"]}\n'):
+            with self.subTest(conteudo=conteudo):
+                ruim = self.escrever("ruim.jsonl", '{"title": "Quake"}\n' + conteudo)
+                with self.assertRaisesRegex(ValueError, ":2:"):
+                    load_catalog(ruim, use_cache=False)
+
+    def test_CA03_rotulo_padrao(self):
+        """O rótulo quebra no subtítulo ou por largura sem alterar a chave"""
+        self.assertEqual(default_label("Metal Gear Solid 3: Snake Eater"), "Metal Gear Solid 3:\nSnake Eater")
+        self.assertEqual(default_label("Doom"), "Doom")
+        self.assertIn("\n", default_label("Castlevania Symphony of the Night"))
+
+    def test_CA04_cache_e_invalidacao(self):
+        """O cache é reaproveitado e descartado quando a origem muda"""
+        caminho = self.escrever("jogos.csv", "title,year,platform\nDoom,1993,PC\nQuake,1996,PC\n")
+        primeiro = load_catalog(caminho)
+        self.assertTrue(os.path.exists(cache_path(caminho)))
+        segundo = load_catalog(caminho)
+        self.assertEqual(segundo.titles, primeiro.titles)
+        self.assertEqual(segundo.platform(1), "PC")
+        self.assertEqual(segundo.label("Quake"), "Quake")
+
+        stat = os.stat(caminho)
+        with open(caminho, 'a', encoding='utf-8') as file:
+            file.write("Heretic,1994,PC\n")
+        os.utime(caminho, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(load_catalog(caminho).titles, ["Doom", "Quake", "Heretic"])
+
+    def test_CA06_ano_malformado_e_cache_internado(self):
+        """Ano malformado vira desconhecido sem abortar a carga, e o cache devolve títulos internados"""
+        caminho = self.escrever("jogos.csv",
+                                "title,year,platform\n"
+                                "Doom,1993,PC\nQuake,noventa e seis,PC\nHeretic,99999,PC\nHexen,1995.5,PC\n")
+        load_catalog(caminho)
+        catalogo = load_catalog(caminho)
+        self.assertEqual(catalogo.titles, ["Doom", "Quake", "Heretic", "Hexen"])
+        self.assertEqual([catalogo.year(i) for i in range(4)], [1993, None, None, None])
+        for titulo in catalogo.titles:
+            self.assertIs(titulo, sys.intern("".join(titulo)))
+        ruim = self.escrever("jogos.jsonl", '{"title": "Doom", "year": [1993]}\n{"title": "Quake", "year": 1996}\n')
+        self.assertEqual([load_catalog(ruim, use_cache=False).year(i) for i in range(2)], [None, 1996])
+
+    def test_CA05_catalogo_padrao(self):
+        """O games.csv do repositório reproduz os rótulos da lista original"""
+        catalogo = load_catalog(DEFAULT_CATALOG, use_cache=False)
+        self.assertEqual(len(catalogo), 50)
+        self.assertEqual(catalogo.label("The Legend of Zelda: Ocarina of Time"),
+                         "The Legend of Zelda:\nOcarina of Time")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import random
+import tempfile
+import unittest
+
+from closure import DominanceClosure
+from engine import RankingEngine, TRANSITIVE_CHECK, TRANSITIVE_PRUNE
+from journal import SessionJournal, resume
+
+
+def fecho_ingenuo(n, vitorias):
+    alcance = [[False] * n for _ in range(n)]
+    for a, b in vitorias:
+        alcance[a][b] = True
+    for k in range(n):
+        for i in range(n):
+            if alcance[i][k]:
+                for j in range(n):
+                    alcance[i][j] = alcance[i][j] or alcance[k][j]
+    return alcance
+
+
+def votar_pela_ordem(motor, ordem):
+    # Votante consistente: vence quem vem antes em `ordem`
+    posicao = {item: p for p, item in enumerate(ordem)}
+    a, b = motor.current_pair
+    escolha = -1 if posicao[a] < posicao[b] else 1
+    motor.choose(escolha)
+    return escolha
+
+
+class TestFechoTransitivo(unittest.TestCase):
+
+    def test_TR01_fecho_e_desfazer(self):
+        """O fecho em bitsets bate com o cálculo direto e undo volta cada passo"""
+        rng = random.Random(0)
+        n = 70
+        ordem = list(range(n))
+        rng.shuffle(ordem)
+        posicao = {item: p for p, item in enumerate(ordem)}
+        fecho = DominanceClosure(n)
+        vitorias, estados = [], []
+        for _ in range(150):
+            a, b = rng.sample(range(n), 2)
+            if posicao[a] > posicao[b]:
+                a, b = b, a
+            estados.append(list(fecho.below))
+            self.assertIsNone(fecho.add(a, b))
+            vitorias.append((a, b))
+        alcance = fecho_ingenuo(n, vitorias)
+        for i in range(n):
+            for j in range(n):
+                self.assertEqual(bool(fecho.below[i] >> j & 1), alcance[i][j])
+                self.assertEqual(bool(fecho.above[j] >> i & 1), alcance[i][j])
+        for estado in reversed(estados):
+            fecho.undo()
+            self.assertEqual(fecho.below, estado)
+        self.assertEqual(fecho.above, [0] * n)
+
+    def test_TR02_ciclo(self):
+        """Uma vitória que contradiz o fecho não entra e devolve o ciclo"""
+        fecho = DominanceClosure(4)
+        fecho.add(0, 1)
+        fecho.add(1, 2)
+        fecho.add(2, 3)
+        self.assertEqual(fecho.implied(0, 3), -1)
+        self.assertEqual(fecho.implied(3, 0), 1)
+        antes = list(fecho.below)
+        self.assertEqual(fecho.add(3, 0), [3, 0, 1, 2, 3])
+        self.assertEqual(fecho.below, antes)
+        fecho.undo()
+        self.assertEqual(fecho.below, antes)
+
+    def test_TR03_pula_pares_deduzidos(self):
+        """Com poda, um votante consistente responde menos pares e chega ao mesmo ranking"""
+        jogos = [f'Jogo {i}' for i in range(10)]
+        ordem = jogos[:]
+        random.Random(4).shuffle(ordem)
+        completo = RankingEngine(jogos, rng=random.Random(1))
+        while not completo.finished:
+            votar_pela_ordem(completo, ordem)
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        caminho = os.path.join(tmp.name, "atual.journal")
+        options = {'transitive': TRANSITIVE_PRUNE}
+        motor = RankingEngine(jogos, rng=random.Random(1), **options)
+        diario = SessionJournal.create(caminho, jogos, options, 1)
+        perguntados = []
+        while not motor.finished:
+            a, b = motor.current_ids
+            perguntados.append(motor.current_pair)
+            diario.record_choice(a, b, votar_pela_ordem(motor, ordem))
+        self.assertLess(len(perguntados), 45 * 2 // 3)
+        self.assertEqual(len(motor.history), 45)
+        self.assertEqual(motor.ranking(), completo.ranking())
+        self.assertEqual([item for item, _ in motor.ranking()], ordem)
+
+        # Voltar desfaz a última resposta e os pares deduzidos dela
+        self.assertTrue(motor.undo())
+        diario.record_back()
+        self.assertEqual(motor.current_pair, perguntados[-1])
+        self.assertLess(len(motor.history), 45)
+        diario.close()
+        retomado, diario = resume(caminho)
+        self.assertEqual(retomado.history, motor.history)
+        votar_pela_ordem(retomado, ordem)
+        self.assertTrue(retomado.finished)
+        diario.close()
+
+    def test_TR04_ciclo_apontado(self):
+        """Sem poda, a resposta que fecha um ciclo é apontada e some ao voltar"""
+        motor = RankingEngine(['A', 'B', 'C'], rng=random.Random(2), transitive=TRANSITIVE_CHECK)
+        vence = {('A', 'B'): 'A', ('B', 'C'): 'B', ('A', 'C'): 'C'}
+        while not motor.finished:
+            a, b = motor.current_pair
+            vencedor = vence.get((a, b)) or vence[(b, a)]
+            motor.choose(-1 if vencedor == a else 1)
+        self.assertEqual(len(motor.last_cycle), 4)
+        self.assertEqual(motor.last_cycle[0], motor.last_cycle[-1])
+        self.assertEqual(set(motor.last_cycle), {'A', 'B', 'C'})
+        motor.undo()
+        self.assertIsNone(motor.last_cycle)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import random
+import unittest
+
+from engine import RankingEngine, selection_is_valid
+
+
+class TestMotorDeRankeamento(unittest.TestCase):
+
+    def setUp(self):
+        self.items = ['Jogo A', 'Jogo B', 'Jogo C', 'Jogo D']
+        self.motor = RankingEngine(self.items, rng=random.Random(42))
+
+    def test_ME01_gera_todos_os_pares(self):
+        """A quantidade de pares deve ser C(n,2), sem repetição"""
+        vistos = set()
+        while not self.motor.fim():
+            par = self.motor.obter_par_atual()
+            vistos.add(frozenset(par))
+            self.motor.empatar()
+        self.assertEqual(len(vistos), 6)
+        self.assertEqual(self.motor.total_pairs, 6)
+
+    def test_ME02_escolha_e_desfazer(self):
+        """Escolher e desfazer deve restaurar pontuação, histórico e par"""
+        par = self.motor.obter_par_atual()
+        self.motor.choose(1)
+        self.assertEqual(self.motor.obter_resultado()[par[1]], 1)
+        self.assertEqual(self.motor.history, [(par[0], par[1], 1)])
+        self.assertTrue(self.motor.undo())
+        self.assertEqual(self.motor.obter_par_atual(), par)
+        self.assertEqual(sum(self.motor.obter_resultado().values()), 0)
+        self.assertFalse(self.motor.undo())
+
+    def test_ME03_votar_em_jogo_fora_do_par(self):
+        """Votar em um jogo fora do par atual antecipa um par que o contenha"""
+        a, b = self.motor.obter_par_atual()
+        fora = next(j for j in self.items if j not in (a, b))
+        self.motor.votar(fora)
+        self.assertEqual(self.motor.obter_resultado()[fora], 1)
+        self.assertIn(fora, self.motor.history[-1][:2])
+
+    def test_ME04_ranking_ordenado(self):
+        """O ranking final deve estar em ordem decrescente de pontuação"""
+        while not self.motor.fim():
+            par = self.motor.obter_par_atual()
+            self.motor.votar(min(par))
+        ranking = self.motor.exibir_ranking()
+        self.assertEqual([j for j, _ in ranking], self.items)
+        self.assertEqual([p for _, p in ranking], [3, 2, 1, 0])
+
+    def test_ME05_entradas_invalidas(self):
+        """Escolhas inválidas e seleções vazias devem ser rejeitadas"""
+        with self.assertRaises(ValueError):
+            self.motor.choose(2)
+        with self.assertRaises(ValueError):
+            self.motor.votar('Jogo Z')
+        with self.assertRaises(ValueError):
+            self.motor.selecionar_jogos([])
+        with self.assertRaises(ValueError):
+            RankingEngine(['Jogo A', 'Jogo A'])
+
+    def test_ME06_limites_de_selecao(self):
+        """A seleção só é válida entre 2 e 10 jogos"""
+        self.assertFalse(selection_is_valid(1))
+        self.assertTrue(selection_is_valid(2))
+        self.assertTrue(selection_is_valid(10))
+        self.assertFalse(selection_is_valid(11))
+
+    def test_ME07_escolha_que_nao_e_int(self):
+        """1.0, True ou '1' são recusados antes de alterar pontos ou histórico"""
+        self.motor.choose(-1)
+        antes = (self.motor.obter_resultado(), self.motor.history, self.motor.current_pair)
+        for escolha in (1.0, True, -1.0, '1', None):
+            with self.subTest(escolha=escolha):
+                with self.assertRaises(ValueError):
+                    self.motor.choose(escolha)
+                with self.assertRaises(ValueError):
+                    self.motor.record('Jogo A', 'Jogo B', escolha)
+                self.assertEqual((self.motor.obter_resultado(), self.motor.history, self.motor.current_pair), antes)
+        self.assertTrue(self.motor.undo())
+        self.assertEqual(self.motor.history, [])
+
+if __name__ == '__main__':
+    unittest.main()
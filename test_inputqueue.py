@@ -0,0 +1,74 @@
+import random
+import unittest
+
+from engine import RankingEngine, MODE_SORT
+from inputqueue import InputQueue, CHOICE_LEFT, CHOICE_TIE, CHOICE_RIGHT, BACK
+
+
+def aplicar(motor):
+    def apply(action):
+        if action == BACK:
+            motor.undo()
+        else:
+            motor.choose(action)
+    return apply
+
+
+class TestFilaDeEntradas(unittest.TestCase):
+
+    def setUp(self):
+        self.jogos = [f'Jogo {i}' for i in range(6)]
+        self.motor = RankingEngine(self.jogos, rng=random.Random(5))
+        self.fila = InputQueue(self.motor, aplicar(self.motor))
+
+    def test_FE01_clique_duplo_conta_uma_vez(self):
+        """Dois cliques sobre o mesmo par geram um único voto"""
+        exibido = self.motor.version
+        par = self.motor.current_pair
+        self.fila.push(exibido, CHOICE_LEFT)
+        self.fila.push(exibido, CHOICE_LEFT)
+        self.assertEqual(self.fila.drain(), 1)
+        self.assertEqual(self.fila.dropped, 1)
+        self.assertEqual(self.motor.history, [(par[0], par[1], CHOICE_LEFT)])
+
+    def test_FE02_ordem_e_voltar(self):
+        """Ações marcadas com o par certo são aplicadas em ordem, inclusive voltar"""
+        self.fila.push(self.motor.version, CHOICE_RIGHT)
+        self.fila.drain()
+        self.fila.push(self.motor.version, BACK)
+        self.fila.drain()
+        self.assertEqual(self.motor.history, [])
+        self.fila.push(self.motor.version, CHOICE_TIE)
+        self.assertEqual(self.fila.drain(), 1)
+        self.assertEqual(len(self.motor.history), 1)
+
+    def test_FE03_nada_apos_o_fim(self):
+        """Entradas que chegam depois da última comparação são descartadas"""
+        while not self.motor.finished:
+            self.fila.push(self.motor.version, CHOICE_LEFT)
+            self.fila.drain()
+        self.fila.push(self.motor.version, CHOICE_RIGHT)
+        self.assertEqual(self.fila.drain(), 0)
+        self.assertEqual(len(self.motor.history), self.motor.total_pairs)
+
+    def test_FE04_rajada_sem_votos_perdidos_ou_trocados(self):
+        """Numa rajada, cada voto aceito vale para o par que estava na tela"""
+        jogos = [f'Jogo {i}' for i in range(60)]
+        motor = RankingEngine(jogos, rng=random.Random(2), mode=MODE_SORT)
+        fila = InputQueue(motor, aplicar(motor))
+        rng = random.Random(9)
+        esperado = []
+        while not motor.finished:
+            # A tela só é atualizada entre um processamento e outro
+            exibido, par = motor.version, motor.current_pair
+            rajada = [rng.choice((CHOICE_LEFT, CHOICE_TIE, CHOICE_RIGHT)) for _ in range(rng.randint(1, 3))]
+            for escolha in rajada:
+                fila.push(exibido, escolha)
+            fila.drain()
+            esperado.append((par[0], par[1], rajada[0]))
+        self.assertEqual(motor.history, esperado)
+        self.assertEqual(fila.applied, len(esperado))
+
+
+if __name__ == '__main__':
+    unittest.main()
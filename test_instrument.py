@@ -0,0 +1,66 @@
+import json
+import os
+import random
+import tempfile
+import time
+import unittest
+
+from instrument import Histogram, Recorder
+
+
+class TestInstrumentacao(unittest.TestCase):
+
+    def test_IN01_percentis_do_histograma(self):
+        """Os percentis em fluxo ficam a poucos por cento dos exatos"""
+        rng = random.Random(0)
+        valores = [rng.lognormvariate(-7, 1) for _ in range(20000)]
+        histograma = Histogram()
+        for v in valores:
+            histograma.add(v)
+        valores.sort()
+        for q in (0.5, 0.95, 0.99):
+            exato = valores[int(q * len(valores)) - 1]
+            self.assertAlmostEqual(histograma.percentile(q) / exato, 1, delta=0.05)
+        self.assertEqual(histograma.summary()['count'], 20000)
+
+    def test_IN02_desligado_nao_registra(self):
+        """Desligado, o registrador não acumula nada e devolve o span vazio"""
+        registro = Recorder()
+        with registro.span("a"):
+            registro.count("x")
+            registro.observe("y", 0.1)
+        self.assertIs(registro.span("a"), registro.span("b"))
+        self.assertEqual(registro.report(), {'histograms': {}, 'counters': {}})
+
+    def test_IN03_pilhas_com_tempo_proprio(self):
+        """Spans aninhados geram pilhas dobradas com o tempo próprio de cada nível"""
+        registro = Recorder()
+        registro.enable()
+        with registro.span("clique"):
+            with registro.span("escolha"):
+                time.sleep(0.01)
+        self.assertEqual(set(registro.folded), {"clique", "clique;escolha"})
+        self.assertLess(registro.folded["clique"], registro.folded["clique;escolha"])
+        self.assertEqual(registro.histograms["clique"].count, 1)
+
+    def test_IN04_gravacao_da_sessao(self):
+        """flush grava métricas em JSON, pilhas dobradas e o perfil do cProfile"""
+        with tempfile.TemporaryDirectory() as tmp:
+            registro = Recorder()
+            registro.enable(tmp, profile=True)
+            with registro.span("handle_choice"):
+                sum(range(1000))
+            registro.count("inputs", 3)
+            base = registro.flush("teste")
+            registro.disable()
+            with open(base + ".json", encoding='utf-8') as file:
+                relatorio = json.load(file)
+            self.assertEqual(relatorio['counters'], {'inputs': 3})
+            self.assertIn('p99_ms', relatorio['histograms']['handle_choice'])
+            self.assertTrue(os.path.getsize(base + ".prof") > 0)
+            with open(base + ".folded", encoding='utf-8') as file:
+                self.assertTrue(file.read().startswith("handle_choice "))
+
+
+if __name__ == '__main__':
+    unittest.main()
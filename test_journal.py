@@ -0,0 +1,153 @@
+import os
+import random
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from engine import RankingEngine, MODE_SORT
+import journal
+from journal import SessionJournal, JournalError, resume, snapshot_path, has_open_session, discard
+
+
+def sessao(caminho, jogos, eventos, seed=11, options=None, **kwargs):
+    options = options or {}
+    motor = RankingEngine(jogos, rng=random.Random(seed), **options)
+    diario = SessionJournal.create(caminho, jogos, options, seed, **kwargs)
+    rng = random.Random(seed + 1)
+    for _ in range(eventos):
+        if motor.can_undo and rng.random() < 0.2:
+            motor.undo()
+            diario.record_back()
+        elif not motor.finished:
+            a, b = motor.current_ids
+            escolha = rng.choice((-1, 0, 1))
+            motor.choose(escolha)
+            diario.record_choice(a, b, escolha)
+        diario.maybe_snapshot(motor)
+    return motor, diario
+
+
+class TestDiarioDeSessao(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.tmp.name, "sessions", "atual.journal")
+        self.jogos = [f'Jogo {i}' for i in range(40)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_DI01_retomada_sem_snapshot(self):
+        """Reaplicar o diário deve reproduzir pares, pontuação e histórico"""
+        motor, diario = sessao(self.caminho, self.jogos, 300, snapshot_every=0)
+        diario.close()
+        self.assertFalse(os.path.exists(snapshot_path(self.caminho)))
+        retomado, diario = resume(self.caminho)
+        self.assertEqual(retomado.history, motor.history)
+        self.assertEqual(retomado.current_pair, motor.current_pair)
+        self.assertEqual(retomado.exibir_ranking(), motor.exibir_ranking())
+        diario.close()
+
+    def test_DI02_snapshot_e_cauda(self):
+        """Com snapshot, só os eventos posteriores são reaplicados"""
+        jogos = [f'Jogo {i}' for i in range(200)]
+        motor, diario = sessao(self.caminho, jogos, 1050, snapshot_every=500,
+                               options={'mode': MODE_SORT})
+        eventos = diario.events
+        diario.close()
+        self.assertGreater(eventos, 500)
+        self.assertTrue(os.path.exists(snapshot_path(self.caminho)))
+        retomado, diario = resume(self.caminho)
+        self.assertEqual(diario.events, eventos)
+        self.assertEqual(retomado.history, motor.history)
+        self.assertEqual(retomado.current_pair, motor.current_pair)
+        # A sessão continua normalmente após a retomada
+        retomado.undo()
+        diario.record_back()
+        a, b = retomado.current_ids
+        retomado.choose(-1)
+        diario.record_choice(a, b, -1)
+        diario.close()
+        self.assertEqual(resume(self.caminho)[0].history, retomado.history)
+
+    def test_DI03_registro_incompleto_descartado(self):
+        """Uma escrita interrompida no meio de um registro é ignorada"""
+        motor, diario = sessao(self.caminho, self.jogos, 20, snapshot_every=0)
+        diario.close()
+        with open(self.caminho, 'ab') as file:
+            file.write(b'\x01\x02\x03')
+        retomado, diario = resume(self.caminho)
+        self.assertEqual(retomado.history, motor.history)
+        self.assertEqual(diario.events, 20)
+        diario.close()
+
+    def test_DI04_diario_inconsistente(self):
+        """Um diário que não bate com a semente deve ser rejeitado"""
+        motor = RankingEngine(self.jogos, rng=random.Random(1))
+        diario = SessionJournal.create(self.caminho, self.jogos, {}, seed=2)
+        a, b = motor.current_ids
+        diario.record_choice(a, b, -1)
+        diario.close()
+        if RankingEngine(self.jogos, rng=random.Random(2)).current_ids != (a, b):
+            with self.assertRaises(JournalError):
+                resume(self.caminho)
+
+    def test_DI05_concluir_remove_diario(self):
+        """Fechar com remove=True apaga o diário e o snapshot"""
+        _, diario = sessao(self.caminho, self.jogos, 10, snapshot_every=5)
+        self.assertTrue(has_open_session(self.caminho))
+        diario.close(remove=True)
+        self.assertFalse(has_open_session(self.caminho))
+        self.assertFalse(os.path.exists(snapshot_path(self.caminho)))
+
+    def test_DI06_snapshot_corrompido(self):
+        """Snapshot truncado ou corrompido cai na reaplicação completa do diário"""
+        motor, diario = sessao(self.caminho, self.jogos, 60, snapshot_every=25)
+        diario.close()
+        with open(snapshot_path(self.caminho), 'rb') as file:
+            dados = file.read()
+        for ruim in (dados[:len(dados) // 2], dados[:8] + b"lixo" * 10, dados[:6]):
+            with open(snapshot_path(self.caminho), 'wb') as file:
+                file.write(ruim)
+            retomado, diario = resume(self.caminho)
+            self.assertEqual(retomado.history, motor.history)
+            diario.close()
+
+    def test_DI07_cabecalho_invalido_e_descarte(self):
+        """Cabeçalho ilegível vira JournalError, e discard remove o diário"""
+        os.makedirs(os.path.dirname(self.caminho), exist_ok=True)
+        with open(self.caminho, 'wb') as file:
+            file.write(b"RKJ1" + (5).to_bytes(4, 'little') + b"{nao ")
+        with self.assertRaises(JournalError):
+            resume(self.caminho)
+        discard(self.caminho)
+        self.assertFalse(has_open_session(self.caminho))
+
+    def test_DI08_snapshot_gravado_em_segundo_plano(self):
+        """O snapshot é gravado fora da thread que o pede, e close garante o mais recente"""
+        gravacoes = []
+        original = journal._write_snapshot
+
+        def gravar(caminho, dados):
+            gravacoes.append(threading.current_thread())
+            original(caminho, dados)
+        with mock.patch.object(journal, '_write_snapshot', gravar):
+            motor, diario = sessao(self.caminho, self.jogos, 200, snapshot_every=50, sync_interval=0)
+            for _ in range(500):
+                if gravacoes:
+                    break
+                time.sleep(0.01)
+            diario.close()
+        self.assertIsNot(gravacoes[0], threading.current_thread())
+        carregado, eventos = journal.load_snapshot(self.caminho)
+        self.assertEqual(eventos, 200)
+        self.assertEqual(carregado.history, motor.history)
+        retomado, diario = resume(self.caminho)
+        self.assertEqual(retomado.history, motor.history)
+        diario.close(remove=True)
+        self.assertFalse(os.path.exists(snapshot_path(self.caminho)))
+
+if __name__ == '__main__':
+    unittest.main()
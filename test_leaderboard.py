@@ -0,0 +1,52 @@
+import random
+import unittest
+
+from engine import RankingEngine
+from leaderboard import Leaderboard
+
+
+def ordem_esperada(pontos):
+    return sorted(range(len(pontos)), key=lambda i: pontos[i], reverse=True)
+
+
+class TestPlacarIncremental(unittest.TestCase):
+
+    def test_PL01_igual_a_ordenacao_completa(self):
+        """Após atualizações aleatórias o placar deve igualar sorted()"""
+        rng = random.Random(0)
+        pontos = [0] * 500
+        placar = Leaderboard(pontos)
+        for _ in range(5000):
+            item = rng.randrange(500)
+            delta = rng.choice((-1, 1, 1))
+            pontos[item] += delta
+            placar.add(item, delta)
+        esperado = ordem_esperada(pontos)
+        self.assertEqual([item for item, _ in placar], esperado)
+        for item in rng.sample(range(500), 50):
+            self.assertEqual(placar.rank(item), esperado.index(item))
+
+    def test_PL02_paginas(self):
+        """Topo, fundo e páginas devem devolver as fatias corretas"""
+        pontos = [random.Random(i).randrange(20) for i in range(300)]
+        placar = Leaderboard(pontos)
+        completo = [(i, pontos[i]) for i in ordem_esperada(pontos)]
+        self.assertEqual(placar.top(5), completo[:5])
+        self.assertEqual(placar.bottom(7), completo[-7:])
+        self.assertEqual(placar.page(130, 70), completo[130:200])
+        self.assertEqual(placar.page(290, 50), completo[290:])
+        self.assertEqual(placar.page(300, 5), [])
+
+    def test_PL03_motor_usa_placar(self):
+        """O ranking e a parcial do motor devem vir do placar incremental"""
+        jogos = ['Jogo A', 'Jogo B', 'Jogo C', 'Jogo D']
+        motor = RankingEngine(jogos, rng=random.Random(3))
+        motor.votar('Jogo C')
+        self.assertEqual(motor.standings(0, 1), [('Jogo C', 1)])
+        self.assertEqual(motor.rank_of('Jogo C'), 0)
+        motor.voltar()
+        self.assertEqual(motor.standings(0, 4), [(j, 0) for j in jogos])
+
+
+if __name__ == '__main__':
+    unittest.main()
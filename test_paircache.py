@@ -0,0 +1,198 @@
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from engine import RankingEngine
+from journal import SessionJournal, resume
+from paircache import PairCache, DAY
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 1000 * DAY
+
+    def __call__(self):
+        return self.agora
+
+
+class TestCacheDeRespostas(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.tmp.name, "sessions", "pair_cache_teste.bin")
+        self.relogio = Relogio()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_PC01_consulta_nas_duas_ordens(self):
+        """A resposta vale para o par em qualquer ordem, com a escolha invertida"""
+        cache = PairCache(clock=self.relogio)
+        cache.put('Quake', 'Doom', -1)
+        cache.put('Doom', 'Heretic', 0)
+        self.assertEqual(cache.lookup('Quake', 'Doom'), -1)
+        self.assertEqual(cache.lookup('Doom', 'Quake'), 1)
+        self.assertEqual(cache.lookup('Heretic', 'Doom'), 0)
+        self.assertIsNone(cache.lookup('Quake', 'Heretic'))
+        with self.assertRaises(ValueError):
+            cache.put('Doom', 'Doom', 1)
+
+    def test_PC02_limite_idade_e_reconfirmacao(self):
+        """Sai o par usado há mais tempo; respostas velhas expiram ou pedem reconfirmação"""
+        cache = PairCache(clock=self.relogio, max_entries=2, max_age=100 * DAY, confirm_after=30 * DAY)
+        cache.put('A', 'B', -1)
+        cache.put('A', 'C', 1)
+        cache.lookup('A', 'B')
+        cache.put('B', 'C', 0)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.lookup('A', 'C'))
+        self.relogio.agora += 40 * DAY
+        self.assertIsNone(cache.lookup('A', 'B'))
+        cache.confirm_after = None
+        self.assertEqual(cache.lookup('A', 'B'), -1)
+        self.relogio.agora += 70 * DAY
+        self.assertIsNone(cache.lookup('A', 'B'))
+        self.assertEqual(len(cache), 1)
+
+    def test_PC03_arquivo(self):
+        """Gravar e reabrir preserva respostas e ordem de uso; arquivo ruim vira cache vazio"""
+        cache = PairCache(self.caminho, clock=self.relogio)
+        n = 100_000
+        cache.update((f'Jogo {i}', f'Jogo {i + 1}', i % 3 - 1) for i in range(n))
+        cache.save()
+        inicio = time.perf_counter()
+        aberto = PairCache.load(self.caminho, clock=self.relogio, max_entries=n - 10)
+        self.assertLess(time.perf_counter() - inicio, 1.0)
+        self.assertEqual(len(aberto), n - 10)
+        self.assertIsNone(aberto.lookup('Jogo 0', 'Jogo 1'))
+        self.assertEqual(aberto.lookup('Jogo 501', 'Jogo 500'), -(500 % 3 - 1))
+        with open(self.caminho, 'wb') as file:
+            file.write(b"lixo")
+        self.assertEqual(len(PairCache.load(self.caminho)), 0)
+
+    def test_PC04_sessao_pula_pares_conhecidos(self):
+        """Pares conhecidos são aplicados sem perguntar, desfeitos junto e retomados do diário"""
+        jogos = [f'Jogo {i}' for i in range(8)]
+        cache = PairCache(clock=self.relogio)
+        rng = random.Random(3)
+        for i in range(8):
+            for j in range(i + 1, 8):
+                if rng.random() < 0.5:
+                    cache.put(jogos[i], jogos[j], rng.choice((-1, 0, 1)))
+        conhecidos = len(cache)
+
+        diario_caminho = os.path.join(self.tmp.name, "sessions", "atual.journal")
+        motor = RankingEngine(jogos, rng=random.Random(5))
+        diario = SessionJournal.create(diario_caminho, jogos, {}, 5)
+
+        def aplicar():
+            for a, b, escolha in motor.apply_known(cache.lookup):
+                diario.record_known(a, b, escolha)
+        aplicar()
+        perguntados = []
+        while not motor.finished:
+            par = motor.current_pair
+            self.assertIsNone(cache.lookup(*par))
+            perguntados.append(par)
+            a, b = motor.current_ids
+            motor.choose(-1)
+            diario.record_choice(a, b, -1)
+            aplicar()
+        self.assertEqual(len(perguntados), 28 - conhecidos)
+        self.assertEqual(len(motor.user_history()), len(perguntados))
+        self.assertEqual(len(motor.history), 28)
+
+        # Voltar leva ao último par perguntado, desfazendo os conhecidos depois dele
+        self.assertTrue(motor.undo())
+        diario.record_back()
+        self.assertEqual(motor.current_pair, perguntados[-1])
+        diario.close()
+        retomado, diario = resume(diario_caminho)
+        self.assertEqual(retomado.history, motor.history)
+        self.assertEqual(retomado.user_history(), motor.user_history())
+        diario.close()
+
+
+    def test_PC05_retomada_com_snapshot_entre_respostas_conhecidas(self):
+        """Um snapshot tirado no meio das respostas do cache não adianta o motor em relação ao diário"""
+        jogos = [f'Jogo {i}' for i in range(8)]
+        for seed in range(40):
+            with self.subTest(seed=seed):
+                rng = random.Random(seed)
+                cache = PairCache(clock=self.relogio)
+                for i in range(8):
+                    for j in range(i + 1, 8):
+                        if rng.random() < 0.6:
+                            cache.put(jogos[i], jogos[j], rng.choice((-1, 0, 1)))
+                caminho = os.path.join(self.tmp.name, f"s{seed}", "atual.journal")
+                motor = RankingEngine(jogos, rng=random.Random(seed))
+                diario = SessionJournal.create(caminho, jogos, {}, seed, answers={'confirm_after': None},
+                                               snapshot_every=4)
+
+                def registrar(a, b, escolha):
+                    diario.record_known(a, b, escolha)
+                    diario.maybe_snapshot(motor)
+                motor.apply_known(cache.lookup, registrar)
+                for _ in range(3):
+                    if motor.finished:
+                        break
+                    a, b = motor.current_ids
+                    motor.choose(1)
+                    diario.record_choice(a, b, 1)
+                    diario.maybe_snapshot(motor)
+                    motor.apply_known(cache.lookup, registrar)
+                diario.close()
+                retomado, diario = resume(caminho)
+                self.assertEqual(retomado.history, motor.history)
+                self.assertEqual(retomado.user_history(), motor.user_history())
+                self.assertEqual(diario.header['answers'], {'confirm_after': None})
+                diario.close()
+
+
+    def test_PC06_salvar_depois_de_gravar_o_cache(self):
+        """Salvar o resultado com o cache ligado conclui a gravação, e a falha do cache aparece no status"""
+        # Em outro processo, com o Tk simulado do bench: sem display e sem
+        # trocar o tkinter dos demais testes
+        script = """
+import json, sys
+from bench import install_tk_stub, _Widget, _noop
+install_tk_stub()
+import ranker
+from paircache import PairCache
+tmp, cache_path = sys.argv[1], sys.argv[2]
+ranker.RESULTS_DIR, ranker.DEFAULT_DB = tmp, tmp + "/historico.db"
+status = []
+ranker.Ranker.set_status = lambda self, text, error=False: status.append([text, error])
+ranker.Ranker.start_statistics = _noop
+sessao = ranker.Ranker(_Widget(), _Widget(), ["Doom", "Quake", "Hexen"], answers=PairCache(cache_path))
+while not sessao.engine.finished:
+    sessao.handle_choice(-1)
+sessao.next_pair()
+sessao.save_results()
+ranker.background_writer().close(10)
+sessao.poll_writer()
+print(json.dumps(status))
+"""
+        pasta = os.path.dirname(os.path.abspath(__file__))
+        bloqueio = os.path.join(self.tmp.name, "arquivo")
+        with open(bloqueio, 'w') as file:
+            file.write("não é uma pasta")
+        for caminho, falha in ((self.caminho, False), (os.path.join(bloqueio, "cache.bin"), True)):
+            with self.subTest(falha=falha):
+                processo = subprocess.run([sys.executable, "-c", script, self.tmp.name, caminho], cwd=pasta,
+                                          capture_output=True, text=True, env={**os.environ, "DISPLAY": ""})
+                self.assertEqual(processo.returncode, 0, processo.stderr)
+                status = json.loads(processo.stdout.splitlines()[-1])
+                self.assertTrue(any(texto.startswith("Salvo em") for texto, _ in status), status)
+                self.assertEqual(any(erro for _, erro in status), falha, status)
+                if not falha:
+                    self.assertEqual(len(PairCache.load(caminho)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import random
+import unittest
+import itertools
+
+from pairs import PairStream, decode_pair, encode_pair, pair_count
+
+
+class TestGeradorDePares(unittest.TestCase):
+
+    def test_GP01_decodificacao_inversa(self):
+        """decode_pair e encode_pair devem ser inversos em ordem de combinação"""
+        for k in range(pair_count(60)):
+            i, j = decode_pair(k)
+            self.assertLess(i, j)
+            self.assertEqual(encode_pair(i, j), k)
+
+    def test_GP02_permutacao_completa(self):
+        """Cada par deve aparecer exatamente uma vez, para vários tamanhos"""
+        for n in (0, 1, 2, 3, 7, 10, 33):
+            stream = PairStream(n, random.Random(n))
+            pares = list(stream)
+            self.assertEqual(len(pares), pair_count(n))
+            self.assertEqual(set(pares), set(itertools.combinations(range(n), 2)))
+
+    def test_GP03_avancar_e_voltar(self):
+        """Voltar deve reapresentar exatamente o par anterior"""
+        stream = PairStream(10, random.Random(1))
+        primeiro = stream.current()
+        stream.advance()
+        segundo = stream.current()
+        stream.back()
+        self.assertEqual(stream.current(), primeiro)
+        stream.advance()
+        self.assertEqual(stream.current(), segundo)
+        self.assertEqual(stream.peek(0), segundo)
+
+    def test_GP04_promover_item(self):
+        """promote deve antecipar um par com o item sem perder nenhum par"""
+        stream = PairStream(8, random.Random(3))
+        atual = stream.current()
+        item = next(x for x in range(8) if x not in atual)
+        self.assertTrue(stream.promote(item))
+        self.assertIn(item, stream.current())
+        self.assertEqual(set(stream), set(itertools.combinations(range(8), 2)))
+
+    def test_GP05_mesma_semente_mesma_ordem(self):
+        """A ordem deve ser reprodutível a partir da semente"""
+        a = list(PairStream(20, random.Random(7)))
+        b = list(PairStream(20, random.Random(7)))
+        self.assertEqual(a, b)
+
+    def test_GP06_catalogo_grande_sem_materializar(self):
+        """Com 10 mil itens o primeiro par sai sem gerar as combinações"""
+        stream = PairStream(10000, random.Random(0))
+        self.assertEqual(len(stream), pair_count(10000))
+        i, j = stream.current()
+        self.assertTrue(0 <= i < j < 10000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import random
+import unittest
+
+from engine import RankingEngine, RATING_BRADLEY_TERRY, RATING_ELO
+from ratings import EloRating, np
+
+if np is not None:
+    from ratings import BradleyTerry, pair_counts, TIES_DAVIDSON
+
+
+def decisoes_sinteticas(n, m, seed, empate=0.1):
+    rng = np.random.default_rng(seed)
+    forca = rng.normal(size=n)
+    a = rng.integers(0, n, m)
+    b = (a + rng.integers(1, n, m)) % n
+    p = 1 / (1 + np.exp(-(forca[a] - forca[b])))
+    u = rng.random(m)
+    escolha = np.where(u < p * (1 - empate), -1, np.where(u > 1 - (1 - p) * (1 - empate), 1, 0))
+    return forca, a, b, escolha
+
+
+@unittest.skipIf(np is None, "numpy não instalado")
+class TestBradleyTerry(unittest.TestCase):
+
+    def test_BT01_contagens_por_par(self):
+        """Decisões devem ser agregadas por par não ordenado"""
+        i, j, wi, wj, t = pair_counts([0, 1, 0, 2], [1, 0, 1, 0], [-1, -1, 0, 1], 3)
+        self.assertEqual(list(i), [0, 0])
+        self.assertEqual(list(j), [1, 2])
+        self.assertEqual(list(wi), [1, 1])
+        self.assertEqual(list(wj), [1, 0])
+        self.assertEqual(list(t), [1, 0])
+
+    def test_BT02_recupera_forcas(self):
+        """O ajuste deve recuperar a ordem das forças reais"""
+        forca, a, b, escolha = decisoes_sinteticas(30, 20000, seed=1)
+        for empates in ('half', TIES_DAVIDSON):
+            modelo = BradleyTerry(30, ties=empates)
+            modelo.fit(a, b, escolha)
+            corr = np.corrcoef(np.log(modelo.strengths), forca)[0, 1]
+            self.assertGreater(corr, 0.97)
+
+    def test_BT03_partida_a_quente(self):
+        """Reajustar com os mesmos dados deve convergir quase de imediato"""
+        _, a, b, escolha = decisoes_sinteticas(20, 5000, seed=2)
+        modelo = BradleyTerry(20)
+        modelo.fit(a, b, escolha)
+        modelo.fit(a, b, escolha)
+        self.assertLessEqual(modelo.iterations, 2)
+
+    def test_BT04_motor_com_bradley_terry(self):
+        """O motor deve ordenar pelo Bradley–Terry quando configurado"""
+        jogos = ['Jogo A', 'Jogo B', 'Jogo C', 'Jogo D']
+        motor = RankingEngine(jogos, rng=random.Random(0), rating=RATING_BRADLEY_TERRY)
+        while not motor.fim():
+            motor.votar(min(motor.obter_par_atual()))
+        self.assertEqual([j for j, _ in motor.exibir_ranking()], jogos)
+        motor.voltar()
+        self.assertEqual(len(motor.ratings()), 4)
+
+
+class TestElo(unittest.TestCase):
+
+    def test_EL01_atualiza_e_desfaz(self):
+        """Uma vitória sobe a nota do vencedor e desfazer restaura as notas"""
+        elo = EloRating(2)
+        elo.update(0, 1, -1)
+        self.assertGreater(elo.values[0], elo.values[1])
+        self.assertAlmostEqual(sum(elo.values), 3000)
+        elo.undo()
+        self.assertEqual(elo.values, [1500, 1500])
+
+    def test_EL02_motor_com_elo(self):
+        """O motor deve ordenar pelas notas Elo quando configurado"""
+        jogos = ['Jogo A', 'Jogo B', 'Jogo C']
+        motor = RankingEngine(jogos, rng=random.Random(1), rating=RATING_ELO)
+        while not motor.fim():
+            motor.votar(min(motor.obter_par_atual()))
+        self.assertEqual([j for j, _ in motor.exibir_ranking()], jogos)
+
+
+if __name__ == '__main__':
+    unittest.main()
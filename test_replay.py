@@ -0,0 +1,120 @@
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from engine import RankingEngine, MODE_SORT, RATING_ELO
+from journal import SessionJournal
+from replay import replay_all, output_path, main
+from results import save_ranking_csv
+
+
+def sessao(jogos, seed, **options):
+    motor = RankingEngine(jogos, rng=random.Random(seed), **options)
+    rng = random.Random(seed + 1)
+    while not motor.finished:
+        motor.choose(rng.choice((-1, 0, 1)))
+    return motor
+
+
+def ler_bytes(caminho):
+    with open(caminho, 'rb') as file:
+        return file.read()
+
+
+class TestReprocessamento(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saida = os.path.join(self.tmp.name, "saida")
+        self.jogos = [f'Jogo {i}' for i in range(8)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def registro(self, nome, motor, options=None):
+        caminho = os.path.join(self.tmp.name, nome)
+        with open(caminho, 'w', encoding='utf-8') as file:
+            file.write(json.dumps({'items': motor.items, 'options': options or {}}) + "\n")
+            for decisao in motor.history:
+                file.write(json.dumps(decisao) + "\n")
+        return caminho
+
+    def esperado(self, motor):
+        caminho = os.path.join(self.tmp.name, "interativo.csv")
+        save_ranking_csv(caminho, motor.ranking(), motor.resolved)
+        return ler_bytes(caminho)
+
+    def test_RP01_identico_ao_interativo(self):
+        """O CSV reprocessado é idêntico byte a byte ao salvo pela sessão"""
+        for seed, options in ((1, {}), (2, {'rating': RATING_ELO})):
+            motor = sessao(self.jogos, seed, **options)
+            caminho = self.registro(f"sessao{seed}.jsonl", motor, options)
+            self.assertEqual(replay_all([caminho], self.saida, workers=1), [(caminho, None)])
+            self.assertEqual(ler_bytes(output_path(caminho, self.saida)), self.esperado(motor))
+
+    def test_RP02_diario_em_qualquer_modo(self):
+        """Diários são reaplicados com a semente, inclusive no modo ordenação"""
+        caminho = os.path.join(self.tmp.name, "sessao.journal")
+        options = {'mode': MODE_SORT}
+        diario = SessionJournal.create(caminho, self.jogos, options, seed=4)
+        motor = RankingEngine(self.jogos, rng=random.Random(4), **options)
+        rng = random.Random(5)
+        while not motor.finished:
+            a, b = motor.current_ids
+            escolha = rng.choice((-1, 0, 1))
+            motor.choose(escolha)
+            diario.record_choice(a, b, escolha)
+        diario.close()
+        replay_all([caminho], self.saida, workers=1)
+        self.assertEqual(ler_bytes(output_path(caminho, self.saida)), self.esperado(motor))
+
+    def test_RP03_pool_e_erros(self):
+        """Com vários processos a saída é a mesma e erros ficam por arquivo"""
+        caminhos = [self.registro(f"s{i}.jsonl", sessao(self.jogos, i)) for i in range(6)]
+        ruim = os.path.join(self.tmp.name, "ruim.jsonl")
+        with open(ruim, 'w', encoding='utf-8') as file:
+            file.write('["Jogo 0", "Jogo 1", 7]\n')
+        resultado = replay_all(caminhos + [ruim], self.saida, workers=2, chunk_size=2)
+        self.assertEqual([c for c, erro in resultado if erro], [ruim])
+        sequencial = os.path.join(self.tmp.name, "sequencial")
+        replay_all(caminhos, sequencial, workers=1)
+        for caminho in caminhos:
+            self.assertEqual(ler_bytes(output_path(caminho, self.saida)),
+                             ler_bytes(output_path(caminho, sequencial)))
+        self.assertEqual(main([self.tmp.name, "-o", self.saida, "-j", "1"]), 1)
+
+    def test_RP05_campos_malformados(self):
+        """Campos de tipo errado e opções desconhecidas viram erro do arquivo, sem parar os demais"""
+        bom = self.registro("bom.jsonl", sessao(self.jogos, 3))
+        conteudos = {
+            "lista.jsonl": '[["Jogo 0"], "Jogo 1", -1]\n',
+            "texto.jsonl": '["Jogo 0", "Jogo 1", "-1"]\n',
+            "opcao.jsonl": json.dumps({'items': self.jogos, 'options': {'cor': 'azul'}}) + '\n',
+            "itens.jsonl": json.dumps({'items': [[1], [2]], 'options': {}}) + '\n',
+        }
+        ruins = []
+        for nome, conteudo in conteudos.items():
+            caminho = os.path.join(self.tmp.name, nome)
+            with open(caminho, 'w', encoding='utf-8') as file:
+                file.write(conteudo)
+            ruins.append(caminho)
+        diario = os.path.join(self.tmp.name, "opcao.journal")
+        SessionJournal.create(diario, self.jogos, {'cor': 'azul'}, seed=1).close()
+        ruins.append(diario)
+        resultado = replay_all([bom] + ruins, self.saida, workers=2, chunk_size=2)
+        self.assertEqual(sorted(c for c, erro in resultado if erro), sorted(ruins))
+        self.assertTrue(os.path.exists(output_path(bom, self.saida)))
+
+    def test_RP04_sem_tkinter(self):
+        """A linha de comando não importa tkinter"""
+        codigo = "import sys, replay; sys.exit('tkinter' in sys.modules)"
+        pasta = os.path.dirname(os.path.abspath(__file__))
+        self.assertEqual(subprocess.run([sys.executable, "-c", codigo], cwd=pasta).returncode, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
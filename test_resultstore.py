@@ -0,0 +1,147 @@
+import csv
+import io
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from engine import RankingEngine, MODE_TOP_K
+from results import write_ranking_csv
+from resultstore import ResultStore, main
+
+
+class TestHistoricoDeSessoes(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = ResultStore(os.path.join(self.tmp.name, "results", "results.sqlite3"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_RS01_sessao_completa(self):
+        """Ranking e decisões voltam iguais e o CSV exportado bate com o da sessão"""
+        motor = RankingEngine([f'Jogo {i}' for i in range(12)], rng=random.Random(1), mode=MODE_TOP_K, k=3)
+        rng = random.Random(2)
+        while not motor.finished:
+            motor.choose(rng.choice((-1, 0, 1)))
+        sessao = self.store.save_engine(motor)
+        self.assertEqual(self.store.ranking(sessao), (motor.ranking(), motor.resolved))
+        self.assertEqual(self.store.decisions(sessao), motor.history)
+        esperado, exportado = io.StringIO(newline=''), io.StringIO(newline='')
+        write_ranking_csv(esperado, motor.ranking(), motor.resolved)
+        self.store.export_csv(sessao, exportado)
+        self.assertEqual(exportado.getvalue(), esperado.getvalue())
+
+    def test_RS02_transacao_unica(self):
+        """Uma sessão com erro não deixa nada gravado"""
+        with self.assertRaises(sqlite3.Error):
+            self.store.save_session([('Doom', 1), ('Quake', None)], 2)
+        self.assertEqual(self.store.sessions(), [])
+        sessao = self.store.save_session([('Quake', 2), ('Doom', 0)], 2)
+        self.assertEqual(self.store.ranking(sessao), ([('Quake', 2), ('Doom', 0)], 2))
+
+    def test_RS03_importacao_do_arquivo_csv(self):
+        """Os ranking_*.csv antigos entram uma única vez, com a data do nome"""
+        pasta = os.path.join(self.tmp.name, "antigos")
+        os.makedirs(pasta)
+        with open(os.path.join(pasta, "ranking_20240101_120000.csv"), 'w', encoding='utf-8') as file:
+            file.write("Posição,Jogo,Pontuação\n1,Doom,2\n2,Quake,1\n3,Heretic,0\n")
+        with open(os.path.join(pasta, "ranking_20240102_090000.csv"), 'w', encoding='utf-8') as file:
+            file.write("Posição,Jogo,Pontuação\n1,Quake,3\n,Doom,1\n,Heretic,0\n")
+        self.assertEqual(self.store.import_csv_archive(pasta), 2)
+        self.assertEqual(self.store.import_csv_archive(pasta), 0)
+        posicoes = self.store.positions('Doom')
+        self.assertEqual([(data[:10], pos, pts) for data, pos, pts, _ in posicoes],
+                         [('2024-01-02', None, 1), ('2024-01-01', 1, 2)])
+
+    def test_RS04_posicoes_nas_ultimas_sessoes(self):
+        """A consulta por jogo nas últimas 10 mil sessões leva milissegundos"""
+        rng = random.Random(0)
+        jogos = [f'Jogo {i}' for i in range(50)]
+        for dia in range(12000):
+            escolhidos = rng.sample(jogos, 10)
+            ranking = [(jogo, 10 - i) for i, jogo in enumerate(escolhidos)]
+            self.store.save_session(ranking, 10, created_at=f"2020-01-01T00:00:00.{dia:06d}")
+        inicio = time.perf_counter()
+        posicoes = self.store.positions('Jogo 7', last=10000)
+        decorrido = time.perf_counter() - inicio
+        self.assertTrue(all(data >= "2020-01-01T00:00:00.002000" for data, *_ in posicoes))
+        self.assertGreater(len(posicoes), 1000)
+        self.assertLess(decorrido, 0.1)
+        ultimas = self.store.positions('Jogo 7', last=5)
+        self.assertTrue(all(sessao > 11995 for *_, sessao in ultimas))
+
+    def test_RS05_sessao_do_app_nao_e_reimportada(self):
+        """Sessão gravada com o nome do CSV como origem não volta pela importação, e a exportação fica fora do arquivo"""
+        pasta = os.path.join(self.tmp.name, "results")
+        nome = "ranking_20240301_101010.csv"
+        motor = RankingEngine(['Doom', 'Quake', 'Heretic'], rng=random.Random(1))
+        while not motor.finished:
+            motor.choose(-1)
+        sessao = self.store.save_session(motor.ranking(), motor.resolved, motor.history, source=nome)
+        with open(os.path.join(pasta, nome), 'w', newline='', encoding='utf-8') as file:
+            self.store.export_csv(sessao, file)
+        self.assertEqual(self.store.session_for_source(nome), sessao)
+        self.assertEqual(self.store.import_csv_archive(pasta), 0)
+        self.assertEqual(len(self.store.sessions()), 1)
+
+        saida = os.path.join(pasta, "exports", f"sessao_{sessao}.csv")
+        self.store.close()
+        self.assertEqual(main(["--db", self.store.path, "export", str(sessao), "-o", saida]), 0)
+        self.store = ResultStore(self.store.path)
+        self.assertEqual(self.store.import_csv_archive(pasta), 0)
+
+    def test_RS06_sessoes_salvas_no_mesmo_segundo(self):
+        """Duas sessões salvas no mesmo segundo ficam separadas, e salvar de novo reaproveita a própria"""
+        # Em outro processo, com o Tk simulado do bench e o relógio parado
+        script = """
+import json, sys
+from datetime import datetime
+from bench import install_tk_stub, _Widget, _noop
+install_tk_stub()
+import ranker
+pasta = sys.argv[1]
+ranker.RESULTS_DIR, ranker.DEFAULT_DB = pasta, pasta + "/results.sqlite3"
+ranker.datetime = type("Parado", (), {"now": staticmethod(lambda: datetime(2024, 3, 1, 10, 10, 10))})
+ranker.Ranker.start_statistics = _noop
+salvos = []
+ranker.Ranker.on_saved = lambda self, ok, value: salvos.append([ok, str(value) if not ok else value[:2]])
+sessoes = []
+for escolha in (-1, 1):
+    sessao = ranker.Ranker(_Widget(), _Widget(), ["Doom", "Quake", "Hexen"])
+    while not sessao.engine.finished:
+        sessao.handle_choice(escolha)
+    sessao.next_pair()
+    sessoes.append(sessao)
+for sessao in (sessoes[0], sessoes[1], sessoes[0]):
+    sessao.save_results()
+ranker.background_writer().close(10)
+sessoes[0].poll_writer()
+print(json.dumps([salvos, [[item for item, _ in s.engine.ranking()] for s in sessoes]]))
+"""
+        pasta = os.path.join(self.tmp.name, "results")
+        raiz = os.path.dirname(os.path.abspath(__file__))
+        processo = subprocess.run([sys.executable, "-c", script, pasta], cwd=raiz, capture_output=True, text=True,
+                                  env={**os.environ, "DISPLAY": ""})
+        self.assertEqual(processo.returncode, 0, processo.stderr)
+        salvos, rankings = json.loads(processo.stdout.splitlines()[-1])
+        self.assertTrue(all(ok for ok, _ in salvos), salvos)
+        (primeiro, id1), (segundo, id2), (repetido, id3) = (valor for _, valor in salvos)
+        self.assertNotEqual(id1, id2)
+        self.assertEqual((repetido, id3), (primeiro, id1))
+        self.assertNotEqual(primeiro, segundo)
+        for caminho, ranking in ((primeiro, rankings[0]), (segundo, rankings[1])):
+            with open(caminho, newline='', encoding='utf-8') as file:
+                self.assertEqual([linha[1] for linha in list(csv.reader(file))[1:]], ranking)
+        self.assertEqual(self.store.import_csv_archive(pasta), 0)
+        self.assertEqual(len(self.store.sessions()), 2)
+
+if __name__ == '__main__':
+    unittest.main()
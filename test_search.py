@@ -0,0 +1,42 @@
+import unittest
+
+from search import TitleIndex, normalize
+
+
+class TestBuscaDeTitulos(unittest.TestCase):
+
+    def setUp(self):
+        self.titulos = [
+            "Super Mario World",
+            "Doom",
+            "The Legend of Zelda:\nOcarina of Time",
+            "Super Mario 64",
+            "Pokémon Red",
+            "Metal Gear Solid 3:\nSnake Eater",
+        ]
+        self.indice = TitleIndex(self.titulos)
+
+    def test_BU01_normalizacao(self):
+        """A busca ignora maiúsculas, acentos e quebras de linha"""
+        self.assertEqual(normalize("Pokémon\nRED"), "pokemon red")
+
+    def test_BU02_substring_e_prefixo(self):
+        """Termos longos casam substrings; termos curtos casam prefixos"""
+        self.assertEqual(list(self.indice.search("ario")), [0, 3])
+        self.assertEqual(list(self.indice.search("pokemon")), [4])
+        self.assertEqual(list(self.indice.search("64")), [3])
+        self.assertEqual(list(self.indice.search("d")), [1])
+
+    def test_BU03_varios_termos(self):
+        """Todos os termos precisam aparecer no título"""
+        self.assertEqual(list(self.indice.search("super wor")), [0])
+        self.assertEqual(list(self.indice.search("zelda time")), [2])
+        self.assertEqual(list(self.indice.search("zelda doom")), [])
+
+    def test_BU04_busca_vazia(self):
+        """Uma busca vazia devolve o catálogo inteiro, em ordem"""
+        self.assertEqual(list(self.indice.search("  ")), list(range(6)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import asyncio
+import unittest
+
+from loadtest import Client, run
+from service import RankingService, SessionStore, DEFAULT_HOST
+
+
+def com_servidor(teste, store=None):
+    async def executar():
+        service = RankingService(store or SessionStore())
+        server = await service.start(DEFAULT_HOST, 0)
+        cliente = await Client.connect(DEFAULT_HOST, server.sockets[0].getsockname()[1], [])
+        try:
+            await teste(cliente, service)
+        finally:
+            cliente.close()
+            server.close()
+            await server.wait_closed()
+    asyncio.run(executar())
+
+
+JOGOS = ['Doom', 'Quake', 'Heretic', 'Hexen']
+
+
+class TestServicoDeVotacao(unittest.TestCase):
+
+    def test_SV01_sessao_completa(self):
+        """Criar, votar, empatar, voltar e obter o resultado pela API"""
+        async def teste(cliente, service):
+            status, estado = await cliente.request("POST", "/sessions", {'games': JOGOS})
+            self.assertEqual(status, 201)
+            caminho = f"/sessions/{estado['id']}"
+            primeiro = estado['pair']
+            _, estado = await cliente.request("POST", caminho + "/vote", {'game': primeiro[1]})
+            _, estado = await cliente.request("POST", caminho + "/undo")
+            self.assertEqual(estado['pair'], primeiro)
+            while not estado['finished']:
+                _, estado = await cliente.request("POST", caminho + "/vote", {'choice': -1})
+                if not estado['finished']:
+                    _, estado = await cliente.request("POST", caminho + "/tie")
+            status, resultado = await cliente.request("GET", caminho + "/results")
+            self.assertEqual(status, 200)
+            self.assertEqual(sorted(r['game'] for r in resultado['ranking']), sorted(JOGOS))
+            self.assertEqual(sum(r['score'] for r in resultado['ranking']), 3)
+            self.assertEqual((await cliente.request("DELETE", caminho))[0], 204)
+            self.assertEqual((await cliente.request("GET", caminho + "/pair"))[0], 404)
+        com_servidor(teste)
+
+    def test_SV02_validacao(self):
+        """Seleção fora dos limites, JSON inválido e rota errada viram erros HTTP"""
+        async def teste(cliente, service):
+            self.assertEqual((await cliente.request("POST", "/sessions", {'games': ['Doom']}))[0], 400)
+            self.assertEqual((await cliente.request("POST", "/sessions", {'games': JOGOS * 3}))[0], 400)
+            self.assertEqual((await cliente.request("POST", "/sessions", {'games': JOGOS, 'mode': 'x'}))[0], 400)
+            self.assertEqual((await cliente.request("GET", "/sessions"))[0], 405)
+            self.assertEqual((await cliente.request("GET", "/outra"))[0], 404)
+        com_servidor(teste)
+
+    def test_SV03_voto_em_par_antigo(self):
+        """Voto com versão de um par que já saiu da tela é recusado com 409"""
+        async def teste(cliente, service):
+            _, estado = await cliente.request("POST", "/sessions", {'games': JOGOS})
+            caminho = f"/sessions/{estado['id']}"
+            versao = estado['version']
+            self.assertEqual((await cliente.request("POST", caminho + "/vote", {'choice': 1, 'version': versao}))[0], 200)
+            status, _ = await cliente.request("POST", caminho + "/vote", {'choice': 1, 'version': versao})
+            self.assertEqual(status, 409)
+            _, resultado = await cliente.request("GET", caminho + "/results")
+            self.assertEqual(sum(r['score'] for r in resultado['ranking']), 1)
+        com_servidor(teste)
+
+    def test_SV04_descarte_de_sessoes(self):
+        """O armazém respeita o limite de sessões e descarta as ociosas"""
+        async def teste():
+            store = SessionStore(max_sessions=3, idle_timeout=60)
+            ids = [store.create(JOGOS)[0] for _ in range(4)]
+            self.assertEqual(len(store), 3)
+            self.assertEqual(store.evicted, 1)
+            store.get(ids[1])
+            self.assertEqual(store.evict_idle(now=store.get(ids[3]).last_used + 30), 0)
+            ativa = store.get(ids[2]).last_used
+            self.assertEqual(store.evict_idle(now=ativa + 61), 3)
+        asyncio.run(teste())
+
+    def test_SV05_carga(self):
+        """O gerador de carga conclui todas as sessões simultâneas"""
+        relatorio = asyncio.run(run(sessions=200, clients=20, seed=1))
+        self.assertEqual(relatorio['sessions'], 200)
+        self.assertEqual(relatorio['evicted'], 0)
+        self.assertGreater(relatorio['p99_ms'], 0)
+
+    def test_SV06_opcoes_de_tipo_errado(self):
+        """Modo, pontuação ou k com tipo errado no JSON viram 400 sem derrubar a conexão"""
+        async def teste(cliente, service):
+            for opcoes in ({'mode': ['sort']}, {'mode': {'a': 1}}, {'rating': ['wins']}, {'k': '3'}, {'k': 2.5}):
+                with self.subTest(opcoes=opcoes):
+                    status, _ = await cliente.request("POST", "/sessions", dict(opcoes, games=JOGOS))
+                    self.assertEqual(status, 400)
+            self.assertEqual((await cliente.request("POST", "/sessions", {'games': JOGOS}))[0], 201)
+        com_servidor(teste)
+
+    def test_SV07_escolha_que_nao_e_int(self):
+        """'choice' 1.0 vira 400 e a sessão continua consistente"""
+        async def teste(cliente, service):
+            _, estado = await cliente.request("POST", "/sessions", {'games': JOGOS})
+            caminho = f"/sessions/{estado['id']}"
+            for escolha in (1.0, True, "1"):
+                with self.subTest(escolha=escolha):
+                    self.assertEqual((await cliente.request("POST", caminho + "/vote", {'choice': escolha}))[0], 400)
+            self.assertEqual((await cliente.request("POST", caminho + "/vote", {'choice': 1}))[0], 200)
+            _, resultado = await cliente.request("GET", caminho + "/results")
+            self.assertEqual(sum(r['score'] for r in resultado['ranking']), 1)
+            motor = service.store.get(estado['id']).engine
+            self.assertEqual(len(motor.history), 1)
+            self.assertEqual(len(motor._hist_first), len(motor._hist_choice))
+        com_servidor(teste)
+
+if __name__ == '__main__':
+    unittest.main()
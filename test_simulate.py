@@ -0,0 +1,54 @@
+import itertools
+import random
+import unittest
+
+from simulate import kendall_tau, top_k_precision, simulate_session, run
+
+
+class TestSimulacaoDeVotantes(unittest.TestCase):
+
+    def test_SI01_metricas(self):
+        """O tau por inversões bate com a contagem par a par, e a precisão conta o top-k"""
+        rng = random.Random(0)
+        for n in (2, 7, 20):
+            ordem = list(range(n))
+            rng.shuffle(ordem)
+            posicao = list(range(n))
+            rng.shuffle(posicao)
+            pares = list(itertools.combinations(ordem, 2))
+            concordantes = sum(posicao[a] < posicao[b] for a, b in pares)
+            self.assertAlmostEqual(kendall_tau(ordem, posicao), (2 * concordantes - len(pares)) / len(pares))
+        self.assertEqual(top_k_precision([3, 1, 2, 0], [1, 0, 3, 2], 2), 0.5)
+
+    def test_SI02_votante_perfeito(self):
+        """Sem ruído nem empates, todos os pares e a ordenação acertam a ordem inteira"""
+        opcoes = dict(n=12, noise=0, tie=0)
+        comparacoes, tau, precisao = simulate_session('round_robin', 3, **opcoes)
+        self.assertEqual((comparacoes, tau, precisao), (66, 1.0, 1.0))
+        comparacoes, tau, precisao = simulate_session('sort', 3, **opcoes)
+        self.assertLess(comparacoes, 66)
+        self.assertEqual((tau, precisao), (1.0, 1.0))
+        self.assertEqual(simulate_session('top_k', 3, **opcoes)[2], 1.0)
+
+    def test_SI03_reprodutivel_com_sementes(self):
+        """A mesma semente dá o mesmo resumo com qualquer número de processos"""
+        opcoes = dict(strategies=['round_robin', 'sort'], budgets=(0.5, 1.0), sessions=40, seed=7,
+                      n=8, intransitivity=0.1)
+        sequencial = run(workers=1, **opcoes)
+        paralelo = run(workers=2, chunk_size=15, **opcoes)
+        self.assertEqual(sequencial, paralelo)
+        self.assertEqual([(r['strategy'], r['budget']) for r in sequencial],
+                         [('round_robin', 0.5), ('round_robin', 1.0), ('sort', 0.5), ('sort', 1.0)])
+        self.assertLess(sequencial[0]['comparisons'], sequencial[1]['comparisons'])
+        self.assertNotEqual(run(workers=1, **dict(opcoes, seed=8)), sequencial)
+
+    def test_SI04_estrategia_desconhecida(self):
+        """Modo ou pontuação inválidos são recusados antes de simular"""
+        with self.assertRaises(ValueError):
+            run(['bogo_sort'], sessions=1, workers=1)
+        with self.assertRaises(ValueError):
+            run(['round_robin/glicko'], sessions=1, workers=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import random
+import unittest
+
+from engine import RankingEngine, MODE_SORT
+from sorting import InsertionSorter, max_insertion_comparisons
+
+
+def responder(sorter, forca):
+    a, b = sorter.current()
+    if forca[a] == forca[b]:
+        return 0
+    return -1 if forca[a] > forca[b] else 1
+
+
+class TestOrdenacaoPorInsercao(unittest.TestCase):
+
+    def test_OI01_ordena_com_poucas_comparacoes(self):
+        """Respostas consistentes devem produzir a ordem real dentro do limite"""
+        for n in (2, 5, 10, 64, 200):
+            rng = random.Random(n)
+            forca = list(range(n))
+            rng.shuffle(forca)
+            sorter = InsertionSorter(n, rng)
+            passos = 0
+            while not sorter.finished:
+                sorter.record(responder(sorter, forca))
+                passos += 1
+            self.assertLessEqual(passos, max_insertion_comparisons(n))
+            ordem = [item for item, _ in sorter.ranking()]
+            self.assertEqual(ordem, sorted(range(n), key=lambda i: -forca[i]))
+
+    def test_OI02_empates_dividem_posicao(self):
+        """Itens empatados devem ficar juntos e com a mesma pontuação"""
+        forca = [3, 1, 3, 0, 1]
+        sorter = InsertionSorter(5, random.Random(4))
+        while not sorter.finished:
+            sorter.record(responder(sorter, forca))
+        pontos = dict(sorter.ranking())
+        self.assertEqual(pontos[0], pontos[2])
+        self.assertEqual(pontos[1], pontos[4])
+        self.assertEqual(pontos[0], 3)
+        self.assertEqual(pontos[3], 0)
+
+    def test_OI03_voltar_restaura_estado(self):
+        """Desfazer qualquer passo deve reapresentar o mesmo par"""
+        forca = list(range(30))
+        sorter = InsertionSorter(30, random.Random(9))
+        while not sorter.finished:
+            par = sorter.current()
+            sorter.record(responder(sorter, forca))
+            sorter.back()
+            self.assertEqual(sorter.current(), par)
+            sorter.record(responder(sorter, forca))
+        self.assertEqual([i for i, _ in sorter.ranking()], list(reversed(range(30))))
+
+    def test_OI04_motor_no_modo_ordenacao(self):
+        """O motor deve expor a mesma API no modo de ordenação"""
+        motor = RankingEngine(['Jogo A', 'Jogo B', 'Jogo C', 'Jogo D'], mode=MODE_SORT)
+        while not motor.fim():
+            motor.votar(min(motor.obter_par_atual()))
+        ranking = motor.exibir_ranking()
+        self.assertEqual(ranking, [('Jogo A', 3), ('Jogo B', 2), ('Jogo C', 1), ('Jogo D', 0)])
+        self.assertTrue(motor.voltar())
+        self.assertFalse(motor.fim())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import random
+import time
+import unittest
+
+from engine import RankingEngine, MODE_SORT, MODE_TOP_K, RATING_ELO
+from stats import bootstrap_ranking, applies_to, np
+
+
+@unittest.skipIf(np is None, "numpy não instalado")
+class TestEstabilidadeDoRanking(unittest.TestCase):
+
+    def test_ST01_ordem_dominante(self):
+        """Com um item sempre vencendo, a primeira posição é certa e o próximo fica atrás"""
+        motor = RankingEngine([f'Jogo {i}' for i in range(6)], rng=random.Random(0))
+        rng = random.Random(1)
+        while not motor.finished:
+            a, b = motor.current_pair
+            if 'Jogo 0' in (a, b):
+                motor.choose(-1 if a == 'Jogo 0' else 1)
+            else:
+                motor.choose(rng.choice((-1, 1)))
+        ordem = [motor.index[item] for item, _ in motor.ranking()]
+        intervalos, acima = bootstrap_ranking(*motor.decision_arrays(), ordem, seed=1)
+        self.assertEqual(motor.ranking()[0][0], 'Jogo 0')
+        self.assertEqual(intervalos[0][0], 1)
+        self.assertGreater(acima[0], 0.5)
+        self.assertEqual(len(acima), 5)
+
+    def test_ST02_intervalo_contem_a_posicao_observada(self):
+        """Cada item tem sua posição final dentro do intervalo"""
+        rng = np.random.default_rng(3)
+        n, m = 30, 400
+        a = rng.integers(0, n, m)
+        b = (a + rng.integers(1, n, m)) % n
+        escolha = np.where(a < b, -1, 1)
+        vitorias = np.bincount(np.where(escolha == -1, a, b), minlength=n)
+        ordem = list(np.argsort(-vitorias, kind='stable'))
+        intervalos, _ = bootstrap_ranking(a, b, escolha, ordem, seed=0)
+        for posicao, (lo, hi) in enumerate(intervalos, start=1):
+            empatados = vitorias[ordem[posicao - 1]]
+            observada = 1 + int((vitorias > empatados).sum())
+            self.assertLessEqual(lo, observada)
+            self.assertGreaterEqual(hi, observada)
+
+    def test_ST03_sem_decisoes(self):
+        """Sem decisões todas as posições são possíveis"""
+        self.assertEqual(bootstrap_ranking([], [], [], [2, 0, 1]), ([(1, 3)] * 3, [0.5, 0.5]))
+
+    def test_ST04_tempo_para_mil_decisoes(self):
+        """Mil decisões e 2000 reamostragens em menos de 200 ms"""
+        rng = np.random.default_rng(5)
+        n, m = 200, 1000
+        a = rng.integers(0, n, m)
+        b = (a + rng.integers(1, n, m)) % n
+        escolha = rng.integers(-1, 2, m)
+        bootstrap_ranking(a, b, escolha, list(range(n)), seed=0)
+        inicio = time.perf_counter()
+        bootstrap_ranking(a, b, escolha, list(range(n)), seed=0)
+        self.assertLess(time.perf_counter() - inicio, 0.2)
+
+    def test_ST05_memoria_limitada(self):
+        """Muitos itens e decisões: os sorteios vão em blocos e as amostras são limitadas"""
+        import tracemalloc
+        rng = np.random.default_rng(6)
+        n, m = 20000, 50000
+        a = rng.integers(0, n, m)
+        b = (a + rng.integers(1, n, m)) % n
+        escolha = rng.integers(-1, 2, m)
+        tracemalloc.start()
+        try:
+            intervalos, acima = bootstrap_ranking(a, b, escolha, list(range(n)), seed=0)
+            pico = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertEqual((len(intervalos), len(acima)), (n, n - 1))
+        self.assertLess(pico, 128 * 2 ** 20)
+
+    def test_ST06_so_no_ranking_por_vitorias(self):
+        """Os intervalos só valem para todos os pares com pontuação por vitórias"""
+        jogos = ['Doom', 'Quake', 'Heretic']
+        self.assertTrue(applies_to(RankingEngine(jogos)))
+        self.assertFalse(applies_to(RankingEngine(jogos, mode=MODE_SORT)))
+        self.assertFalse(applies_to(RankingEngine(jogos, mode=MODE_TOP_K, k=1)))
+        self.assertFalse(applies_to(RankingEngine(jogos, rating=RATING_ELO)))
+
+
+if __name__ == '__main__':
+    unittest.main()
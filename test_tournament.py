@@ -0,0 +1,63 @@
+import random
+import unittest
+
+from engine import RankingEngine, MODE_TOP_K
+from tournament import TopKTournament, max_tournament_comparisons
+
+
+def jogar(torneio, forca):
+    passos = 0
+    while not torneio.finished:
+        a, b = torneio.current()
+        torneio.record(-1 if forca[a] >= forca[b] else 1)
+        passos += 1
+    return passos
+
+
+class TestTorneioTopK(unittest.TestCase):
+
+    def test_TK01_identifica_os_k_primeiros(self):
+        """O torneio deve encontrar e ordenar os k melhores"""
+        for n, k in ((2, 1), (7, 3), (64, 5), (1000, 5), (10, 10)):
+            rng = random.Random(n * k)
+            forca = list(range(n))
+            rng.shuffle(forca)
+            torneio = TopKTournament(n, k, rng)
+            passos = jogar(torneio, forca)
+            esperado = sorted(range(n), key=lambda i: -forca[i])[:k]
+            self.assertEqual(torneio.top, esperado)
+            self.assertLessEqual(passos, max_tournament_comparisons(n, k))
+
+    def test_TK02_poucas_comparacoes(self):
+        """Para 1000 itens e k=5 bastam cerca de n + k·log n comparações"""
+        self.assertLess(max_tournament_comparisons(1000, 5), 1000 + 5 * 10)
+
+    def test_TK03_voltar_restaura_estado(self):
+        """Desfazer qualquer passo deve reapresentar o mesmo par"""
+        forca = list(range(40))
+        random.Random(2).shuffle(forca)
+        torneio = TopKTournament(40, 4, random.Random(5))
+        while not torneio.finished:
+            par = torneio.current()
+            a, b = par
+            escolha = -1 if forca[a] >= forca[b] else 1
+            torneio.record(escolha)
+            torneio.back()
+            self.assertEqual(torneio.current(), par)
+            torneio.record(escolha)
+        self.assertEqual(torneio.top, sorted(range(40), key=lambda i: -forca[i])[:4])
+
+    def test_TK04_motor_marca_cauda_nao_resolvida(self):
+        """O motor deve parar após os k primeiros e marcar o restante"""
+        jogos = [f'Jogo {i}' for i in range(20)]
+        motor = RankingEngine(jogos, mode=MODE_TOP_K, k=3)
+        while not motor.fim():
+            motor.votar(min(motor.obter_par_atual(), key=jogos.index))
+        ranking = motor.exibir_ranking()
+        self.assertEqual([j for j, _ in ranking[:3]], jogos[:3])
+        self.assertEqual(motor.resolved, 3)
+        self.assertEqual(len(ranking), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
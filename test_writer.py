@@ -0,0 +1,86 @@
+import os
+import queue
+import tempfile
+import threading
+import time
+import unittest
+
+from writer import BackgroundWriter
+
+
+def esperar(gravador, prazo=5):
+    fim = time.monotonic() + prazo
+    resultados = []
+    while time.monotonic() < fim:
+        resultados += gravador.poll()
+        if not gravador.pending:
+            return resultados + gravador.poll()
+        time.sleep(0.01)
+    raise AssertionError("gravação não terminou")
+
+
+class TestGravacaoEmSegundoPlano(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.gravador = BackgroundWriter(max_pending=2)
+
+    def tearDown(self):
+        self.gravador.close(5)
+        self.tmp.cleanup()
+
+    def caminho(self, nome):
+        return os.path.join(self.tmp.name, "results", nome)
+
+    def test_GR01_grava_e_avisa(self):
+        """O trabalho roda na thread e o resultado chega pelo poll"""
+        destino = self.caminho("a.csv")
+
+        def trabalho(files):
+            files.write(destino, b"Posi\xc3\xa7\xc3\xa3o,Jogo\n")
+            return threading.current_thread().name
+        self.gravador.submit(trabalho, "avisar")
+        self.assertEqual(esperar(self.gravador), [("avisar", True, "results-writer")])
+        with open(destino, 'rb') as file:
+            self.assertEqual(file.read(), b"Posi\xc3\xa7\xc3\xa3o,Jogo\n")
+
+    def test_GR02_falha_nao_deixa_arquivo(self):
+        """Um trabalho que falha é informado e não deixa temporários nem destino"""
+        destino = self.caminho("b.csv")
+
+        def trabalho(files):
+            files.write(destino, b"meio")
+            raise OSError("disco cheio")
+        self.gravador.submit(trabalho)
+        [(_, ok, erro)] = esperar(self.gravador)
+        self.assertFalse(ok)
+        self.assertIsInstance(erro, OSError)
+        self.assertEqual(os.listdir(os.path.dirname(destino)), [])
+
+    def test_GR03_fila_limitada_e_fechamento(self):
+        """Com a fila cheia submit recusa na hora, e close grava o que ficou"""
+        iniciou, liberar = threading.Event(), threading.Event()
+        destinos = [self.caminho(f"{i}.csv") for i in range(3)]
+
+        def trabalho(destino):
+            def executar(files):
+                iniciou.set()
+                liberar.wait(5)
+                files.write(destino, b"ok")
+            return executar
+        self.gravador.submit(trabalho(destinos[0]))
+        self.assertTrue(iniciou.wait(5))
+        for destino in destinos[1:]:
+            self.gravador.submit(trabalho(destino))
+        # Um em execução e dois na fila: o próximo não cabe
+        with self.assertRaises(queue.Full):
+            self.gravador.submit(trabalho(self.caminho("extra.csv")))
+        liberar.set()
+        self.assertTrue(self.gravador.close(5))
+        self.assertTrue(all(os.path.exists(d) for d in destinos))
+        with self.assertRaises(RuntimeError):
+            self.gravador.submit(trabalho(self.caminho("depois.csv")))
+
+
+if __name__ == '__main__':
+    unittest.main()
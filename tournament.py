@@ -0,0 +1,136 @@
+import random
+from array import array
+
+
+def max_tournament_comparisons(n, k):
+    if n < 2:
+        return 0
+    k = min(k, n)
+    depth = (n - 1).bit_length()
+    return n - 1 + (k - 1) * depth
+
+
+class TopKTournament:
+    """Torneio eliminatório que só resolve os k primeiros colocados.
+
+    As folhas de uma árvore binária completa recebem os itens embaralhados;
+    cada nó guarda o vencedor dos dois filhos. Depois de coroado, o campeão é
+    retirado da sua folha e apenas o caminho até a raiz é rejogado, o que dá
+    cerca de n + k·log n comparações. Nós com um só filho avançam sem
+    pergunta. Num empate avança o item da esquerda.
+    """
+
+    def __init__(self, n, k, rng=None):
+        rng = rng if rng is not None else random.Random()
+        self.n = n
+        self.k = min(k, n)
+        self.total = max_tournament_comparisons(n, k)
+
+        size = 1
+        while size < n:
+            size *= 2
+        self._size = size
+        self._tree = array('l', [-1]) * (2 * size)
+        self._leaf = array('l', [0]) * n
+        order = list(range(n))
+        rng.shuffle(order)
+        for pos, item in enumerate(order):
+            self._tree[size + pos] = item
+            self._leaf[item] = size + pos
+
+        # Com um só item a raiz já é a folha
+        self.top = list(range(n)) if size == 1 else []
+        self._node = size - 1
+        self._building = True
+        # Um registro por resposta: (nó, construindo, tamanho do top, escritas)
+        self._undo = []
+        self._writes = []
+        self._advance()
+
+    def __len__(self):
+        return self.total
+
+    @property
+    def position(self):
+        return len(self._undo)
+
+    @property
+    def remaining(self):
+        return max(0, self.total - len(self._undo))
+
+    @property
+    def finished(self):
+        return len(self.top) >= self.k
+
+    @property
+    def resolved(self):
+        return len(self.top)
+
+    def _set(self, node, value):
+        self._writes.append((node, self._tree[node]))
+        self._tree[node] = value
+
+    def _next_node(self):
+        if self._node == 1:
+            champion = self._tree[1]
+            self.top.append(champion)
+            if self.finished:
+                self._node = 0
+                return
+            # Retira o campeão e rejoga só o caminho da sua folha
+            leaf = self._leaf[champion]
+            self._set(leaf, -1)
+            self._building = False
+            self._node = leaf // 2
+        elif self._building:
+            self._node -= 1
+        else:
+            self._node //= 2
+
+    # Avança pelos nós que não precisam de pergunta
+    def _advance(self):
+        tree = self._tree
+        while not self.finished and self._node >= 1:
+            left, right = tree[2 * self._node], tree[2 * self._node + 1]
+            if left >= 0 and right >= 0:
+                return
+            self._set(self._node, left if left >= 0 else right)
+            self._next_node()
+
+    def current(self):
+        if self.finished:
+            return None
+        return self._tree[2 * self._node], self._tree[2 * self._node + 1]
+
+    def record(self, choice):
+        if self.finished:
+            raise IndexError("Não há mais pares")
+
+        self._writes = []
+        state = (self._node, self._building, len(self.top), self._writes)
+        left, right = self.current()
+        self._set(self._node, right if choice == 1 else left)
+        self._next_node()
+        self._advance()
+        self._undo.append(state)
+
+    def back(self):
+        if not self._undo:
+            raise IndexError("Nenhum par anterior")
+        self._node, self._building, top_size, writes = self._undo.pop()
+        for node, old in reversed(writes):
+            self._tree[node] = old
+        del self.top[top_size:]
+
+    def promote(self, item):
+        return False
+
+    # Os k primeiros recebem o número de itens abaixo deles; o restante, ainda
+    # não resolvido, é ordenado pelas vitórias na sessão
+    def ranking(self, wins):
+        ranked = [(item, self.n - 1 - pos) for pos, item in enumerate(self.top)]
+        placed = set(self.top)
+        tail = [item for item in range(self.n) if item not in placed]
+        tail.sort(key=lambda item: wins[item], reverse=True)
+        ranked.extend((item, wins[item]) for item in tail)
+        return ranked
@@ -0,0 +1,173 @@
+import os
+import queue
+import tempfile
+import threading
+
+# Gravações aguardando a thread; além disso submit() recusa em vez de travar
+MAX_PENDING = 32
+# Quantos trabalhos dividem uma mesma rodada de fsync
+BATCH_SIZE = 16
+
+_STOP = object()
+
+
+class StagedFiles:
+    """Arquivos de um trabalho, escritos em temporários até o commit.
+
+    No commit cada temporário recebe fsync e é renomeado sobre o destino
+    (os.replace é atômico): quem lê o destino vê o arquivo antigo ou o novo
+    inteiro, nunca um pedaço.
+    """
+
+    def __init__(self):
+        self._files = []
+
+    def write(self, path, data):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix="." + os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+        file = os.fdopen(fd, 'wb')
+        self._files.append((file, tmp_path, path))
+        file.write(data)
+        file.flush()
+
+    def commit(self):
+        directories = set()
+        for file, tmp_path, path in self._files:
+            os.fsync(file.fileno())
+            file.close()
+            os.replace(tmp_path, path)
+            directories.add(os.path.dirname(os.path.abspath(path)))
+        self._files = []
+        return directories
+
+    def discard(self):
+        for file, tmp_path, _ in self._files:
+            file.close()
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+        self._files = []
+
+
+def _sync_directory(directory):
+    # Torna o rename durável; nem todo sistema permite abrir diretórios
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class BackgroundWriter:
+    """Thread de gravação com fila limitada, para a interface nunca esperar disco.
+
+    submit(job, callback) enfileira job(files), executado na thread; o job
+    escreve seus arquivos por files.write(caminho, bytes). Os trabalhos que
+    chegam juntos formam um lote: todos são preparados, depois vêm os fsync,
+    os renames e um único fsync por diretório. O resultado (ok, valor ou
+    exceção) fica disponível em poll(), que a interface consulta com after().
+    """
+
+    def __init__(self, max_pending=MAX_PENDING, batch_size=BATCH_SIZE):
+        self.batch_size = batch_size
+        self._jobs = queue.Queue(max_pending)
+        self._outcomes = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="results-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self):
+        with self._lock:
+            return self._pending
+
+    def submit(self, job, callback=None):
+        """Enfileira sem bloquear; levanta queue.Full se a fila estiver cheia."""
+        if self._closed:
+            raise RuntimeError("Gravação em segundo plano encerrada")
+        with self._lock:
+            self._pending += 1
+        try:
+            self._jobs.put_nowait((job, callback))
+        except queue.Full:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+    def poll(self):
+        """Resultados prontos, para rodar na thread da interface: [(callback, ok, valor), ...]."""
+        outcomes = []
+        while True:
+            try:
+                outcomes.append(self._outcomes.get_nowait())
+            except queue.Empty:
+                return outcomes
+
+    def close(self, timeout=None):
+        """Grava o que estiver na fila e encerra a thread.
+
+        Devolve True se tudo foi gravado dentro do prazo.
+        """
+        if not self._closed:
+            self._closed = True
+            try:
+                self._jobs.put(_STOP, timeout=timeout)
+            except queue.Full:
+                return False
+        self._thread.join(timeout)
+        return not self._thread.is_alive() and self.pending == 0
+
+    def _run(self):
+        stop = False
+        while not stop:
+            item = self._jobs.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        staged = []
+        for job, callback in batch:
+            files = StagedFiles()
+            try:
+                staged.append((callback, files, job(files), None))
+            except Exception as e:
+                files.discard()
+                staged.append((callback, None, None, e))
+
+        directories = set()
+        outcomes = []
+        for callback, files, value, error in staged:
+            if error is None:
+                try:
+                    directories |= files.commit()
+                except OSError as e:
+                    files.discard()
+                    error = e
+            outcomes.append((callback, error is None, value if error is None else error))
+        for directory in directories:
+            _sync_directory(directory)
+
+        for outcome in outcomes:
+            self._outcomes.put(outcome)
+        with self._lock:
+            self._pending -= len(batch)